@@ -1,9 +1,18 @@
 """Endpoints para decisões judiciais."""
 
-from typing import List, Optional
+import base64
+import binascii
+import json
+import uuid
+from datetime import date, datetime, time, timezone
+from functools import lru_cache
+from typing import Any, List, Optional, Tuple
 
 from fastapi import APIRouter, HTTPException, Query
 
+from api.schemas.decisions import DecisionPage, DecisionSummary, SearchPage
+from src.config import settings
+from src.database.opensearch.search import SELECTABLE_FIELDS, OpenSearchSearcher
 from src.database.postgres.repositories import JudicialDecisionRepository
 from src.models.schemas import JudicialDecisionSchema
 
@@ -11,17 +20,83 @@ router = APIRouter()
 repo = JudicialDecisionRepository()
 
 
-@router.get("/", response_model=List[JudicialDecisionSchema])
+@router.get("/", response_model=DecisionPage)
 def list_decisions(
     limit: int = Query(50, ge=1, le=1000),
+    cursor: Optional[str] = None,
     tribunal: Optional[str] = None,
+    portal: Optional[str] = None,
+    classe: Optional[str] = None,
+    julgado_de: Optional[date] = None,
+    julgado_ate: Optional[date] = None,
+    include_text: bool = False,
 ):
-    """Lista decisões judiciais."""
-    decisions = repo.list_recent(limit=limit)
-    return [
-        JudicialDecisionSchema.from_orm(d) for d in decisions
-        if tribunal is None or d.tribunal == tribunal
-    ]
+    """Lista decisões judiciais, mais recentes primeiro.
+
+    Para a próxima página, repita a consulta com ``cursor=next_cursor``.
+    """
+    rows = repo.list_page(
+        limit=limit + 1,
+        after=_decode_cursor(cursor) if cursor else None,
+        tribunal=tribunal,
+        portal=portal,
+        classe=classe,
+        julgado_de=_day_start(julgado_de) if julgado_de else None,
+        julgado_ate=_day_end(julgado_ate) if julgado_ate else None,
+        include_text=include_text,
+    )
+    # Uma linha a mais indica se existe próxima página sem um COUNT(*)
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_cursor(rows[-1]["created_at"], rows[-1]["id"])
+    return DecisionPage(items=[DecisionSummary(**row) for row in rows], next_cursor=next_cursor)
+
+
+@router.get("/search", response_model=SearchPage)
+def search_decisions(
+    q: str = Query(..., min_length=2, max_length=500),
+    size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    tribunal: Optional[str] = None,
+    classe: Optional[str] = None,
+    julgado_de: Optional[date] = None,
+    julgado_ate: Optional[date] = None,
+    fields: Optional[str] = Query(None, description="Campos do _source, separados por vírgula"),
+    aggregations: bool = True,
+):
+    """Busca full-text em ementa, decisão e assunto.
+
+    Para a próxima página, repita a consulta com ``cursor=next_cursor``.
+    """
+    if not settings.enable_opensearch:
+        raise HTTPException(status_code=503, detail="Busca full-text desabilitada")
+
+    selected = None
+    if fields:
+        selected = [field.strip() for field in fields.split(",") if field.strip()]
+        unknown = set(selected) - set(SELECTABLE_FIELDS)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Campos desconhecidos: {sorted(unknown)}")
+
+    result = _searcher().search_decisions(
+        q,
+        size=size,
+        search_after=_decode_search_cursor(cursor) if cursor else None,
+        tribunal=tribunal,
+        classe=classe,
+        julgado_de=julgado_de,
+        julgado_ate=julgado_ate,
+        fields=selected,
+        aggregations=aggregations,
+    )
+    search_after = result["search_after"]
+    return SearchPage(
+        total=result["total"],
+        items=result["items"],
+        next_cursor=_encode_search_cursor(search_after) if search_after else None,
+        aggregations=result["aggregations"],
+    )
 
 
 @router.get("/{numero_cnj}", response_model=JudicialDecisionSchema)
@@ -31,3 +106,46 @@ def get_decision(numero_cnj: str):
     if not decision:
         raise HTTPException(status_code=404, detail="Decisão não encontrada")
     return JudicialDecisionSchema.from_orm(decision)
+
+
+def _encode_cursor(created_at: datetime, decision_id: uuid.UUID) -> str:
+    raw = f"{created_at.isoformat()}|{decision_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, decision_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), uuid.UUID(decision_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise HTTPException(status_code=400, detail="Cursor inválido") from exc
+
+
+def _day_start(day: date) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=timezone.utc)
+
+
+def _day_end(day: date) -> datetime:
+    return datetime.combine(day, time.max, tzinfo=timezone.utc)
+
+
+def _encode_search_cursor(search_after: List[Any]) -> str:
+    raw = json.dumps(search_after, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_search_cursor(cursor: str) -> List[Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        search_after = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise HTTPException(status_code=400, detail="Cursor inválido") from exc
+    if not isinstance(search_after, list) or not search_after:
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+    return search_after
+
+
+@lru_cache()
+def _searcher() -> OpenSearchSearcher:
+    return OpenSearchSearcher()
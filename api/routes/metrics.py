@@ -1,6 +1,8 @@
 """Endpoints de métricas."""
 
-from fastapi import APIRouter
+from typing import Optional
+
+from fastapi import APIRouter, Query
 
 from src.services.quality_checker import QualityChecker
 
@@ -9,9 +11,18 @@ quality = QualityChecker()
 
 
 @router.get("/quality")
-def quality_metrics():
-    return {
-        "completeness": quality.calculate_completeness(),
-        "duplicates_rate": quality.calculate_duplicates_rate(),
-        "validation_error_rate": quality.calculate_validation_error_rate(),
-    }
+def quality_metrics(
+    days: Optional[int] = Query(None, ge=1, le=3650),
+    portal: Optional[str] = None,
+):
+    """Completude por campo, taxa de duplicatas e de erros de validação (%)."""
+    return quality.summary(days=days, portal=portal)
+
+
+@router.get("/quality/daily")
+def quality_metrics_daily(
+    days: Optional[int] = Query(None, ge=1, le=3650),
+    portal: Optional[str] = None,
+):
+    """Mesmas métricas, dia a dia."""
+    return quality.daily(days=days, portal=portal)
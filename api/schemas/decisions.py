@@ -0,0 +1,58 @@
+"""Schemas das listagens e da busca de decisões."""
+
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel
+
+
+class DecisionSummary(BaseModel):
+    """Decisão na listagem; ``ementa`` e ``decisao`` só com ``include_text``."""
+
+    id: uuid.UUID
+    numero_cnj: str
+    numero_processo: str
+    classe: str
+    assunto: Optional[str] = None
+    sistema_origem: str
+    tribunal: str
+    orgao_julgador: str
+    relator: Optional[str] = None
+    portal: Optional[str] = None
+    data_distribuicao: datetime
+    data_julgamento: Optional[datetime] = None
+    data_publicacao: Optional[datetime] = None
+    created_at: datetime
+    ementa: Optional[str] = None
+    decisao: Optional[str] = None
+
+
+class DecisionPage(BaseModel):
+    """Página da listagem; ``next_cursor`` é None na última página."""
+
+    items: List[DecisionSummary]
+    next_cursor: Optional[str] = None
+
+
+class SearchHit(BaseModel):
+    """Decisão encontrada na busca full-text, com trechos destacados."""
+
+    numero_cnj: str
+    score: Optional[float] = None
+    source: Dict[str, Any]
+    highlight: Dict[str, List[str]] = {}
+
+
+class AggregationBucket(BaseModel):
+    key: Any
+    count: int
+
+
+class SearchPage(BaseModel):
+    """Página da busca; agregações só vêm na primeira página."""
+
+    total: int
+    items: List[SearchHit]
+    next_cursor: Optional[str] = None
+    aggregations: Optional[Dict[str, List[AggregationBucket]]] = None
@@ -13,3 +13,14 @@ def render_coletas_por_tribunal(coverage):
             labels={"x": "Tribunal", "y": "Documentos"},
         )
         st.plotly_chart(fig, use_container_width=True)
+
+
+def render_coletas_por_dia(daily):
+    if daily:
+        fig = px.line(
+            x=list(daily.keys()),
+            y=list(daily.values()),
+            title="Coletas por Dia",
+            labels={"x": "Dia", "y": "Documentos"},
+        )
+        st.plotly_chart(fig, use_container_width=True)
@@ -1,35 +1,76 @@
-"""Funções para carregar dados no dashboard."""
+"""Funções para carregar dados no dashboard.
 
-from typing import Dict, List, Tuple
+Contagens vêm da view materializada ``decision_counts_daily`` (atualizada
+pelo Celery beat) e a tabela de decisões recentes de uma consulta com
+filtros no SQL. Tudo passa por ``st.cache_data`` com TTL de
+``DASHBOARD_REFRESH_INTERVAL``: reruns do Streamlit dentro da janela não
+vão ao banco.
+"""
 
-from src.database.postgres.repositories import JudicialDecisionRepository
+from typing import Dict, List, Optional, Tuple
+
+import streamlit as st
+
+from src.config import settings
+from src.database.postgres.repositories import DecisionCountsRepository, JudicialDecisionRepository
+from src.services.quality_checker import QualityChecker
+
+ALL_PORTALS = "Todos"
 
 repo = JudicialDecisionRepository()
+counts_repo = DecisionCountsRepository()
+
 
+@st.cache_data(ttl=settings.dashboard_refresh_interval)
+def load_portals() -> List[str]:
+    return [ALL_PORTALS] + counts_repo.portals()
 
-def load_dashboard_data(portal: str, tribunal: str) -> Tuple[Dict[str, str], List[Dict], Dict[str, int]]:
-    decisions_orm = repo.list_recent(limit=50)
+
+@st.cache_data(ttl=settings.dashboard_refresh_interval)
+def load_dashboard_data(
+    portal: str, tribunal: str
+) -> Tuple[Dict[str, str], List[Dict], Dict[str, int]]:
+    portal_value, tribunal_value = _filters(portal, tribunal)
+
+    recent = repo.list_page(limit=50, portal=portal_value, tribunal=tribunal_value)
     decisions = [
         {
-            "Número CNJ": decision.numero_cnj,
-            "Classe": decision.classe,
-            "Tribunal": decision.tribunal,
-            "Órgão Julgador": decision.orgao_julgador,
-            "Data Distribuição": decision.data_distribuicao,
+            "Número CNJ": decision["numero_cnj"],
+            "Classe": decision["classe"],
+            "Tribunal": decision["tribunal"],
+            "Órgão Julgador": decision["orgao_julgador"],
+            "Data Distribuição": decision["data_distribuicao"],
         }
-        for decision in decisions_orm
-        if (portal == "Todos" or decision.portal == portal)
-        and (not tribunal or decision.tribunal == tribunal)
+        for decision in recent
     ]
 
-    coverage: Dict[str, int] = {}
-    for decision in decisions:
-        tribunal_name = decision["Tribunal"]
-        coverage[tribunal_name] = coverage.get(tribunal_name, 0) + 1
-
+    coverage = counts_repo.by_tribunal(portal=portal_value, tribunal=tribunal_value)
+    totals = counts_repo.totals(portal=portal_value, tribunal=tribunal_value)
     metrics = {
-        "Processos Coletados": str(len(decisions)),
-        "Portais Ativos": str(len({d.get("Tribunal") for d in decisions})),
+        "Processos Coletados": f"{totals['decisions']:,}".replace(",", "."),
+        "Tribunais": str(totals["tribunais"]),
+        "Portais Ativos": str(totals["portais"]),
     }
 
     return metrics, decisions, coverage
+
+
+@st.cache_data(ttl=settings.dashboard_refresh_interval)
+def load_daily_counts(portal: str, tribunal: str) -> Dict[str, int]:
+    portal_value, tribunal_value = _filters(portal, tribunal)
+    return {
+        day.isoformat(): count
+        for day, count in counts_repo.by_day(portal=portal_value, tribunal=tribunal_value)
+    }
+
+
+@st.cache_data(ttl=settings.dashboard_refresh_interval)
+def load_quality_summary() -> Dict:
+    return QualityChecker().summary()
+
+
+def _filters(portal: str, tribunal: str) -> Tuple[Optional[str], Optional[str]]:
+    return (
+        None if portal == ALL_PORTALS else portal,
+        tribunal.strip() or None,
+    )
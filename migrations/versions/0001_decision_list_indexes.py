@@ -0,0 +1,45 @@
+"""Índices das listagens keyset e filtros de decisões.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+TABLE = "judicial_decisions"
+
+# nome -> colunas; espelha os Index de JudicialDecisionORM.__table_args__
+INDEXES = {
+    "ix_judicial_decisions_created_at_id": ["created_at", "id"],
+    "ix_judicial_decisions_tribunal_created_at_id": ["tribunal", "created_at", "id"],
+    "ix_judicial_decisions_portal_created_at_id": ["portal", "created_at", "id"],
+    "ix_judicial_decisions_classe_created_at_id": ["classe", "created_at", "id"],
+    "ix_judicial_decisions_data_julgamento": ["data_julgamento"],
+    "ix_judicial_decisions_updated_at": ["updated_at"],
+    "ix_judicial_decisions_origem_url": ["origem_url"],
+}
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY não roda dentro de transação e não bloqueia escritas
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES.items():
+            op.create_index(
+                name,
+                TABLE,
+                columns,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in INDEXES:
+            op.drop_index(name, table_name=TABLE, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,46 @@
+"""Contadores diários de qualidade por portal.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+# Espelha QUALITY_FIELDS de src.database.postgres.models
+QUALITY_FIELDS = (
+    "numero_cnj",
+    "ementa",
+    "decisao",
+    "relator",
+    "assunto",
+    "orgao_julgador",
+    "data_julgamento",
+    "data_publicacao",
+)
+
+
+def upgrade() -> None:
+    counters = ["stored", "duplicates", "invalid"] + [f"filled_{name}" for name in QUALITY_FIELDS]
+    op.create_table(
+        "quality_daily_stats",
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("portal", sa.String(50), primary_key=True),
+        *[sa.Column(name, sa.Integer(), nullable=False, server_default="0") for name in counters],
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+        ),
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("quality_daily_stats")
@@ -0,0 +1,38 @@
+"""View materializada de decisões por dia, tribunal e portal (dashboard).
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Mesmo rótulo de UNKNOWN_PORTAL dos contadores de qualidade
+    op.execute(
+        """
+        CREATE MATERIALIZED VIEW IF NOT EXISTS decision_counts_daily AS
+        SELECT
+            CAST(timezone('UTC', created_at) AS DATE) AS day,
+            tribunal,
+            COALESCE(portal, 'desconhecido') AS portal,
+            COUNT(*) AS decisions
+        FROM judicial_decisions
+        GROUP BY 1, 2, 3
+        """
+    )
+    # REFRESH ... CONCURRENTLY exige um índice único sobre a view
+    op.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ux_decision_counts_daily "
+        "ON decision_counts_daily (day, tribunal, portal)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS decision_counts_daily")
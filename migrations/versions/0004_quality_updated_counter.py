@@ -0,0 +1,25 @@
+"""Contador de decisões recoletas (atualizadas) nos contadores de qualidade.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "quality_daily_stats",
+        sa.Column("updated", sa.Integer(), nullable=False, server_default="0"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("quality_daily_stats", "updated")
@@ -0,0 +1,30 @@
+#!/usr/bin/env python
+"""Preenche quality_daily_stats a partir das decisões já gravadas (varredura única)."""
+
+import argparse
+from datetime import date
+
+from src.database.postgres.repositories import QualityStatsRepository
+from src.utils.logger import get_logger, setup_logging
+
+setup_logging()
+logger = get_logger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--since",
+        type=date.fromisoformat,
+        default=None,
+        help="recalcula só a partir deste dia (ISO); padrão: todo o histórico",
+    )
+    args = parser.parse_args()
+
+    rows = QualityStatsRepository().backfill_from_decisions(since=args.since)
+    logger.info("quality_backfill_cli_finished", rows=rows)
+    print(f"{rows} linhas (dia, portal) recalculadas")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+"""Benchmark: utilitários CNJ legados vs. CNJNumber e validação em lote."""
+
+import argparse
+import random
+import re
+import time
+
+from src.utils.cnj_utils import (
+    SEGMENTOS,
+    TRIBUNAIS,
+    CNJNumber,
+    normalize_cnj_number,
+    validate_cnj_batch,
+)
+
+_TRIBUNAIS_ITEMS = tuple(TRIBUNAIS.items())
+_SEGMENTOS_ITEMS = tuple(SEGMENTOS.items())
+
+
+def _legacy_format(numero_cnj):
+    return bool(re.match(r"^\d{7}-\d{2}\.\d{4}\.\d\.\d{2}\.\d{4}$", numero_cnj))
+
+
+def _legacy_components(numero_cnj):
+    if not _legacy_format(numero_cnj):
+        return None
+    match = re.match(r"^(\d{7})-(\d{2})\.(\d{4})\.(\d)\.(\d{2})\.(\d{4})$", numero_cnj)
+    keys = ("sequencial", "digito", "ano", "segmento", "tribunal", "origem")
+    return dict(zip(keys, match.groups()))
+
+
+def _legacy_checksum(numero_cnj):
+    components = _legacy_components(numero_cnj)
+    if not components:
+        return False
+    num_str = (
+        components["origem"]
+        + components["ano"]
+        + components["segmento"]
+        + components["tribunal"]
+        + components["sequencial"]
+    )
+    return 98 - int(num_str) % 97 == int(components["digito"])
+
+
+def _legacy_names(components):
+    # Reconstrói os dicionários a cada chamada, como a implementação anterior
+    tribunais = dict(_TRIBUNAIS_ITEMS)
+    segmentos = dict(_SEGMENTOS_ITEMS)
+    return tribunais.get(components["tribunal"]), segmentos.get(components["segmento"])
+
+
+def legacy_path(numeros):
+    # Mesma sequência de chamadas feita pelos pipelines de validação e enriquecimento
+    for numero in numeros:
+        if _legacy_format(numero) and _legacy_checksum(numero):
+            components = _legacy_components(numero)
+            _legacy_names(components)
+
+
+def fast_path(numeros):
+    for numero in numeros:
+        cnj = CNJNumber.parse(numero)
+        if cnj and cnj.checksum_valid:
+            cnj.tribunal_nome, cnj.segmento_nome
+
+
+def build_numbers(size: int, seed: int = 7):
+    rng = random.Random(seed)
+    numeros = []
+    for _ in range(size):
+        sequencial = f"{rng.randrange(10**7):07d}"
+        ano = str(rng.randrange(2000, 2025))
+        tribunal = f"{rng.randrange(1, 35):02d}"
+        origem = f"{rng.randrange(10**4):04d}"
+        digito = 98 - int(origem + ano + "8" + tribunal + sequencial) % 97
+        numeros.append(f"{sequencial}-{digito:02d}.{ano}.8.{tribunal}.{origem}")
+    return numeros
+
+
+def timed(label, func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - started
+    print(f"{label:<28} {elapsed:.3f}s")
+    return elapsed, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=200_000)
+    args = parser.parse_args()
+
+    numeros = build_numbers(args.size)
+    print(f"números: {args.size}")
+    legacy, _ = timed("legado (por item)", legacy_path, numeros)
+    fast, _ = timed("CNJNumber (por item)", fast_path, numeros)
+    batch, result = timed("validate_cnj_batch", validate_cnj_batch, numeros)
+    timed("normalize_cnj_number", lambda: [normalize_cnj_number(n) for n in numeros])
+
+    print(f"ganho por item: {legacy / fast:.1f}x | ganho em lote: {legacy / batch:.1f}x")
+    print(f"válidos no lote: {int(result.sum())}/{len(numeros)}")
+
+
+if __name__ == "__main__":
+    main()
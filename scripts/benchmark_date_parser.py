@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+"""Benchmark: pd.to_datetime escalar vs. parse_court_date em 100k datas."""
+
+import argparse
+import random
+import time
+import warnings
+from datetime import date, timedelta
+
+import pandas as pd
+
+from src.utils.date_parser import parse_court_date
+
+
+def build_dates(size: int, seed: int = 3):
+    rng = random.Random(seed)
+    formats = (
+        lambda d, h, m: f"{d:%d/%m/%Y}",
+        lambda d, h, m: f"{d:%d/%m/%Y} {h:02d}:{m:02d}",
+        lambda d, h, m: f"{d:%Y-%m-%d}T{h:02d}:{m:02d}:00",
+    )
+    start = date(2015, 1, 1)
+    values = []
+    for _ in range(size):
+        day = start + timedelta(days=rng.randrange(3650))
+        values.append(rng.choice(formats)(day, rng.randrange(24), rng.randrange(60)))
+    return values
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=100_000)
+    args = parser.parse_args()
+
+    values = build_dates(args.size)
+    iso_values = [value for value in values if "T" in value]
+
+    # pandas avisa que dd/mm/yyyy é lido como mês/dia quando dayfirst=False
+    warnings.simplefilter("ignore", UserWarning)
+
+    started = time.perf_counter()
+    legacy = [pd.to_datetime(value) for value in values]
+    legacy_elapsed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    parsed = [parse_court_date(value) for value in values]
+    fast_elapsed = time.perf_counter() - started
+
+    iso_equal = all(
+        pd.to_datetime(value).to_pydatetime() == parse_court_date(value) for value in iso_values
+    )
+    print(f"datas: {args.size} ({len(set(values))} distintas)")
+    print(f"pd.to_datetime:   {legacy_elapsed:.3f}s")
+    print(f"parse_court_date: {fast_elapsed:.3f}s")
+    print(f"ganho: {legacy_elapsed / fast_elapsed:.1f}x | ISO equivalente: {iso_equal}")
+    print(f"resultados: {len(legacy)} / {len(parsed)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+"""Benchmark: chamadas response.css() avulsas vs. ExtractionPlan do TJSP."""
+
+import argparse
+import random
+import time
+
+from scrapy.http import HtmlResponse
+
+from src.crawlers.esaj.tjsp_spider import TJSPESAJSpider
+
+_FIELD = '<tr><td class="label">{label}</td><td><span class="{css}">{value}</span></td></tr>'
+
+
+def build_page(movimentacoes: int, seed: int = 5) -> str:
+    """Página no formato do eSAJ com ``movimentacoes`` linhas de andamento."""
+    rng = random.Random(seed)
+    fields = "".join(
+        _FIELD.format(label=css, css=css, value=value)
+        for css, value in (
+            ("numeroProcesso", " 0001234-56.2024.8.26.0100 "),
+            ("unificado", "1000001-23.2024.8.26.0100"),
+            ("classeProcesso", "Apelação Cível"),
+            ("assuntoProcesso", "Indenização por Dano Moral"),
+            ("orgaoJulgador", "3ª Câmara de Direito Privado"),
+            ("relator", "Des. Fulano de Tal"),
+            ("dataDistribuicao", "10/01/2024 10:00"),
+            ("dataJulgamento", "15/03/2024"),
+            ("dataPublicacao", "20/03/2024"),
+        )
+    )
+    partes = "".join(
+        f'<tr class="parte"><td><span class="tipoParte">{tipo}</span></td>'
+        f'<td><span class="nomeParte"> {nome} </span></td></tr>'
+        for tipo, nome in (("Apelante", "Empresa X S.A."), ("Apelado", "João da Silva"))
+    )
+    movimentos = "".join(
+        f'<tr class="fundocinza{i % 2}"><td class="dataMovimentacao">{i:02d}/02/2024</td>'
+        f'<td class="descricaoMovimentacao"><a href="#m{i}">Juntada</a> '
+        f"<span>{rng.randrange(10**6)}</span></td></tr>"
+        for i in range(movimentacoes)
+    )
+    return (
+        "<html><head><title>eSAJ</title><script>var x = 1;</script></head><body>"
+        '<div id="header"><ul class="menu"><li>Consultas</li></ul></div>'
+        f'<table class="secaoFormBody">{fields}</table>'
+        f'<table id="tablePartesPrincipais">{partes}</table>'
+        '<div class="ementa">Responsabilidade civil. <b>Dano moral</b> configurado.</div>'
+        '<div class="decisao">Deram provimento ao recurso.</div>'
+        f'<table id="tabelaTodasMovimentacoes">{movimentos}</table>'
+        "</body></html>"
+    )
+
+
+def legacy_extract(response: HtmlResponse, portal: str) -> dict:
+    """Extração anterior ao plano: uma chamada response.css() por campo."""
+    item = {
+        "numero_cnj": (response.css(".numeroProcesso::text").get() or "").strip(),
+        "numero_processo": response.css(".unificado::text").get() or "",
+        "classe": response.css(".classeProcesso::text").get() or "",
+        "assunto": response.css(".assuntoProcesso::text").get(),
+        "sistema_origem": "eSAJ",
+        "tribunal": "TJSP",
+        "orgao_julgador": response.css(".orgaoJulgador::text").get() or "",
+        "relator": response.css(".relator::text").get(),
+        "data_distribuicao": response.css(".dataDistribuicao::text").get() or "",
+        "data_julgamento": response.css(".dataJulgamento::text").get(),
+        "data_publicacao": response.css(".dataPublicacao::text").get(),
+        "ementa": " ".join(response.css(".ementa::text").getall() or [""]),
+        "decisao": " ".join(response.css(".decisao::text").getall() or [""]),
+        "partes": [],
+        "documentos": [],
+        "origem_url": response.url,
+        "portal": portal,
+    }
+    for parte_div in response.css(".parte"):
+        nome = parte_div.css(".nomeParte::text").get()
+        tipo = parte_div.css(".tipoParte::text").get()
+        if nome and tipo:
+            item["partes"].append(
+                {
+                    "nome": nome.strip(),
+                    "tipo": tipo.strip(),
+                    "documento": None,
+                    "representante": None,
+                }
+            )
+    return item
+
+
+def run(extract, pages, rounds: int) -> float:
+    # Respostas novas a cada rodada: o parse do HTML entra na conta das duas versões
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for body in pages:
+            extract(
+                HtmlResponse("https://esaj.tjsp.jus.br/cpopg/show.do", body=body, encoding="utf-8")
+            )
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--movimentacoes", type=int, default=150)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    spider = TJSPESAJSpider()
+    pages = [build_page(args.movimentacoes, seed=i) for i in range(args.pages)]
+
+    sample = HtmlResponse("https://esaj.tjsp.jus.br/cpopg/show.do", body=pages[0], encoding="utf-8")
+    equal = legacy_extract(sample, spider.portal) == spider.extract_data(sample)
+
+    legacy_elapsed = run(
+        lambda response: legacy_extract(response, spider.portal), pages, args.rounds
+    )
+    plan_elapsed = run(spider.extract_data, pages, args.rounds)
+
+    total = args.pages * args.rounds
+    print(f"páginas: {total} ({args.movimentacoes} movimentações cada)")
+    print(f"response.css avulso: {legacy_elapsed * 1e3 / total:.3f} ms/página")
+    print(f"ExtractionPlan:      {plan_elapsed * 1e3 / total:.3f} ms/página")
+    print(f"ganho: {legacy_elapsed / plan_elapsed:.2f}x | itens idênticos: {equal}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+"""Benchmark de itens/s pela cadeia ITEM_PIPELINES: validação+normalização antiga vs. fundida.
+
+O StoragePipeline fica de fora (custo dominado por I/O) e a deduplicação usa o
+índice MinHash em memória para medir apenas CPU.
+"""
+
+import argparse
+import copy
+import random
+import time
+from types import SimpleNamespace
+
+from scrapy.exceptions import DropItem
+
+from src.pipelines.deduplication_pipeline import DeduplicationPipeline
+from src.pipelines.enrichment_pipeline import EnrichmentPipeline
+from src.pipelines.normalization_pipeline import NormalizationPipeline
+from src.pipelines.normalize_validate_pipeline import NormalizeValidatePipeline
+from src.pipelines.validation_pipeline import ValidationPipeline
+from src.services.minhash_index import MemoryMinHashIndex
+
+PALAVRAS = (
+    "apelação cível contrato prestação serviços recurso provimento sentença mantida dano "
+    "moral indenização réu autor acórdão relator câmara direito privado execução fiscal"
+).split()
+
+
+def build_items(size: int, seed: int = 11):
+    rng = random.Random(seed)
+    # Vocabulário amplo para que os textos não sejam duplicatas fuzzy entre si
+    vocabulario = PALAVRAS + [f"termo{n}" for n in range(20000)]
+    items = []
+    for index in range(size):
+        sequencial = f"{index:07d}"
+        digito = 98 - int("0100" + "2023" + "8" + "26" + sequencial) % 97
+        items.append(
+            {
+                "numero_cnj": f"{sequencial}-{digito:02d}.2023.8.26.0100",
+                "numero_processo": f"{index}",
+                "classe": "  Apelação   Cível ",
+                "assunto": "Direito Civil - Contratos",
+                "sistema_origem": "eSAJ",
+                "tribunal": "TJSP",
+                "orgao_julgador": "1ª Câmara de Direito Privado",
+                "relator": "Des. João Silva",
+                "data_distribuicao": "2024-01-10T10:00:00",
+                "data_julgamento": "2024-02-10T10:00:00",
+                "ementa": " ".join(rng.choice(vocabulario) for _ in range(120)) + f" {index}",
+                "decisao": " ".join(rng.choice(vocabulario) for _ in range(60)) + f" {index}",
+                "partes": [{"nome": " João  da Silva ", "tipo": "Autor"}],
+            }
+        )
+    return items
+
+
+def build_chain(stages):
+    dedup = DeduplicationPipeline()
+    dedup.index = MemoryMinHashIndex()
+    return [*stages, dedup, EnrichmentPipeline()]
+
+
+def run_chain(chain, items, spider):
+    passed = 0
+    started = time.perf_counter()
+    for item in items:
+        try:
+            for pipeline in chain:
+                item = pipeline.process_item(item, spider)
+            passed += 1
+        except DropItem:
+            continue
+    return passed, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=5000)
+    args = parser.parse_args()
+
+    spider = SimpleNamespace(name="benchmark", portal="esaj", settings={"ENVIRONMENT": "test"})
+    items = build_items(args.items)
+
+    old_stages = [ValidationPipeline(), NormalizationPipeline()]
+    new_stages = [NormalizeValidatePipeline()]
+
+    print(f"itens: {args.items}")
+    for label, old_chain, new_chain in (
+        ("só validação/normalização", old_stages, new_stages),
+        ("cadeia completa", build_chain(old_stages), build_chain(new_stages)),
+    ):
+        old_passed, old_elapsed = run_chain(old_chain, copy.deepcopy(items), spider)
+        new_passed, new_elapsed = run_chain(new_chain, copy.deepcopy(items), spider)
+        print(f"[{label}]")
+        print(f"  validação -> normalização: {old_passed / old_elapsed:.0f} itens/s")
+        print(f"  normalização + validação:  {new_passed / new_elapsed:.0f} itens/s")
+        print(f"  ganho: {old_elapsed / new_elapsed:.2f}x ({old_passed}/{new_passed} itens ok)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+"""Micro-benchmark: MinHash palavra a palavra vs. motor vetorizado em lote."""
+
+import argparse
+import random
+import time
+
+import numpy as np
+
+from src.utils.minhash import MinHashSignatureEngine, generate_minhash
+
+VOCABULARIO = (
+    "apelação cível contrato prestação serviços recurso provimento nego dou parcial "
+    "sentença mantida dano moral indenização réu autor acórdão relator câmara direito "
+    "privado público tributário execução fiscal embargos declaração agravo instrumento"
+).split()
+
+
+def build_corpus(size: int, words: int, seed: int = 42):
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(VOCABULARIO) for _ in range(words)) for _ in range(size)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--docs", type=int, default=500)
+    parser.add_argument("--words", type=int, default=800)
+    parser.add_argument("--batch-size", type=int, default=100)
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.docs, args.words)
+    engine = MinHashSignatureEngine()
+
+    started = time.perf_counter()
+    reference = [generate_minhash(text).hashvalues for text in corpus]
+    legacy = time.perf_counter() - started
+
+    started = time.perf_counter()
+    vectorized = []
+    for start in range(0, len(corpus), args.batch_size):
+        stop = start + args.batch_size
+        vectorized.extend(engine.signatures(corpus[start:stop]))
+    batched = time.perf_counter() - started
+
+    identical = all(np.array_equal(a, b) for a, b in zip(reference, vectorized))
+    print(f"documentos: {args.docs} x {args.words} palavras")
+    print(f"palavra a palavra: {legacy:.3f}s ({args.docs / legacy:.0f} docs/s)")
+    print(f"vetorizado:        {batched:.3f}s ({args.docs / batched:.0f} docs/s)")
+    print(f"ganho: {legacy / batched:.1f}x | assinaturas idênticas: {identical}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+"""Benchmark: perfis de renderização ``stealth`` vs. ``fast`` do SeleniumSpider.
+
+As páginas são fixtures HTML estáticas gravadas em disco e servidas por um
+servidor HTTP local; imagens, fontes e mídia respondem com atraso
+(``--asset-delay``) para simular um CDN remoto. Requer Chrome instalado.
+"""
+
+import argparse
+import base64
+import functools
+import tempfile
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from src.crawlers.base.browser_pool import BrowserPool, create_chrome_driver
+from src.crawlers.base.render_profile import RenderProfile
+from src.crawlers.base.selenium_spider import SeleniumSpider
+
+# PNG 1x1 transparente
+_PNG = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR42mNkYAAAAAYAAjCB0C8AAAAASUVORK5CYII="
+)
+_HEAVY_SUFFIXES = (".png", ".woff2", ".mp4")
+
+
+def write_fixtures(directory: Path, pages: int, images: int, paragraphs: int) -> None:
+    """Grava ``pages`` páginas de decisão com imagens, fonte e vídeo."""
+    (directory / "img").mkdir(parents=True, exist_ok=True)
+    for i in range(images):
+        (directory / "img" / f"{i}.png").write_bytes(_PNG)
+    (directory / "font.woff2").write_bytes(b"\0" * 64 * 1024)
+    (directory / "video.mp4").write_bytes(b"\0" * 512 * 1024)
+
+    body = "".join(
+        f"<p>Parágrafo {n} do acórdão. Vistos, relatados e discutidos estes autos.</p>"
+        for n in range(paragraphs)
+    )
+    gallery = "".join(f'<img src="img/{i}.png" width="200" height="200">' for i in range(images))
+    for page in range(pages):
+        (directory / f"decisao_{page}.html").write_text(
+            "<html><head><meta charset='utf-8'><title>Acórdão</title>"
+            "<style>@font-face{font-family:Tribunal;src:url(font.woff2)}"
+            "body{font-family:Tribunal}</style></head><body>"
+            f"<h1>Processo {page:07d}-00.2024.8.26.0100</h1>{gallery}"
+            f'<video src="video.mp4" autoplay muted></video>{body}'
+            '<div class="decisao">Deram provimento ao recurso.</div>'
+            "</body></html>",
+            encoding="utf-8",
+        )
+
+
+class _FixtureHandler(SimpleHTTPRequestHandler):
+    asset_delay = 0.0
+
+    def do_GET(self):  # noqa: N802 - nome exigido pelo http.server
+        if self.path.endswith(_HEAVY_SUFFIXES):
+            time.sleep(self.asset_delay)
+        super().do_GET()
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+
+def serve(directory: Path, asset_delay: float) -> ThreadingHTTPServer:
+    handler = functools.partial(_FixtureHandler, directory=str(directory))
+    _FixtureHandler.asset_delay = asset_delay
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run(profile: RenderProfile, urls, runs: int) -> float:
+    pool = BrowserPool(
+        size=1,
+        driver_factory=functools.partial(
+            create_chrome_driver, page_load_strategy=profile.page_load_strategy
+        ),
+    ).start()
+    spider = SeleniumSpider(pool=pool, profile=profile)
+    try:
+        # Primeira página fora da conta: aquece o cache do Chrome nos dois perfis
+        spider.scrape_page(urls[0], ".decisao")
+        started = time.perf_counter()
+        for _ in range(runs):
+            for url in urls:
+                spider.scrape_page(url, ".decisao")
+        return time.perf_counter() - started
+    finally:
+        spider.close()
+        pool.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--rounds", type=int, default=1)
+    parser.add_argument("--images", type=int, default=30)
+    parser.add_argument("--paragraphs", type=int, default=200)
+    parser.add_argument("--asset-delay", type=float, default=0.2)
+    parser.add_argument("--fixtures-dir", type=Path, default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = args.fixtures_dir or Path(tmp)
+        write_fixtures(directory, args.pages, args.images, args.paragraphs)
+        server = serve(directory, args.asset_delay)
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+        urls = [f"{base_url}/decisao_{page}.html" for page in range(args.pages)]
+
+        try:
+            stealth = run(RenderProfile.from_settings("stealth"), urls, args.rounds)
+            fast = run(RenderProfile.from_settings("fast"), urls, args.rounds)
+        finally:
+            server.shutdown()
+
+    total = args.pages * args.rounds
+    print(f"páginas: {total} ({args.images} imagens, atraso de {args.asset_delay}s por recurso)")
+    print(f"stealth: {stealth / total:.2f} s/página")
+    print(f"fast:    {fast / total:.2f} s/página")
+    print(f"ganho: {stealth / fast:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+"""Exporta judicial_decisions para Parquet ou JSONL.gz em memória constante."""
+
+import argparse
+from datetime import datetime
+
+from src.services.export_service import EXPORT_COLUMNS, FORMATS, DecisionExporter
+from src.utils.logger import get_logger, setup_logging
+
+setup_logging()
+logger = get_logger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--format", choices=FORMATS, default=None, help="padrão: settings")
+    parser.add_argument("--output-dir", default=None, help="padrão: EXPORT_OUTPUT_DIR")
+    parser.add_argument(
+        "--columns",
+        default=None,
+        help=f"colunas separadas por vírgula (padrão: todas: {','.join(EXPORT_COLUMNS)})",
+    )
+    parser.add_argument("--full", action="store_true", help="ignora a marca d'água e exporta tudo")
+    parser.add_argument(
+        "--since", type=datetime.fromisoformat, default=None, help="updated_at > SINCE (ISO)"
+    )
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument("--row-group-size", type=int, default=None)
+    args = parser.parse_args()
+
+    exporter = DecisionExporter(
+        output_dir=args.output_dir,
+        fmt=args.format,
+        columns=args.columns.split(",") if args.columns else None,
+        batch_size=args.batch_size,
+        row_group_size=args.row_group_size,
+    )
+    result = exporter.export(incremental=not args.full, since=args.since)
+    logger.info("export_cli_finished", rows=result.rows, path=str(result.path or ""))
+    print(f"{result.rows} linhas -> {result.path or '(nada novo)'} | até {result.watermark}")
+
+
+if __name__ == "__main__":
+    main()
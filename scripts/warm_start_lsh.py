@@ -0,0 +1,26 @@
+#!/usr/bin/env python
+"""Script para popular o índice MinHash LSH a partir do PostgreSQL."""
+
+import argparse
+
+from src.services.minhash_index import build_minhash_index, warm_start_index
+from src.utils.logger import get_logger, setup_logging
+
+setup_logging()
+logger = get_logger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--backend", default=None, help="memory ou redis (padrão: settings)")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    index = build_minhash_index(args.backend)
+    logger.info("lsh_warm_start_begin", backend=index.backend, existing=index.size())
+    warm_start_index(index, batch_size=args.batch_size)
+    index.report_stats()
+
+
+if __name__ == "__main__":
+    main()
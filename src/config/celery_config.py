@@ -9,6 +9,14 @@ celery_app = Celery(
     broker=f"amqp://{settings.rabbitmq_user}:{settings.rabbitmq_password}@"
     f"{settings.rabbitmq_host}:{settings.rabbitmq_port}{settings.rabbitmq_vhost}",
     backend=settings.redis_uri,
+    # autodiscover_tasks(["src.tasks"]) só importaria src.tasks.tasks: os módulos
+    # com tasks precisam ser listados para o worker registrá-las
+    include=[
+        "src.tasks.crawl_tasks",
+        "src.tasks.dashboard_tasks",
+        "src.tasks.export_tasks",
+        "src.tasks.processing_tasks",
+    ],
 )
 
 celery_app.conf.update(
@@ -19,6 +27,12 @@ celery_app.conf.update(
     enable_utc=True,
     task_acks_late=True,
     worker_prefetch_multiplier=1,
+    beat_schedule={
+        "refresh-dashboard-aggregates": {
+            "task": "tasks.refresh_dashboard_aggregates",
+            "schedule": settings.dashboard_aggregates_refresh_interval,
+            # Refresh atrasado não vale a pena: o próximo já recalcula tudo
+            "options": {"expires": settings.dashboard_aggregates_refresh_interval},
+        },
+    },
 )
-
-celery_app.autodiscover_tasks(["src.tasks"])
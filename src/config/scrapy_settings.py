@@ -8,16 +8,24 @@ SCRAPY_SETTINGS = {
     "DOWNLOAD_DELAY": settings.scrapy_download_delay,
     "CONCURRENT_REQUESTS": settings.scrapy_concurrent_requests,
     "RETRY_TIMES": settings.scrapy_retry_times,
+    "RETRY_BACKOFF_MAX": 60.0,
     "AUTOTHROTTLE_ENABLED": settings.scrapy_autothrottle_enabled,
     "AUTOTHROTTLE_TARGET_CONCURRENCY": settings.scrapy_autothrottle_target_concurrency,
+    "INCREMENTAL_TOUCH_BATCH": settings.incremental_touch_batch,
+    "QUALITY_STATS_ENABLED": settings.quality_stats_enabled,
+    "QUALITY_STATS_FLUSH_INTERVAL": settings.quality_stats_flush_interval,
+    "EXTENSIONS": {
+        "src.crawlers.extensions.quality_extension.QualityStatsExtension": 500,
+    },
     "DOWNLOADER_MIDDLEWARES": {
-        "src.crawlers.middlewares.proxy_middleware.ProxyRotationMiddleware": 610,
+        "src.crawlers.middlewares.incremental_middleware.IncrementalCrawlMiddleware": 600,
         "src.crawlers.middlewares.retry_middleware.ResilientRetryMiddleware": 620,
         "src.crawlers.middlewares.captcha_middleware.CaptchaSolverMiddleware": 630,
+        # Acima do retry: respostas e exceções passam aqui antes de virarem retry
+        "src.crawlers.middlewares.proxy_middleware.ProxyRotationMiddleware": 640,
     },
     "ITEM_PIPELINES": {
-        "src.pipelines.validation_pipeline.ValidationPipeline": 100,
-        "src.pipelines.normalization_pipeline.NormalizationPipeline": 200,
+        "src.pipelines.normalize_validate_pipeline.NormalizeValidatePipeline": 100,
         "src.pipelines.deduplication_pipeline.DeduplicationPipeline": 300,
         "src.pipelines.enrichment_pipeline.EnrichmentPipeline": 400,
         "src.pipelines.storage_pipeline.StoragePipeline": 500,
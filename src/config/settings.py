@@ -37,6 +37,7 @@ class Settings(BaseSettings):
     redis_db: int = Field(0, alias="REDIS_DB")
     redis_password: str = Field("SecureRedisPass789!", alias="REDIS_PASSWORD")
     redis_max_connections: int = Field(50, alias="REDIS_MAX_CONNECTIONS")
+    redis_local_cache_maxsize: int = Field(1024, alias="REDIS_LOCAL_CACHE_MAXSIZE")
 
     # RabbitMQ
     rabbitmq_host: str = Field("localhost", alias="RABBITMQ_HOST")
@@ -52,6 +53,15 @@ class Settings(BaseSettings):
     opensearch_user: str = Field("admin", alias="OPENSEARCH_USER")
     opensearch_password: str = Field("SecureSearchPass345!", alias="OPENSEARCH_PASSWORD")
     opensearch_index: str = Field("judicial_decisions", alias="OPENSEARCH_INDEX")
+    opensearch_bulk_enabled: bool = Field(True, alias="OPENSEARCH_BULK_ENABLED")
+    opensearch_bulk_max_docs: int = Field(500, alias="OPENSEARCH_BULK_MAX_DOCS")
+    opensearch_bulk_max_bytes: int = Field(10 * 1024 * 1024, alias="OPENSEARCH_BULK_MAX_BYTES")
+    opensearch_bulk_flush_interval: float = Field(2.0, alias="OPENSEARCH_BULK_FLUSH_INTERVAL")
+    opensearch_bulk_max_pending: int = Field(5000, alias="OPENSEARCH_BULK_MAX_PENDING")
+    opensearch_bulk_max_retries: int = Field(3, alias="OPENSEARCH_BULK_MAX_RETRIES")
+    search_cache_enabled: bool = Field(True, alias="SEARCH_CACHE_ENABLED")
+    search_cache_ttl: int = Field(600, alias="SEARCH_CACHE_TTL")
+    search_cache_invalidate_interval: float = Field(30.0, alias="SEARCH_CACHE_INVALIDATE_INTERVAL")
 
     # Scrapy
     scrapy_concurrent_requests: int = Field(16, alias="SCRAPY_CONCURRENT_REQUESTS")
@@ -62,22 +72,70 @@ class Settings(BaseSettings):
     )
     scrapy_retry_times: int = Field(5, alias="SCRAPY_RETRY_TIMES")
     scrapy_user_agent_rotation: bool = Field(True, alias="SCRAPY_USER_AGENT_ROTATION")
+    selector_stats_sync_interval: float = Field(30.0, alias="SELECTOR_STATS_SYNC_INTERVAL")
+    # Spiders simultâneas no reactor persistente de cada processo worker
+    crawler_runner_max_concurrent: int = Field(4, alias="CRAWLER_RUNNER_MAX_CONCURRENT")
+    crawl_job_timeout: float = Field(6 * 3600.0, alias="CRAWL_JOB_TIMEOUT")
+    crawl_job_status_ttl: int = Field(24 * 3600, alias="CRAWL_JOB_STATUS_TTL")
+
+    # Crawl sharding
+    crawl_shard_sequential_size: int = Field(1000, alias="CRAWL_SHARD_SEQUENTIAL_SIZE")
+    crawl_shard_date_window_days: int = Field(7, alias="CRAWL_SHARD_DATE_WINDOW_DAYS")
+    crawl_shard_max_retries: int = Field(3, alias="CRAWL_SHARD_MAX_RETRIES")
+    crawl_shard_retry_backoff: int = Field(60, alias="CRAWL_SHARD_RETRY_BACKOFF")
+    crawl_shard_state_ttl: int = Field(7 * 24 * 3600, alias="CRAWL_SHARD_STATE_TTL")
+    # Até esta fração de URLs com falha o shard fica "partial" e só elas são recoletadas
+    crawl_shard_max_failed_ratio: float = Field(0.05, alias="CRAWL_SHARD_MAX_FAILED_RATIO")
+
+    # Crawl incremental
+    incremental_max_age_hours: int = Field(168, alias="INCREMENTAL_MAX_AGE_HOURS")
+    incremental_state_ttl: int = Field(30 * 24 * 3600, alias="INCREMENTAL_STATE_TTL")
+    incremental_touch_batch: int = Field(200, alias="INCREMENTAL_TOUCH_BATCH")
 
     # Selenium
     selenium_headless: bool = Field(True, alias="SELENIUM_HEADLESS")
     selenium_driver_path: str = Field("/usr/local/bin/chromedriver", alias="SELENIUM_DRIVER_PATH")
     selenium_implicit_wait: int = Field(10, alias="SELENIUM_IMPLICIT_WAIT")
     selenium_page_load_timeout: int = Field(30, alias="SELENIUM_PAGE_LOAD_TIMEOUT")
+    selenium_pool_size: int = Field(2, alias="SELENIUM_POOL_SIZE")
+    selenium_max_pages_per_browser: int = Field(200, alias="SELENIUM_MAX_PAGES_PER_BROWSER")
+    selenium_max_browser_memory_mb: int = Field(1024, alias="SELENIUM_MAX_BROWSER_MEMORY_MB")
+    selenium_checkout_timeout: float = Field(60.0, alias="SELENIUM_CHECKOUT_TIMEOUT")
+    # A medição de RSS varre o /proc: só a cada N páginas do navegador
+    selenium_memory_check_interval: int = Field(10, alias="SELENIUM_MEMORY_CHECK_INTERVAL")
+    # "stealth" (simula usuário em toda página) ou "fast"
+    selenium_render_profile: str = Field("stealth", alias="SELENIUM_RENDER_PROFILE")
+    selenium_blocked_url_patterns: str = Field(
+        "*.png,*.jpg,*.jpeg,*.gif,*.webp,*.svg,*.ico,*.woff,*.woff2,*.ttf,*.otf,*.eot,"
+        "*.mp4,*.webm,*.mp3,*.ogg",
+        alias="SELENIUM_BLOCKED_URL_PATTERNS",
+    )
+    selenium_human_simulation_rate: float = Field(0.05, alias="SELENIUM_HUMAN_SIMULATION_RATE")
+    selenium_captcha_stealth_pages: int = Field(20, alias="SELENIUM_CAPTCHA_STEALTH_PAGES")
 
     # Anti Bot
     proxy_enabled: bool = Field(False, alias="PROXY_ENABLED")
     proxy_pool_size: int = Field(50, alias="PROXY_POOL_SIZE")
     proxy_provider: str = Field("custom", alias="PROXY_PROVIDER")
     proxy_rotation_interval: int = Field(300, alias="PROXY_ROTATION_INTERVAL")
+    proxy_failure_threshold: int = Field(3, alias="PROXY_FAILURE_THRESHOLD")
+    proxy_quarantine_seconds: float = Field(60.0, alias="PROXY_QUARANTINE_SECONDS")
+    proxy_quarantine_max_seconds: float = Field(1800.0, alias="PROXY_QUARANTINE_MAX_SECONDS")
+    proxy_latency_alpha: float = Field(0.3, alias="PROXY_LATENCY_ALPHA")
+    proxy_shared_state: bool = Field(True, alias="PROXY_SHARED_STATE")
+    proxy_state_refresh_interval: float = Field(5.0, alias="PROXY_STATE_REFRESH_INTERVAL")
     captcha_solver: str = Field("2captcha", alias="CAPTCHA_SOLVER")
     captcha_api_key: str = Field("chave-api-servico", alias="CAPTCHA_API_KEY")
 
     # Monitoring
+    portal_monitor_similarity_threshold: float = Field(
+        0.85, alias="PORTAL_MONITOR_SIMILARITY_THRESHOLD"
+    )
+    portal_monitor_baseline_refresh: float = Field(300.0, alias="PORTAL_MONITOR_BASELINE_REFRESH")
+    # Padrões das spiders; cada spider pode sobrescrever em custom_settings
+    portal_monitor_sample_every: int = Field(20, alias="PORTAL_MONITOR_SAMPLE_EVERY")
+    portal_monitor_sample_rate: float = Field(0.0, alias="PORTAL_MONITOR_SAMPLE_RATE")
+    portal_monitor_failure_window: int = Field(50, alias="PORTAL_MONITOR_FAILURE_WINDOW")
     sentry_dsn: str = Field("chave-api-servico", alias="SENTRY_DSN")
     prometheus_port: int = Field(9090, alias="PROMETHEUS_PORT")
     grafana_port: int = Field(3000, alias="GRAFANA_PORT")
@@ -100,6 +158,42 @@ class Settings(BaseSettings):
     streamlit_server_port: int = Field(8501, alias="STREAMLIT_SERVER_PORT")
     streamlit_server_address: str = Field("0.0.0.0", alias="STREAMLIT_SERVER_ADDRESS")
     dashboard_refresh_interval: int = Field(30, alias="DASHBOARD_REFRESH_INTERVAL")
+    dashboard_aggregates_refresh_interval: int = Field(
+        300, alias="DASHBOARD_AGGREGATES_REFRESH_INTERVAL"
+    )
+
+    # Storage
+    storage_bulk_enabled: bool = Field(True, alias="STORAGE_BULK_ENABLED")
+    storage_batch_size: int = Field(500, alias="STORAGE_BATCH_SIZE")
+    storage_batch_max_latency: float = Field(5.0, alias="STORAGE_BATCH_MAX_LATENCY")
+    # Tentativas de gravar um lote antes de devolvê-lo ao buffer (backoff exponencial)
+    storage_flush_retries: int = Field(3, alias="STORAGE_FLUSH_RETRIES")
+    storage_flush_retry_backoff: float = Field(1.0, alias="STORAGE_FLUSH_RETRY_BACKOFF")
+    # Threads do pool de I/O dos pipelines; manter abaixo de POSTGRES_POOL_SIZE
+    pipeline_io_threads: int = Field(10, alias="PIPELINE_IO_THREADS")
+    pipeline_max_inflight_writes: int = Field(100, alias="PIPELINE_MAX_INFLIGHT_WRITES")
+
+    # Métricas de qualidade
+    quality_stats_enabled: bool = Field(True, alias="QUALITY_STATS_ENABLED")
+    quality_stats_flush_interval: float = Field(30.0, alias="QUALITY_STATS_FLUSH_INTERVAL")
+    quality_metrics_days: int = Field(30, alias="QUALITY_METRICS_DAYS")
+
+    # Exportação
+    export_output_dir: str = Field("/data/exports", alias="EXPORT_OUTPUT_DIR")
+    export_format: str = Field("parquet", alias="EXPORT_FORMAT")
+    export_batch_size: int = Field(5000, alias="EXPORT_BATCH_SIZE")
+    export_row_group_size: int = Field(50000, alias="EXPORT_ROW_GROUP_SIZE")
+    export_parquet_compression: str = Field("zstd", alias="EXPORT_PARQUET_COMPRESSION")
+    # Maior duração esperada de uma transação que grava decisões (segundos)
+    export_watermark_lag: float = Field(600.0, alias="EXPORT_WATERMARK_LAG")
+
+    # Deduplicação
+    dedup_lsh_backend: str = Field("redis", alias="DEDUP_LSH_BACKEND")
+    # v2: as bandas guardam numero_cnj (o namespace antigo guardava hash_content)
+    dedup_lsh_namespace: str = Field("dedup_lsh_v2", alias="DEDUP_LSH_NAMESPACE")
+    dedup_lsh_warm_start: bool = Field(True, alias="DEDUP_LSH_WARM_START")
+    # Alterar o tamanho do shingle invalida as assinaturas já indexadas
+    dedup_shingle_size: int = Field(1, alias="DEDUP_SHINGLE_SIZE")
 
     # Feature flags
     enable_opensearch: bool = Field(True, alias="ENABLE_OPENSEARCH")
@@ -141,6 +235,27 @@ class Settings(BaseSettings):
     def opensearch_url(self) -> str:
         return f"https://{self.opensearch_host}:{self.opensearch_port}"
 
+    @validator("dedup_lsh_backend")
+    def validate_dedup_lsh_backend(cls, value: str) -> str:
+        allowed = {"memory", "redis"}
+        if value not in allowed:
+            raise ValueError(f"DEDUP_LSH_BACKEND deve ser um dos valores: {allowed}")
+        return value
+
+    @validator("selenium_render_profile")
+    def validate_selenium_render_profile(cls, value: str) -> str:
+        allowed = {"stealth", "fast"}
+        if value not in allowed:
+            raise ValueError(f"SELENIUM_RENDER_PROFILE deve ser um dos valores: {allowed}")
+        return value
+
+    @validator("export_format")
+    def validate_export_format(cls, value: str) -> str:
+        allowed = {"parquet", "jsonl"}
+        if value not in allowed:
+            raise ValueError(f"EXPORT_FORMAT deve ser um dos valores: {allowed}")
+        return value
+
     @validator("environment")
     def validate_environment(cls, value: str) -> str:
         allowed = {"development", "staging", "production", "test"}
@@ -1,6 +1,17 @@
 """Base spiders."""
 
+from src.crawlers.base.browser_pool import BrowserPool, get_browser_pool
+from src.crawlers.base.extraction_plan import ExtractionPlan, field
+from src.crawlers.base.render_profile import RenderProfile
 from src.crawlers.base.resilient_spider import ResilientSpider
 from src.crawlers.base.selenium_spider import SeleniumSpider
 
-__all__ = ["ResilientSpider", "SeleniumSpider"]
+__all__ = [
+    "BrowserPool",
+    "ExtractionPlan",
+    "RenderProfile",
+    "ResilientSpider",
+    "SeleniumSpider",
+    "field",
+    "get_browser_pool",
+]
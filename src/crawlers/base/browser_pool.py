@@ -0,0 +1,314 @@
+"""Pool de navegadores Chrome reaproveitáveis entre páginas e tasks."""
+
+from __future__ import annotations
+
+import atexit
+import os
+import queue
+import random
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from undetected_chromedriver import Chrome
+
+from src.config import settings
+from src.crawlers.base.render_profile import RenderProfile
+from src.utils.logger import get_logger
+from src.utils.metrics import browser_pool_in_use, browsers_recycled
+from src.utils.proxy_manager import get_proxy_manager
+
+logger = get_logger(__name__)
+
+USER_AGENTS = [
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/118.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 "
+    "(KHTML, like Gecko) Version/17.0 Safari/605.1.15",
+    "Mozilla/5.0 (X11; Ubuntu; Linux x86_64; rv:118.0) Gecko/20100101 Firefox/118.0",
+]
+
+
+def create_chrome_driver(
+    proxy: Optional[str] = None, page_load_strategy: Optional[str] = None
+) -> webdriver.Chrome:
+    """Inicia um Chrome não detectável com as opções anti-bot do projeto.
+
+    ``page_load_strategy`` vem do perfil de renderização configurado; com
+    ``eager`` o ``get()`` retorna no ``DOMContentLoaded``.
+    """
+    options = webdriver.ChromeOptions()
+    options.page_load_strategy = (
+        page_load_strategy or RenderProfile.from_settings().page_load_strategy
+    )
+    options.add_argument("--disable-blink-features=AutomationControlled")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--no-sandbox")
+    options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    options.add_experimental_option("useAutomationExtension", False)
+    options.add_argument(f"user-agent={random.choice(USER_AGENTS)}")
+
+    if settings.selenium_headless:
+        options.add_argument("--headless=new")
+
+    if proxy:
+        options.add_argument(f"--proxy-server={proxy}")
+
+    driver = Chrome(options=options)
+    driver.set_page_load_timeout(settings.selenium_page_load_timeout)
+
+    driver.execute_cdp_cmd(
+        "Page.addScriptToEvaluateOnNewDocument",
+        {
+            "source": """
+            Object.defineProperty(navigator, 'webdriver', {
+                get: () => undefined
+            });
+            """,
+        },
+    )
+
+    return driver
+
+
+@dataclass
+class PooledBrowser:
+    """Chrome do pool com o proxy fixo e o contador de páginas."""
+
+    driver: webdriver.Chrome
+    proxy: Optional[str]
+    created_at: float = field(default_factory=time.monotonic)
+    pages: int = 0
+    # Padrões já enviados via Network.setBlockedURLs para este Chrome
+    blocked_urls: Tuple[str, ...] = ()
+
+    @property
+    def browser_pid(self) -> Optional[int]:
+        return getattr(self.driver, "browser_pid", None)
+
+
+class BrowserPool:
+    """N navegadores aquecidos com checkout/checkin.
+
+    Cada navegador recebe um proxy do ``ProxyManager`` ao nascer e devolve
+    ao pool o resultado de cada página. É reciclado (fechado e recriado)
+    após ``SELENIUM_MAX_PAGES_PER_BROWSER`` páginas, quando o processo do
+    Chrome passa de ``SELENIUM_MAX_BROWSER_MEMORY_MB`` (medido a cada
+    ``SELENIUM_MEMORY_CHECK_INTERVAL`` páginas) ou quando falha no health
+    check feito a cada checkout.
+    """
+
+    def __init__(
+        self,
+        size: Optional[int] = None,
+        max_pages: Optional[int] = None,
+        max_memory_mb: Optional[int] = None,
+        checkout_timeout: Optional[float] = None,
+        memory_check_interval: Optional[int] = None,
+        driver_factory: Callable[[Optional[str]], webdriver.Chrome] = create_chrome_driver,
+    ):
+        self.size = max(size or settings.selenium_pool_size, 1)
+        self.max_pages = max_pages or settings.selenium_max_pages_per_browser
+        self.max_memory_mb = max_memory_mb or settings.selenium_max_browser_memory_mb
+        self.checkout_timeout = checkout_timeout or settings.selenium_checkout_timeout
+        self.memory_check_interval = max(
+            memory_check_interval or settings.selenium_memory_check_interval, 1
+        )
+        self.driver_factory = driver_factory
+        self.proxy_manager = get_proxy_manager()
+
+        self._idle: "queue.LifoQueue[PooledBrowser]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._in_use = 0
+        self._closed = False
+
+    def start(self) -> "BrowserPool":
+        """Aquece todos os navegadores (evita pagar o startup na primeira página)."""
+        while True:
+            # Reserva um slot por vez: falha ao subir um Chrome não prende os demais
+            with self._lock:
+                if self._created >= self.size:
+                    break
+                self._created += 1
+            self._idle.put(self._spawn_or_release())
+        return self
+
+    @contextmanager
+    def browser(self, timeout: Optional[float] = None) -> Iterator[PooledBrowser]:
+        """Empresta um navegador; exceção no bloco conta como falha."""
+        browser = self.checkout(timeout)
+        started = time.monotonic()
+        try:
+            yield browser
+        except Exception:
+            self.checkin(browser, failed=True)
+            raise
+        self.checkin(browser, latency=time.monotonic() - started)
+
+    def checkout(self, timeout: Optional[float] = None) -> PooledBrowser:
+        if self._closed:
+            raise RuntimeError("BrowserPool fechado")
+
+        if timeout is None:
+            timeout = self.checkout_timeout
+        browser = self._take_idle_or_spawn(timeout)
+        if not self.is_healthy(browser):
+            browsers_recycled.labels(reason="unhealthy").inc()
+            browser = self._replace(browser)
+
+        with self._lock:
+            self._in_use += 1
+            browser_pool_in_use.set(self._in_use)
+        return browser
+
+    def checkin(
+        self, browser: PooledBrowser, failed: bool = False, latency: Optional[float] = None
+    ) -> None:
+        with self._lock:
+            self._in_use -= 1
+            browser_pool_in_use.set(self._in_use)
+
+        browser.pages += 1
+        if browser.proxy:
+            if failed:
+                self.proxy_manager.mark_proxy_failed(browser.proxy)
+            else:
+                self.proxy_manager.mark_proxy_success(browser.proxy, latency)
+            # O checkin roda na thread da página, nunca no reactor
+            self.proxy_manager.sync_if_due()
+
+        reason = self._recycle_reason(browser, failed)
+        if self._closed:
+            self._quit(browser)
+            return
+        if reason:
+            browsers_recycled.labels(reason=reason).inc()
+            logger.info("browser_recycled", reason=reason, pages=browser.pages, proxy=browser.proxy)
+            try:
+                browser = self._replace(browser)
+            except Exception as exc:  # pylint: disable=broad-except
+                # Slot liberado: o próximo checkout tenta criar de novo
+                logger.error("browser_start_failed", error=str(exc))
+                return
+        self._idle.put(browser)
+
+    def is_healthy(self, browser: PooledBrowser) -> bool:
+        try:
+            return browser.driver.execute_script("return 1") == 1 and bool(
+                browser.driver.window_handles
+            )
+        except WebDriverException:
+            return False
+
+    def close(self) -> None:
+        """Fecha os navegadores ociosos; os emprestados fecham no checkin."""
+        self._closed = True
+        while True:
+            try:
+                self._quit(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+    def _recycle_reason(self, browser: PooledBrowser, failed: bool) -> Optional[str]:
+        if failed and not self.is_healthy(browser):
+            return "unhealthy"
+        if browser.pages >= self.max_pages:
+            return "max_pages"
+        if (
+            self.max_memory_mb
+            and browser.browser_pid
+            and browser.pages % self.memory_check_interval == 0
+        ):
+            memory_mb = _process_tree_rss(browser.browser_pid) / (1024 * 1024)
+            if memory_mb > self.max_memory_mb:
+                return "memory"
+        return None
+
+    def _take_idle_or_spawn(self, timeout: float) -> PooledBrowser:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_spawn = self._created < self.size
+            if can_spawn:
+                self._created += 1
+        if can_spawn:
+            return self._spawn_or_release()
+
+        try:
+            return self._idle.get(timeout=timeout)
+        except queue.Empty as exc:
+            raise TimeoutError(f"Nenhum navegador livre em {timeout}s") from exc
+
+    def _spawn_or_release(self) -> PooledBrowser:
+        # O slot já foi reservado em _created; devolve se o Chrome não subir
+        try:
+            return self._spawn()
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+
+    def _spawn(self) -> PooledBrowser:
+        proxy = self.proxy_manager.get_proxy()
+        started = time.monotonic()
+        driver = self.driver_factory(proxy)
+        logger.info("browser_started", proxy=proxy, seconds=round(time.monotonic() - started, 2))
+        return PooledBrowser(driver=driver, proxy=proxy)
+
+    def _replace(self, browser: PooledBrowser) -> PooledBrowser:
+        self._quit(browser)
+        return self._spawn_or_release()
+
+    def _quit(self, browser: PooledBrowser) -> None:
+        try:
+            browser.driver.quit()
+        except Exception:  # pylint: disable=broad-except
+            logger.warning("selenium_driver_close_failed")
+
+
+def _process_tree_rss(root_pid: int) -> int:
+    """RSS (bytes) do processo e descendentes via /proc; 0 fora do Linux."""
+    try:
+        pids = [int(entry) for entry in os.listdir("/proc") if entry.isdigit()]
+    except OSError:
+        return 0
+
+    children: Dict[int, List[int]] = {}
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/stat", "rb") as stat:
+                # O nome do processo pode ter espaços: o ppid vem depois do ")"
+                ppid = int(stat.read().rsplit(b")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(pid)
+
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    total = 0
+    stack = [root_pid]
+    while stack:
+        pid = stack.pop()
+        try:
+            with open(f"/proc/{pid}/statm", "rb") as statm:
+                total += int(statm.read().split()[1]) * page_size
+        except (OSError, IndexError, ValueError):
+            continue
+        stack.extend(children.get(pid, ()))
+    return total
+
+
+@lru_cache()
+def get_browser_pool() -> BrowserPool:
+    """Pool do processo: reaproveitado entre spiders e tasks do mesmo worker."""
+    pool = BrowserPool()
+    atexit.register(pool.close)
+    return pool
@@ -0,0 +1,220 @@
+"""Planos de extração declarativos com seletores compilados."""
+
+import copy
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from lxml import etree
+from parsel.csstranslator import HTMLTranslator
+from scrapy.http import TextResponse
+
+if TYPE_CHECKING:
+    from src.crawlers.base.selector_ranking import SelectorRanker
+
+# Seletores ".classe", "#id", ".classe::text" e "#id::text" são resolvidos
+# pela varredura única do documento; os demais viram XPath compilado
+_SIMPLE_SELECTOR = re.compile(r"^([.#])([A-Za-z_][\w-]*)(::text)?$")
+
+_translator = HTMLTranslator()
+
+
+@dataclass(frozen=True)
+class CompiledSelector:
+    """Seletor CSS traduzido para XPath uma única vez."""
+
+    css: str
+    # ("class" | "id", nome) quando cabe na varredura única
+    simple_key: Optional[Tuple[str, str]]
+    text: bool
+    xpath: Optional[etree.XPath]
+
+    def evaluate(self, root, index: Mapping[Tuple[str, str], List[Any]]) -> List[Any]:
+        if self.simple_key is None:
+            return [str(value) if isinstance(value, str) else value for value in self.xpath(root)]
+
+        elements = index.get(self.simple_key, [])
+        if not self.text:
+            return list(elements)
+        # Mesmo resultado de "::text": nós de texto filhos diretos, em ordem
+        texts: List[str] = []
+        for element in elements:
+            if element.text is not None:
+                texts.append(element.text)
+            texts.extend(child.tail for child in element if child.tail is not None)
+        return texts
+
+
+@lru_cache(maxsize=4096)
+def compile_selector(css: str) -> CompiledSelector:
+    """Compila ``css`` (cacheado por processo, compartilhado entre spiders)."""
+    match = _SIMPLE_SELECTOR.match(css)
+    if match:
+        kind = "class" if match.group(1) == "." else "id"
+        return CompiledSelector(css, (kind, match.group(2)), bool(match.group(3)), None)
+    return CompiledSelector(css, None, False, etree.XPath(_translator.css_to_xpath(css)))
+
+
+@dataclass(frozen=True)
+class FieldSpec:
+    """Regra de extração de um campo.
+
+    ``selectors`` são tentados em ordem; vale o primeiro com resultado.
+    ``many`` devolve a lista de valores em vez do primeiro. ``nested``
+    aplica outro plano a cada elemento encontrado. ``process`` transforma o
+    valor encontrado; ``default`` (copiado) é usado quando nada casa.
+    """
+
+    selectors: Tuple[CompiledSelector, ...]
+    many: bool = False
+    default: Any = None
+    process: Optional[Callable[[Any], Any]] = None
+    nested: Optional["ExtractionPlan"] = None
+
+    @property
+    def selector_keys(self) -> Tuple[str, ...]:
+        return tuple(selector.css for selector in self.selectors)
+
+
+def field(
+    *selectors: str,
+    many: bool = False,
+    default: Any = None,
+    process: Optional[Callable[[Any], Any]] = None,
+    nested: Optional["ExtractionPlan"] = None,
+) -> FieldSpec:
+    """Atalho para declarar um :class:`FieldSpec` a partir de CSS."""
+    return FieldSpec(
+        selectors=tuple(compile_selector(css) for css in selectors),
+        many=many,
+        default=default,
+        process=process,
+        nested=nested,
+    )
+
+
+class ExtractionPlan:
+    """Mapa campo -> seletores, compilado na definição da spider.
+
+    Todos os seletores simples do plano são resolvidos por uma única
+    varredura do documento, que indexa os elementos por classe/id;
+    seletores complexos usam XPath pré-compilado.
+    """
+
+    def __init__(self, fields: Mapping[str, Union[FieldSpec, str]]):
+        self.fields: Dict[str, FieldSpec] = {
+            name: spec if isinstance(spec, FieldSpec) else field(spec)
+            for name, spec in fields.items()
+        }
+        self._classes = frozenset(
+            selector.simple_key[1]
+            for spec in self.fields.values()
+            for selector in spec.selectors
+            if selector.simple_key and selector.simple_key[0] == "class"
+        )
+        self._ids = frozenset(
+            selector.simple_key[1]
+            for spec in self.fields.values()
+            for selector in spec.selectors
+            if selector.simple_key and selector.simple_key[0] == "id"
+        )
+        self._scan = self._compile_scan()
+
+    @classmethod
+    def from_mapping(cls, selectors: Mapping[str, str]) -> "ExtractionPlan":
+        """Plano com um seletor CSS por campo (formato legado dos fallbacks)."""
+        return cls({name: field(css) for name, css in selectors.items()})
+
+    def _compile_scan(self) -> Optional[etree.XPath]:
+        # Um predicado por classe multiplica o custo da varredura no libxml2;
+        # é mais barato trazer todo elemento com class/id e filtrar em Python
+        attributes = (["@class"] if self._classes else []) + (["@id"] if self._ids else [])
+        if not attributes:
+            return None
+        return etree.XPath(f"descendant-or-self::*[{' or '.join(attributes)}]")
+
+    def _build_index(self, root) -> Dict[Tuple[str, str], List[Any]]:
+        index: Dict[Tuple[str, str], List[Any]] = defaultdict(list)
+        if self._scan is None:
+            return index
+        for element in self._scan(root):
+            classes = (element.get("class") or "").split()
+            if not self._classes.isdisjoint(classes):
+                for name in classes:
+                    if name in self._classes:
+                        index[("class", name)].append(element)
+            element_id = element.get("id")
+            if element_id in self._ids:
+                index[("id", element_id)].append(element)
+        return index
+
+    def extract(
+        self,
+        source: Union[TextResponse, Any],
+        ranker: Optional["SelectorRanker"] = None,
+        scope: str = "",
+        prefix: str = "",
+    ) -> Dict[str, Any]:
+        """Extrai todos os campos de uma resposta ou elemento lxml.
+
+        Com ``ranker``, campos com mais de um seletor seguem a ordem aprendida
+        para ``scope`` (o portal) e cada acerto alimenta as estatísticas.
+        """
+        root = source.selector.root if isinstance(source, TextResponse) else source
+        index = self._build_index(root)
+        return {
+            name: self._extract_field(f"{prefix}{name}", spec, root, index, ranker, scope)
+            for name, spec in self.fields.items()
+        }
+
+    def _extract_field(
+        self,
+        name: str,
+        spec: FieldSpec,
+        root,
+        index,
+        ranker: Optional["SelectorRanker"],
+        scope: str,
+    ) -> Any:
+        selectors = spec.selectors
+        learning = ranker is not None and len(selectors) > 1
+        if learning:
+            selectors = ranker.order(scope, name, selectors, spec.selector_keys)
+
+        for selector in selectors:
+            values = selector.evaluate(root, index)
+            if not values:
+                continue
+            if learning:
+                ranker.record_success(
+                    scope, name, selector.css, declared_first=selector is spec.selectors[0]
+                )
+            if spec.nested is not None:
+                values = [
+                    spec.nested.extract(element, ranker, scope, prefix=f"{name}.")
+                    for element in values
+                ]
+            value = values if spec.many else values[0]
+            return spec.process(value) if spec.process else value
+        return copy.copy(spec.default)
+
+    def __repr__(self) -> str:
+        return f"ExtractionPlan({list(self.fields)})"
+
+
+def join_text(values: Sequence[str]) -> str:
+    """Pós-processamento comum: junta nós de texto com espaço."""
+    return " ".join(values)
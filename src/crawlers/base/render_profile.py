@@ -0,0 +1,80 @@
+"""Perfis de renderização das spiders Selenium."""
+
+import random
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from src.config import settings
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class RenderProfile:
+    """Como uma página é carregada e quanto do comportamento humano é simulado.
+
+    ``stealth`` é o comportamento histórico: carrega tudo e rola a página
+    com pausas em todas as páginas. ``fast`` bloqueia imagens, fontes e
+    mídia via CDP, devolve o controle no ``DOMContentLoaded`` e só simula
+    o usuário numa fração ``human_simulation_rate`` das páginas ou nas
+    ``captcha_stealth_pages`` páginas seguintes a um CAPTCHA.
+    """
+
+    name: str
+    blocked_urls: Tuple[str, ...] = ()
+    page_load_strategy: str = "normal"
+    human_simulation_rate: float = 1.0
+    captcha_stealth_pages: int = 0
+    dom_ready_timeout: float = 20.0
+
+    @classmethod
+    def from_settings(cls, name: Optional[str] = None) -> "RenderProfile":
+        name = name or settings.selenium_render_profile
+        if name == "fast":
+            return cls(
+                name="fast",
+                blocked_urls=tuple(
+                    pattern.strip()
+                    for pattern in settings.selenium_blocked_url_patterns.split(",")
+                    if pattern.strip()
+                ),
+                page_load_strategy="eager",
+                human_simulation_rate=settings.selenium_human_simulation_rate,
+                captcha_stealth_pages=settings.selenium_captcha_stealth_pages,
+            )
+        return cls(name="stealth")
+
+
+class HumanSimulationSampler:
+    """Decide, por página, se a simulação de usuário roda.
+
+    Mesmo esquema do ``StructureCheckSampler``: amostra aleatória no caso
+    normal e janela forçada depois de um evento (aqui, um CAPTCHA). As
+    páginas de um mesmo sampler rodam em threads diferentes (um navegador
+    do pool por thread), então o estado é protegido por um lock.
+    """
+
+    def __init__(self, profile: RenderProfile):
+        self.rate = min(max(profile.human_simulation_rate, 0.0), 1.0)
+        self.captcha_window = max(profile.captcha_stealth_pages, 0)
+        self._forced: Dict[str, int] = {}
+        self._random = random.Random()
+        self._lock = threading.Lock()
+
+    def should_simulate(self, domain: str) -> bool:
+        with self._lock:
+            forced = self._forced.get(domain, 0)
+            if forced > 0:
+                self._forced[domain] = forced - 1
+                return True
+            return self.rate >= 1.0 or self._random.random() < self.rate
+
+    def report_captcha(self, domain: str) -> None:
+        """CAPTCHA visto: as próximas páginas do domínio simulam o usuário."""
+        with self._lock:
+            already_forced = bool(self._forced.get(domain))
+            self._forced[domain] = self.captcha_window
+        if self.captcha_window and not already_forced:
+            logger.info("human_simulation_forced", domain=domain, pages=self.captcha_window)
@@ -2,21 +2,27 @@
 
 from __future__ import annotations
 
+import copy
 import random
-from abc import abstractmethod
-from typing import Any, Dict, Iterable, List
+from datetime import timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Union
 
 import scrapy
-from scrapy import Request
+from scrapy import Request, signals
 from scrapy.exceptions import IgnoreRequest
 from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
 
 from src.config import settings
+from src.crawlers.base.extraction_plan import ExtractionPlan
+from src.crawlers.base.selector_ranking import SelectorRanker
+from src.crawlers.middlewares.incremental_middleware import PageUnchanged
+from src.database.postgres.repositories import JudicialDecisionRepository
 from src.services.alert_service import AlertService
-from src.services.portal_monitor import PortalMonitor
+from src.services.crawl_sharding import CrawlShard
+from src.services.portal_monitor import PortalMonitor, StructureCheckSampler
 from src.utils.logger import get_logger
 from src.utils.metrics import active_spiders, items_scraped, requests_total
-from src.utils.proxy_manager import ProxyManager
+from src.utils.proxy_manager import get_proxy_manager
 
 logger = get_logger(__name__)
 
@@ -30,36 +36,90 @@ class ResilientSpider(scrapy.Spider):
         "DOWNLOAD_DELAY": settings.scrapy_download_delay,
         "AUTOTHROTTLE_ENABLED": settings.scrapy_autothrottle_enabled,
         "AUTOTHROTTLE_TARGET_CONCURRENCY": settings.scrapy_autothrottle_target_concurrency,
+        "PORTAL_MONITOR_SAMPLE_EVERY": settings.portal_monitor_sample_every,
+        "PORTAL_MONITOR_SAMPLE_RATE": settings.portal_monitor_sample_rate,
+        "PORTAL_MONITOR_FAILURE_WINDOW": settings.portal_monitor_failure_window,
     }
 
-    def __init__(self, *args: Any, **kwargs: Any):
+    # Spiders declarativas definem os planos em vez de sobrescrever a extração
+    extraction_plan: Optional[ExtractionPlan] = None
+    alternative_plans: Sequence[ExtractionPlan] = ()
+    # Campos fixos de todo item da spider (copiados a cada item)
+    item_defaults: Dict[str, Any] = {}
+    # Incrementar ao mudar a extração: força nova coleta das páginas já vistas
+    versao_parser: str = "1.0.0"
+    # Campos sem os quais o item extraído não serve (ver validate_data)
+    required_fields: Sequence[str] = ("numero_cnj",)
+
+    def __init__(
+        self,
+        *args: Any,
+        shard: Optional[CrawlShard] = None,
+        incremental: Union[bool, str] = False,
+        **kwargs: Any,
+    ):
         super().__init__(*args, **kwargs)
+        # Com shard, a spider só percorre a fatia dele (ver shard_requests)
+        self.shard = CrawlShard.from_dict(shard) if isinstance(shard, dict) else shard
+        # Incremental: requests condicionais (IncrementalCrawlMiddleware) e,
+        # sem shard, só as páginas já coletadas que estão desatualizadas
+        self.incremental = incremental in (True, "1", "true", "True")
         self.failed_urls: List[str] = []
         self.portal_monitor = PortalMonitor()
+        # Sem crawler (ex.: testes) checa todas as respostas; ver from_crawler
+        self.structure_sampler = StructureCheckSampler()
+        self.selector_ranker = SelectorRanker()
         self.alert_service = AlertService()
-        self.proxy_manager = ProxyManager()
+        self.proxy_manager = get_proxy_manager()
         active_spiders.labels(portal=self.portal_name).inc()
 
+    @classmethod
+    def from_crawler(cls, crawler, *args: Any, **kwargs: Any):
+        spider = super().from_crawler(crawler, *args, **kwargs)
+        spider.structure_sampler = StructureCheckSampler.from_settings(crawler.settings)
+        # Sincronização dos seletores no pool de I/O; o último envio sai em closed()
+        crawler.signals.connect(spider.selector_ranker.start, signal=signals.spider_opened)
+        return spider
+
     @property
     def portal_name(self) -> str:
         return getattr(self, "portal", self.name)
 
     def start_requests(self) -> Iterable[Request]:
+        if self.shard is not None:
+            yield from self.shard_requests(self.shard)
+            return
+        if self.incremental:
+            yield from self.stale_requests()
+            return
         for url in self.start_urls:
-            headers = self._build_headers()
-            meta = {}
-            proxy = self.proxy_manager.get_proxy()
-            if proxy:
-                meta["proxy"] = proxy
-
-            yield Request(
-                url,
-                callback=self.parse,
-                errback=self.handle_error,
-                headers=headers,
-                meta=meta,
-                dont_filter=True,
-            )
+            yield self.build_request(url)
+
+    def stale_requests(self) -> Iterable[Request]:
+        """Revisita páginas cujo ``timestamp_coleta``/``updated_at`` passou do limite."""
+        max_age = timedelta(hours=settings.incremental_max_age_hours)
+        for url in JudicialDecisionRepository().iter_stale_urls(self.portal_name, max_age):
+            yield self.build_request(url)
+
+    def build_request(self, url: str, callback: Optional[Callable] = None) -> Request:
+        headers = self._build_headers()
+        meta = {}
+        proxy = self.proxy_manager.get_proxy()
+        if proxy:
+            meta["proxy"] = proxy
+
+        return Request(
+            url,
+            callback=callback or self.parse,
+            errback=self.handle_error,
+            headers=headers,
+            meta=meta,
+            dont_filter=True,
+        )
+
+    def shard_requests(self, shard: CrawlShard) -> Iterable[Request]:
+        """Requests iniciais de um shard; spiders que suportam sharding sobrescrevem."""
+        raise NotImplementedError(f"{self.name} não suporta shards do tipo {shard.kind}")
 
     def _build_headers(self) -> Dict[str, str]:
         user_agent = random.choice(settings_scrapy_user_agents())
@@ -71,6 +131,9 @@ class ResilientSpider(scrapy.Spider):
 
     def handle_error(self, failure: Any) -> None:
         request = failure.request
+        if failure.check(PageUnchanged):
+            logger.debug("page_unchanged", url=request.url)
+            return
         url = getattr(request, "url", "desconhecida")
         logger.error("request_failed", url=url, error=str(failure))
         requests_total.labels(portal=self.portal_name, status="error").inc()
@@ -90,24 +153,42 @@ class ResilientSpider(scrapy.Spider):
         reraise=True,
     )
     def parse(self, response: scrapy.http.Response) -> Any:
-        requests_total.labels(portal=self.portal_name, status="success").inc()
-        self.portal_monitor.record_response(response)
+        portal = self.portal_name
+        requests_total.labels(portal=portal, status="success").inc()
 
-        if self.portal_monitor.detect_changes(response):
+        # Checagem estrutural amostrada; ver StructureCheckSampler
+        sampled = self.structure_sampler.should_check(portal)
+        structure_changed = sampled and self.portal_monitor.check_response(response)
+        if structure_changed:
             logger.warning("portal_structure_changed", url=response.url)
+            self.structure_sampler.report_failure(portal)
             alternative_data = self.try_alternative_selectors(response)
             if alternative_data:
-                items_scraped.labels(portal=self.portal_name, spider=self.name).inc()
+                items_scraped.labels(portal=portal, spider=self.name).inc()
                 yield alternative_data
                 return
 
         item = self.extract_data(response)
+        if not self.validate_data(item):
+            # Seletores que não acham nada ainda geram dict com os defaults
+            logger.warning("extraction_incomplete", url=response.url)
+            self.structure_sampler.report_failure(portal)
+            if structure_changed:
+                # Vale também para spiders sem planos alternativos (cadeias por campo)
+                self.alert_service.send_alert(
+                    level="critical",
+                    message=f"Selectors alternativos falharam para {response.url}",
+                )
         if item:
-            items_scraped.labels(portal=self.portal_name, spider=self.name).inc()
+            items_scraped.labels(portal=portal, spider=self.name).inc()
             yield item
 
     def try_alternative_selectors(self, response: scrapy.http.Response) -> Any:
-        for selector in self.get_alternative_selectors():
+        alternatives = list(self.get_alternative_selectors())
+        if not alternatives:
+            # Spiders com cadeias por campo já fazem o fallback em extract_data
+            return None
+        for selector in alternatives:
             try:
                 candidate = self.extract_with_selectors(response, selector)
                 if self.validate_data(candidate):
@@ -115,33 +196,48 @@ class ResilientSpider(scrapy.Spider):
                     return candidate
             except Exception:  # pylint: disable=broad-except
                 continue
-        self.alert_service.send_alert(
-            level="critical",
-            message=f"Selectors alternativos falharam para {response.url}",
-        )
+        # O alerta sai em parse, se nem a extração principal aproveitar a página
         return None
 
-    @abstractmethod
     def extract_data(self, response: scrapy.http.Response) -> Dict[str, Any]:
-        raise NotImplementedError
+        if self.extraction_plan is None:
+            raise NotImplementedError
+        try:
+            item = self.extraction_plan.extract(
+                response, ranker=self.selector_ranker, scope=self.portal_name
+            )
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.error("extract_error", url=response.url, error=str(exc))
+            return {}
+        return {
+            **copy.deepcopy(self.item_defaults),
+            **item,
+            "origem_url": response.url,
+            "portal": self.portal_name,
+            "versao_parser": self.versao_parser,
+        }
 
-    @abstractmethod
-    def get_alternative_selectors(self) -> Iterable[Dict[str, Any]]:
-        raise NotImplementedError
+    def get_alternative_selectors(self) -> Iterable[Union[ExtractionPlan, Dict[str, Any]]]:
+        return self.alternative_plans
 
-    @abstractmethod
     def extract_with_selectors(
-        self, response: scrapy.http.Response, selectors: Dict[str, Any]
+        self,
+        response: scrapy.http.Response,
+        selectors: Union[ExtractionPlan, Dict[str, Any]],
     ) -> Dict[str, Any]:
-        raise NotImplementedError
+        if not isinstance(selectors, ExtractionPlan):
+            # Formato antigo {campo: css}; os seletores ficam no cache de compilação
+            selectors = ExtractionPlan.from_mapping(selectors)
+        return selectors.extract(response, ranker=self.selector_ranker, scope=self.portal_name)
 
     def validate_data(self, data: Dict[str, Any]) -> bool:
-        return bool(data)
+        return bool(data) and all(data.get(name) for name in self.required_fields)
 
-    def closed(self, reason: str) -> None:  # noqa: D401
+    def closed(self, reason: str):  # noqa: D401
         """Atualiza métricas ao finalizar spider."""
         active_spiders.labels(portal=self.portal_name).dec()
         logger.info("spider_closed", name=self.name, reason=reason)
+        return self.selector_ranker.stop()
 
 
 def settings_scrapy_user_agents() -> List[str]:
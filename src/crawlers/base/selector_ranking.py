@@ -0,0 +1,181 @@
+"""Ordem aprendida das cadeias de seletores por portal e campo."""
+
+import threading
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Set, Tuple, TypeVar
+
+import redis
+from twisted.internet import defer, task, threads
+
+from src.config import settings
+from src.database.redis.connection import get_redis_client
+from src.pipelines.io_executor import get_io_threadpool
+from src.utils.logger import get_logger
+from src.utils.metrics import selector_fallbacks
+
+logger = get_logger(__name__)
+
+# Campo reservado do hash Redis com o último seletor que funcionou
+_LAST_FIELD = "__last__"
+
+RankKey = Tuple[str, str]
+S = TypeVar("S")
+
+
+class SelectorRanker:
+    """Reordena os seletores de cada campo pelo histórico de sucesso.
+
+    Primeiro vem o seletor que funcionou por último para aquele portal e
+    campo, depois os demais por número de sucessos e, no empate, na ordem
+    declarada. Após uma mudança de layout a spider passa a acertar de
+    primeira já na página seguinte à que encontrou o seletor novo.
+
+    Estatísticas ficam no Redis (hash ``{namespace}:{portal}:{campo}``,
+    seletor -> sucessos) e são sincronizadas a cada
+    ``SELECTOR_STATS_SYNC_INTERVAL`` segundos, não a cada página: um
+    ``LoopingCall`` (:meth:`start`) despacha :meth:`sync` para o pool de
+    I/O, e os callbacks de parse só tocam o estado em memória. O lock
+    protege esse estado entre a thread do reactor e a da sincronização.
+    """
+
+    def __init__(self, namespace: str = "selector_stats", sync_interval: Optional[float] = None):
+        self.namespace = namespace
+        self.sync_interval = (
+            settings.selector_stats_sync_interval if sync_interval is None else sync_interval
+        )
+        self._successes: Dict[RankKey, Dict[str, int]] = defaultdict(dict)
+        self._last: Dict[RankKey, str] = {}
+        self._pending: Dict[RankKey, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self._pending_last: Dict[RankKey, str] = {}
+        self._order_cache: Dict[Tuple[RankKey, Tuple[str, ...]], List[int]] = {}
+        self._known: Set[RankKey] = set()
+        self._lock = threading.Lock()
+        self._sync_loop: Optional[task.LoopingCall] = None
+
+    def start(self) -> None:
+        """Agenda a sincronização periódica (chamar na thread do reactor)."""
+        if self._sync_loop is None and self.sync_interval != float("inf"):
+            self._sync_loop = task.LoopingCall(self._sync_in_thread)
+            self._sync_loop.start(self.sync_interval, now=False)
+
+    def stop(self) -> defer.Deferred:
+        """Para o loop e envia os sucessos ainda pendentes."""
+        if self._sync_loop is None:
+            return defer.succeed(None)
+        if self._sync_loop.running:
+            self._sync_loop.stop()
+        self._sync_loop = None
+        return self._sync_in_thread()
+
+    def order(self, scope: str, field: str, selectors: Sequence[S], keys: Sequence[str]) -> List[S]:
+        """Seletores na ordem em que devem ser tentados."""
+        key = (scope, field)
+        cache_key = (key, tuple(keys))
+        with self._lock:
+            positions = self._order_cache.get(cache_key)
+            if positions is None:
+                self._known.add(key)
+                successes = self._successes.get(key, {})
+                last = self._last.get(key)
+                positions = sorted(
+                    range(len(keys)),
+                    key=lambda i: (keys[i] != last, -successes.get(keys[i], 0), i),
+                )
+                self._order_cache[cache_key] = positions
+        return [selectors[i] for i in positions]
+
+    def record_success(self, scope: str, field: str, selector: str, declared_first: bool) -> None:
+        key = (scope, field)
+        if not declared_first:
+            selector_fallbacks.labels(portal=scope, field=field).inc()
+        with self._lock:
+            counts = self._successes[key]
+            counts[selector] = counts.get(selector, 0) + 1
+            self._pending[key][selector] += 1
+            promoted = self._last.get(key) != selector
+            if promoted:
+                self._last[key] = selector
+                self._pending_last[key] = selector
+                self._invalidate(key)
+        if promoted:
+            logger.info("selector_promoted", portal=scope, field=field, selector=selector)
+
+    def _invalidate(self, key: RankKey) -> None:
+        for cache_key in [cache_key for cache_key in self._order_cache if cache_key[0] == key]:
+            del self._order_cache[cache_key]
+
+    def _redis_key(self, key: RankKey) -> str:
+        return f"{self.namespace}:{key[0]}:{key[1]}"
+
+    def _sync_in_thread(self) -> defer.Deferred:
+        from twisted.internet import reactor
+
+        deferred = threads.deferToThreadPool(reactor, get_io_threadpool(), self._sync_safely)
+        deferred.addErrback(
+            lambda failure: logger.warning(
+                "selector_stats_sync_failed", error=failure.getErrorMessage()
+            )
+        )
+        return deferred
+
+    def _sync_safely(self) -> None:
+        try:
+            self.sync()
+        except redis.RedisError as exc:
+            # Sem Redis a ordem continua sendo aprendida localmente
+            logger.warning("selector_stats_sync_failed", error=str(exc))
+
+    def sync(self) -> None:
+        """Envia sucessos locais e incorpora os dos outros workers (bloqueante)."""
+        with self._lock:
+            # Inclui campos ainda sem sucesso local: aprendem com os outros workers
+            keys = list(self._known | set(self._successes))
+            pending = {key: dict(counts) for key, counts in self._pending.items()}
+            pending_last = dict(self._pending_last)
+            self._pending.clear()
+            self._pending_last.clear()
+        if not keys:
+            return
+
+        try:
+            pipe = get_redis_client().pipeline(transaction=False)
+            for key in keys:
+                redis_key = self._redis_key(key)
+                for selector, count in pending.get(key, {}).items():
+                    pipe.hincrby(redis_key, selector, count)
+                if key in pending_last:
+                    pipe.hset(redis_key, _LAST_FIELD, pending_last[key])
+            for key in keys:
+                pipe.hgetall(self._redis_key(key))
+            results = pipe.execute()
+        except redis.RedisError:
+            self._restore_pending(pending, pending_last)
+            raise
+        # Os HGETALL vêm depois das escritas enfileiradas acima
+        first = len(results) - len(keys)
+        remote_states = results[first:]
+
+        with self._lock:
+            for key, remote in zip(keys, remote_states):
+                if not remote:
+                    continue
+                last = remote.pop(_LAST_FIELD, None)
+                successes = {selector: int(count) for selector, count in remote.items()}
+                # Sucessos registrados durante a ida ao Redis ainda não estão lá
+                for selector, count in self._pending.get(key, {}).items():
+                    successes[selector] = successes.get(selector, 0) + count
+                self._successes[key] = successes
+                if last and key not in self._pending_last:
+                    self._last[key] = last
+                self._invalidate(key)
+
+    def _restore_pending(
+        self, pending: Dict[RankKey, Dict[str, int]], pending_last: Dict[RankKey, str]
+    ) -> None:
+        # Falha no envio: os deltas voltam para a próxima sincronização
+        with self._lock:
+            for key, counts in pending.items():
+                for selector, count in counts.items():
+                    self._pending[key][selector] += count
+            for key, selector in pending_last.items():
+                self._pending_last.setdefault(key, selector)
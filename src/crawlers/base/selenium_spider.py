@@ -4,79 +4,59 @@ from __future__ import annotations
 
 import random
 import time
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlparse
 
 from selenium import webdriver
 from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
-from undetected_chromedriver import Chrome
 
-from src.config import settings
+from src.crawlers.base.browser_pool import BrowserPool, PooledBrowser, get_browser_pool
+from src.crawlers.base.render_profile import HumanSimulationSampler, RenderProfile
+from src.crawlers.middlewares.captcha_middleware import has_captcha
 from src.services.alert_service import AlertService
 from src.utils.logger import get_logger
-from src.utils.proxy_manager import ProxyManager
 
 logger = get_logger(__name__)
 
 
 class SeleniumSpider:
-    """Base para spiders que precisam de renderização JavaScript."""
-
-    def __init__(self) -> None:
-        self.proxy_manager = ProxyManager()
+    """Base para spiders que precisam de renderização JavaScript.
+
+    Não abre Chrome próprio: cada página empresta um navegador do
+    ``BrowserPool`` do processo, então várias threads podem renderizar em
+    paralelo e tasks seguidas reaproveitam navegadores já aquecidos.
+
+    O ``RenderProfile`` (``SELENIUM_RENDER_PROFILE``) define se recursos
+    pesados são bloqueados e em quais páginas o usuário é simulado.
+    """
+
+    def __init__(
+        self, pool: Optional[BrowserPool] = None, profile: Optional[RenderProfile] = None
+    ) -> None:
+        self.pool = pool or get_browser_pool()
+        self.profile = profile or RenderProfile.from_settings()
+        self.human_simulation = HumanSimulationSampler(self.profile)
         self.alert_service = AlertService()
-        self.driver = self._setup_driver()
-        self.wait = WebDriverWait(self.driver, 20)
-
-    def _setup_driver(self) -> webdriver.Chrome:
-        options = webdriver.ChromeOptions()
-        options.add_argument("--disable-blink-features=AutomationControlled")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--no-sandbox")
-        options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        options.add_experimental_option("useAutomationExtension", False)
-        options.add_argument(f"user-agent={self._get_random_user_agent()}")
-
-        if settings.selenium_headless:
-            options.add_argument("--headless=new")
-
-        proxy = self.proxy_manager.get_proxy()
-        if proxy:
-            options.add_argument(f"--proxy-server={proxy}")
-
-        driver = Chrome(options=options)
-
-        driver.execute_cdp_cmd(
-            "Page.addScriptToEvaluateOnNewDocument",
-            {
-                "source": """
-                Object.defineProperty(navigator, 'webdriver', {
-                    get: () => undefined
-                });
-                """,
-            },
-        )
-
-        return driver
-
-    def _get_random_user_agent(self) -> str:
-        agents = [
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
-            "(KHTML, like Gecko) Chrome/118.0.0.0 Safari/537.36",
-            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 "
-            "(KHTML, like Gecko) Version/17.0 Safari/605.1.15",
-            "Mozilla/5.0 (X11; Ubuntu; Linux x86_64; rv:118.0) Gecko/20100101 Firefox/118.0",
-        ]
-        return random.choice(agents)
 
     def scrape_page(self, url: str, wait_selector: str) -> Dict[str, Any]:
+        domain = urlparse(url).netloc
         try:
-            self.driver.get(url)
-            self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, wait_selector)))
-            self._simulate_human_behavior()
-            html = self.driver.page_source
+            with self.pool.browser() as browser:
+                self._apply_profile(browser)
+                driver = browser.driver
+                driver.get(url)
+                WebDriverWait(driver, self.profile.dom_ready_timeout).until(
+                    _dom_ready(wait_selector)
+                )
+                if self.human_simulation.should_simulate(domain):
+                    self._simulate_human_behavior(driver)
+                html = driver.page_source
+            if has_captcha(html.encode("utf-8")):
+                logger.warning("captcha_detected", url=url)
+                self.human_simulation.report_captcha(domain)
             return {
                 "url": url,
                 "html": html,
@@ -89,15 +69,34 @@ class SeleniumSpider:
             )
             raise exc
 
-    def _simulate_human_behavior(self) -> None:
-        total_height = self.driver.execute_script("return document.body.scrollHeight")
+    def _apply_profile(self, browser: PooledBrowser) -> None:
+        # Navegadores do pool são compartilhados: só reenvia se o perfil mudou
+        if browser.blocked_urls == self.profile.blocked_urls:
+            return
+        browser.driver.execute_cdp_cmd("Network.enable", {})
+        browser.driver.execute_cdp_cmd(
+            "Network.setBlockedURLs", {"urls": list(self.profile.blocked_urls)}
+        )
+        browser.blocked_urls = self.profile.blocked_urls
+
+    def _simulate_human_behavior(self, driver: webdriver.Chrome) -> None:
+        total_height = driver.execute_script("return document.body.scrollHeight")
         for position in range(0, total_height, 200):
-            self.driver.execute_script("window.scrollTo(0, arguments[0]);", position)
+            driver.execute_script("window.scrollTo(0, arguments[0]);", position)
             time.sleep(random.uniform(0.1, 0.3))
         time.sleep(random.uniform(1, 2))
 
     def close(self) -> None:
-        try:
-            self.driver.quit()
-        except Exception:  # pylint: disable=broad-except
-            logger.warning("selenium_driver_close_failed")
+        # Navegadores pertencem ao pool do processo e continuam aquecidos
+        logger.debug("selenium_spider_closed")
+
+
+def _dom_ready(wait_selector: str) -> Callable[[webdriver.Chrome], bool]:
+    """DOM já parseado e elemento esperado presente (sem sleeps fixos)."""
+    element_present = EC.presence_of_element_located((By.CSS_SELECTOR, wait_selector))
+
+    def condition(driver: webdriver.Chrome) -> bool:
+        ready_state = driver.execute_script("return document.readyState")
+        return ready_state != "loading" and bool(element_present(driver))
+
+    return condition
@@ -1,13 +1,32 @@
 """Spider para TJSP através do sistema eSAJ."""
 
-from typing import Any, Dict, Iterable
+from typing import Any, Dict, Iterable, List
+from urllib.parse import urlencode
 
+from scrapy import Request
 from scrapy.http import Response
 
+from src.crawlers.base.extraction_plan import ExtractionPlan, field, join_text
 from src.crawlers.base.resilient_spider import ResilientSpider
-from src.utils.logger import get_logger
+from src.services.crawl_sharding import CrawlShard
 
-logger = get_logger(__name__)
+# Consulta de processos de 1º grau pelo número unificado
+CPOPG_SEARCH_URL = "https://esaj.tjsp.jus.br/cpopg/search.do"
+# Consulta de julgados de 1º grau por período
+CJPG_SEARCH_URL = "https://esaj.tjsp.jus.br/cjpg/pesquisar.do"
+
+
+def _build_partes(partes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [
+        {
+            "nome": parte["nome"].strip(),
+            "tipo": parte["tipo"].strip(),
+            "documento": None,
+            "representante": None,
+        }
+        for parte in partes
+        if parte["nome"] and parte["tipo"]
+    ]
 
 
 class TJSPESAJSpider(ResilientSpider):
@@ -23,78 +42,82 @@ class TJSPESAJSpider(ResilientSpider):
         "DOWNLOAD_DELAY": 2,
     }
 
-    def extract_data(self, response: Response) -> Dict[str, Any]:
-        """Extrai dados de decisão judicial do eSAJ."""
-        try:
-            item = {
-                "numero_cnj": self._extract_numero_cnj(response),
-                "numero_processo": response.css(".unificado::text").get() or "",
-                "classe": response.css(".classeProcesso::text").get() or "",
-                "assunto": response.css(".assuntoProcesso::text").get(),
-                "sistema_origem": "eSAJ",
-                "tribunal": "TJSP",
-                "orgao_julgador": response.css(".orgaoJulgador::text").get() or "",
-                "relator": response.css(".relator::text").get(),
-                "data_distribuicao": response.css(".dataDistribuicao::text").get() or "",
-                "data_julgamento": response.css(".dataJulgamento::text").get(),
-                "data_publicacao": response.css(".dataPublicacao::text").get(),
-                "ementa": response.css(".ementa::text").getall() or [""],
-                "decisao": response.css(".decisao::text").getall() or [""],
-                "partes": self._extract_partes(response),
-                "documentos": [],
-                "origem_url": response.url,
-                "portal": self.portal,
-            }
-
-            item["ementa"] = " ".join(item["ementa"])
-            item["decisao"] = " ".join(item["decisao"])
-
-            return item
-
-        except Exception as exc:  # pylint: disable=broad-except
-            logger.error("extract_error", url=response.url, error=str(exc))
-            return {}
-
-    def _extract_numero_cnj(self, response: Response) -> str:
-        numero = response.css(".numeroProcesso::text").get() or ""
-        return numero.strip()
+    item_defaults = {
+        "sistema_origem": "eSAJ",
+        "tribunal": "TJSP",
+        "documentos": [],
+    }
 
-    def _extract_partes(self, response: Response) -> list:
-        partes = []
-        for parte_div in response.css(".parte"):
-            nome = parte_div.css(".nomeParte::text").get()
-            tipo = parte_div.css(".tipoParte::text").get()
-            if nome and tipo:
-                partes.append(
+    extraction_plan = ExtractionPlan(
+        {
+            # Cadeias por campo: a ordem é reaprendida em runtime (SelectorRanker)
+            "numero_cnj": field(
+                ".numeroProcesso::text",
+                ".processo-numero::text",
+                "#numeroProcesso::text",
+                default="",
+                process=str.strip,
+            ),
+            "numero_processo": field(".unificado::text", default=""),
+            "classe": field(
+                ".classeProcesso::text",
+                ".processo-classe::text",
+                "#classeProcesso::text",
+                default="",
+            ),
+            "assunto": field(".assuntoProcesso::text"),
+            "orgao_julgador": field(".orgaoJulgador::text", default=""),
+            "relator": field(".relator::text"),
+            "data_distribuicao": field(".dataDistribuicao::text", default=""),
+            "data_julgamento": field(".dataJulgamento::text"),
+            "data_publicacao": field(".dataPublicacao::text"),
+            "ementa": field(".ementa::text", many=True, default="", process=join_text),
+            "decisao": field(".decisao::text", many=True, default="", process=join_text),
+            "partes": field(
+                ".parte",
+                many=True,
+                default=[],
+                nested=ExtractionPlan(
                     {
-                        "nome": nome.strip(),
-                        "tipo": tipo.strip(),
-                        "documento": None,
-                        "representante": None,
+                        "nome": field(".nomeParte::text"),
+                        "tipo": field(".tipoParte::text"),
                     }
-                )
-        return partes
-
-    def get_alternative_selectors(self) -> Iterable[Dict[str, Any]]:
-        """Fornece seletores alternativos se estrutura mudar."""
-        return [
-            {
-                "numero_cnj": ".processo-numero::text",
-                "classe": ".processo-classe::text",
-            },
-            {
-                "numero_cnj": "#numeroProcesso::text",
-                "classe": "#classeProcesso::text",
-            },
-        ]
-
-    def extract_with_selectors(
-        self,
-        response: Response,
-        selectors: Dict[str, Any],
-    ) -> Dict[str, Any]:
-        """Tenta extrair usando seletores alternativos."""
-        return {
-            key: response.css(selector).get()
-            for key, selector in selectors.items()
+                ),
+                process=_build_partes,
+            ),
         }
+    )
+
+    def shard_requests(self, shard: CrawlShard) -> Iterable[Request]:
+        if shard.kind == "cnj":
+            # Justiça Estadual (8), TJSP (26)
+            for cnj in shard.cnj_numbers(segmento="8", tribunal="26"):
+                query = {
+                    "cbPesquisa": "NUMPROC",
+                    "dadosConsulta.tipoNuProcesso": "UNIFICADO",
+                    "numeroDigitoAnoUnificado": f"{cnj.sequencial}-{cnj.digito}.{cnj.ano}",
+                    "foroNumeroUnificado": cnj.origem,
+                    "dadosConsulta.valorConsultaNuUnificado": str(cnj),
+                }
+                yield self.build_request(f"{CPOPG_SEARCH_URL}?{urlencode(query)}")
+        elif shard.kind == "dates":
+            start, end = shard.dates
+            query = {
+                "dadosConsulta.dtInicio": start.strftime("%d/%m/%Y"),
+                "dadosConsulta.dtFim": end.strftime("%d/%m/%Y"),
+            }
+            yield self.build_request(
+                f"{CJPG_SEARCH_URL}?{urlencode(query)}", callback=self.parse_search_results
+            )
+        else:
+            yield from super().shard_requests(shard)
+
+    def parse_search_results(self, response: Response) -> Iterable[Request]:
+        """Lista de julgados do período: segue cada processo e a próxima página."""
+        for href in response.css("a[href*='cpopg/show.do']::attr(href)").getall():
+            yield self.build_request(response.urljoin(href))
+        next_page = response.css("a[title='Próxima página']::attr(href)").get()
+        if next_page:
+            yield self.build_request(
+                response.urljoin(next_page), callback=self.parse_search_results
+            )
@@ -0,0 +1 @@
+"""Extensões Scrapy."""
@@ -0,0 +1,95 @@
+"""Extensão que alimenta os contadores diários de qualidade."""
+
+from typing import Any, Collection, Dict, List, Optional
+
+from itemadapter import ItemAdapter
+from scrapy import signals
+from scrapy.exceptions import NotConfigured
+from twisted.internet import defer, task, threads
+
+from src.pipelines.deduplication_pipeline import DuplicateItem
+from src.pipelines.io_executor import get_io_threadpool
+from src.pipelines.normalize_validate_pipeline import InvalidItem
+from src.pipelines.signals import decisions_persisted
+from src.services.quality_stats import DUPLICATE, INVALID, QualityStatsRecorder
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class QualityStatsExtension:
+    """Conta itens gravados (``decisions_persisted``) e descartados (``item_dropped``).
+
+    Gravados saem do resultado do flush no PostgreSQL, não de
+    ``item_scraped``: no modo em lote o item passa pelo pipeline antes de o
+    lote chegar ao banco, e um lote perdido não deve contar. Decisões novas
+    e recoletas são contadas à parte. Os contadores são gravados no pool de
+    I/O a cada ``QUALITY_STATS_FLUSH_INTERVAL`` segundos e no fechamento.
+    """
+
+    def __init__(self, crawler, flush_interval: float):
+        self.crawler = crawler
+        self.recorder = QualityStatsRecorder()
+        self.flush_interval = flush_interval
+        self._flush_loop: Optional[task.LoopingCall] = None
+        crawler.signals.connect(self.decisions_persisted, signal=decisions_persisted)
+        crawler.signals.connect(self.item_dropped, signal=signals.item_dropped)
+        crawler.signals.connect(self.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(self.spider_closed, signal=signals.spider_closed)
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        if not crawler.settings.getbool("QUALITY_STATS_ENABLED", True):
+            raise NotConfigured
+        return cls(crawler, crawler.settings.getfloat("QUALITY_STATS_FLUSH_INTERVAL", 30.0))
+
+    def spider_opened(self, spider) -> None:
+        self._flush_loop = task.LoopingCall(self._flush)
+        self._flush_loop.start(self.flush_interval, now=False)
+
+    def spider_closed(self, spider) -> defer.Deferred:
+        if self._flush_loop and self._flush_loop.running:
+            self._flush_loop.stop()
+        return self._flush()
+
+    def decisions_persisted(
+        self, items: List[Dict[str, Any]], inserted: Collection[str] = ()
+    ) -> None:
+        portal = _portal(self.crawler.spider)
+        for item in items:
+            if item.get("numero_cnj") in inserted:
+                self.recorder.record_stored(item, portal=portal)
+            else:
+                self.recorder.record_updated(item, portal=portal)
+
+    def item_dropped(self, item: Any, response, exception: Exception, spider) -> None:
+        if isinstance(exception, DuplicateItem):
+            self.recorder.record_dropped(DUPLICATE, portal=_item_portal(item, spider))
+        elif isinstance(exception, InvalidItem):
+            self.recorder.record_dropped(INVALID, portal=_item_portal(item, spider))
+
+    def _flush(self) -> defer.Deferred:
+        from twisted.internet import reactor
+
+        if not self.recorder.pending:
+            return defer.succeed(0)
+        deferred = threads.deferToThreadPool(reactor, get_io_threadpool(), self.recorder.flush)
+        # Falha não derruba o LoopingCall: os contadores ficam para o próximo flush
+        deferred.addErrback(
+            lambda failure: logger.warning(
+                "quality_stats_flush_failed", error=failure.getErrorMessage()
+            )
+        )
+        return deferred
+
+
+def _portal(spider) -> str:
+    return getattr(spider, "portal_name", spider.name)
+
+
+def _item_portal(item: Any, spider) -> str:
+    try:
+        portal = ItemAdapter(item).get("portal")
+    except TypeError:
+        portal = None
+    return portal or _portal(spider)
@@ -10,6 +10,19 @@ from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+CAPTCHA_INDICATORS = (
+    b"recaptcha",
+    b"captcha",
+    b"g-recaptcha",
+    b"hcaptcha",
+)
+
+
+def has_captcha(body: bytes) -> bool:
+    """Detecta CAPTCHAs comuns no corpo de uma página."""
+    body_lower = body.lower()
+    return any(indicator in body_lower for indicator in CAPTCHA_INDICATORS)
+
 
 class CaptchaSolverMiddleware:
     """Detecta e resolve CAPTCHAs automaticamente."""
@@ -31,14 +44,7 @@ class CaptchaSolverMiddleware:
 
     def _has_captcha(self, response: Response) -> bool:
         """Detecta CAPTCHAs comuns."""
-        captcha_indicators = [
-            b"recaptcha",
-            b"captcha",
-            b"g-recaptcha",
-            b"hcaptcha",
-        ]
-        body_lower = response.body.lower()
-        return any(indicator in body_lower for indicator in captcha_indicators)
+        return has_captcha(response.body)
 
     def solve_captcha(self, response: Response) -> Optional[str]:
         """
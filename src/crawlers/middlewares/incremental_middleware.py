@@ -0,0 +1,192 @@
+"""Middleware de crawl incremental com requests condicionais."""
+
+import hashlib
+from typing import Any, Dict, List, Optional
+
+from itemadapter import ItemAdapter
+from scrapy import Request, signals
+from scrapy.exceptions import IgnoreRequest
+from scrapy.http import Response
+from twisted.internet import defer, threads
+
+from src.database.postgres.repositories import JudicialDecisionRepository
+from src.pipelines.deduplication_pipeline import DuplicateItem
+from src.pipelines.io_executor import get_io_threadpool
+from src.pipelines.signals import decisions_persisted
+from src.services.page_state import PageStateStore
+from src.utils.local_cache import MISSING, LocalTTLCache
+from src.utils.logger import get_logger
+from src.utils.metrics import incremental_pages
+
+logger = get_logger(__name__)
+
+# Estados de páginas baixadas cujos itens ainda não chegaram ao PostgreSQL
+PENDING_STATES_MAXSIZE = 10_000
+PENDING_STATES_TTL = 3600.0
+
+
+class PageUnchanged(IgnoreRequest):
+    """Página igual à última coleta: não passa pela spider nem pelos pipelines."""
+
+
+class IncrementalCrawlMiddleware:
+    """Envia If-None-Match/If-Modified-Since e descarta páginas sem mudança.
+
+    Só atua em spiders com ``incremental`` ligado. Um 304, ou um 200 com o
+    mesmo hash de corpo da coleta anterior, vira ``PageUnchanged`` antes do
+    parse; o ``timestamp_coleta`` dessas páginas é atualizado em lote para
+    que saiam da lista de páginas desatualizadas. Leituras e escritas de
+    estado rodam no pool de I/O, fora do reactor.
+
+    O estado de uma página alterada só é gravado quando a decisão extraída
+    dela chega ao PostgreSQL (sinal ``decisions_persisted``): uma página
+    cujo item se perdeu continua sendo baixada por inteiro. Item descartado
+    como ``DuplicateItem`` conta como gravado: o banco já tem esse conteúdo,
+    então o estado é salvo e a página entra no lote de ``touch_collected``.
+    Estado gravado por outra ``versao_parser`` da spider também não evita a
+    nova extração.
+    """
+
+    def __init__(self, crawler, touch_batch: int):
+        self.stats = crawler.stats
+        self.store = PageStateStore()
+        self.repository = JudicialDecisionRepository()
+        self.touch_batch = max(touch_batch, 1)
+        self._unchanged_urls: List[str] = []
+        # origem_url -> (url da request, estado novo)
+        self._pending_states = LocalTTLCache(PENDING_STATES_MAXSIZE, PENDING_STATES_TTL)
+        crawler.signals.connect(self.spider_closed, signal=signals.spider_closed)
+        crawler.signals.connect(self.decisions_persisted, signal=decisions_persisted)
+        crawler.signals.connect(self.item_dropped, signal=signals.item_dropped)
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(crawler, crawler.settings.getint("INCREMENTAL_TOUCH_BATCH", 200))
+
+    def process_request(self, request: Request, spider):  # type: ignore[override]
+        if not getattr(spider, "incremental", False) or "page_state" in request.meta:
+            # Retries reaproveitam o estado e os cabeçalhos já aplicados
+            return None
+        deferred = self._in_thread(self.store.get, request.url)
+        deferred.addCallback(self._apply_validators, request, spider)
+        return deferred
+
+    def process_response(  # type: ignore[override]
+        self, request: Request, response: Response, spider
+    ):
+        state: Optional[Dict[str, str]] = request.meta.get("page_state")
+        if state is None:
+            return response
+
+        portal = getattr(spider, "portal_name", spider.name)
+        version = _parser_version(spider)
+        same_parser = state.get("versao_parser", "") == version
+        if response.status == 304 and same_parser:
+            self._unchanged(request, portal, "not_modified")
+
+        if response.status != 200:
+            return response
+
+        new_state = {
+            "etag": _header(response, b"ETag"),
+            "last_modified": _header(response, b"Last-Modified"),
+            "body_hash": hashlib.sha256(response.body).hexdigest(),
+            "versao_parser": version,
+        }
+        if same_parser and new_state["body_hash"] == state.get("body_hash"):
+            # Conteúdo já persistido na coleta anterior: só os validadores podem mudar
+            if {name: value for name, value in new_state.items() if value} != state:
+                self._in_thread(self.store.set, request.url, new_state).addErrback(
+                    self._log_failure, "page_state_save_failed", request.url
+                )
+            self._unchanged(request, portal, "hash_match")
+
+        self._pending_states.set(response.url, (request.url, new_state))
+        incremental_pages.labels(portal=portal, result="changed").inc()
+        return response
+
+    def decisions_persisted(self, items: List[dict]) -> Optional[defer.Deferred]:
+        """Grava o estado das páginas cujas decisões chegaram ao PostgreSQL."""
+        states: Dict[str, Dict[str, Optional[str]]] = {}
+        for data in items:
+            pending = self._take_pending(data.get("origem_url"))
+            if pending is not MISSING:
+                url, state = pending
+                states[url] = state
+        return self._save_states(states)
+
+    def item_dropped(
+        self, item: Any, response, exception: Exception, spider
+    ) -> Optional[defer.Deferred]:
+        """Duplicata: o conteúdo gravado já está atual, então a página também."""
+        if not isinstance(exception, DuplicateItem):
+            return None
+        origem_url = ItemAdapter(item).get("origem_url")
+        pending = self._take_pending(origem_url)
+        if pending is MISSING:
+            return None
+        url, state = pending
+        self._touch(origem_url)
+        return self._save_states({url: state})
+
+    def _take_pending(self, origem_url: Optional[str]):
+        pending = self._pending_states.get(origem_url) if origem_url else MISSING
+        if pending is not MISSING:
+            self._pending_states.pop(origem_url)
+        return pending
+
+    def _save_states(self, states: Dict[str, Dict[str, Optional[str]]]) -> Optional[defer.Deferred]:
+        if not states:
+            return None
+        deferred = self._in_thread(self.store.set_many, states)
+        deferred.addErrback(self._log_failure, "page_state_save_failed", f"{len(states)} urls")
+        return deferred
+
+    def spider_closed(self, spider) -> Optional[defer.Deferred]:
+        return self._flush_unchanged()
+
+    def _apply_validators(self, state: Dict[str, str], request: Request, spider) -> None:
+        request.meta["page_state"] = state
+        if state.get("versao_parser", "") != _parser_version(spider):
+            # Parser novo: um 304 impediria a nova extração da página
+            return
+        if state.get("etag"):
+            request.headers["If-None-Match"] = state["etag"]
+        if state.get("last_modified"):
+            request.headers["If-Modified-Since"] = state["last_modified"]
+
+    def _unchanged(self, request: Request, portal: str, result: str) -> None:
+        incremental_pages.labels(portal=portal, result=result).inc()
+        self.stats.inc_value(f"incremental/{result}")
+        self._touch(request.url)
+        raise PageUnchanged(f"{result}: {request.url}")
+
+    def _touch(self, url: str) -> None:
+        self._unchanged_urls.append(url)
+        if len(self._unchanged_urls) >= self.touch_batch:
+            self._flush_unchanged()
+
+    def _flush_unchanged(self) -> Optional[defer.Deferred]:
+        if not self._unchanged_urls:
+            return None
+        urls, self._unchanged_urls = self._unchanged_urls, []
+        deferred = self._in_thread(self.repository.touch_collected, urls)
+        deferred.addErrback(self._log_failure, "page_touch_failed", f"{len(urls)} urls")
+        return deferred
+
+    def _in_thread(self, func, *args) -> defer.Deferred:
+        from twisted.internet import reactor
+
+        return threads.deferToThreadPool(reactor, get_io_threadpool(), func, *args)
+
+    def _log_failure(self, failure, event: str, target: str) -> None:
+        logger.warning(event, target=target, error=failure.getErrorMessage())
+
+
+def _parser_version(spider) -> str:
+    return str(getattr(spider, "versao_parser", None) or "")
+
+
+def _header(response: Response, name: bytes) -> Optional[str]:
+    value = response.headers.get(name)
+    return value.decode("latin-1") if value else None
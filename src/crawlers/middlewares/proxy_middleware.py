@@ -2,33 +2,92 @@
 
 from typing import Optional
 
-from scrapy import Request
+from scrapy import Request, signals
 from scrapy.http import Response
+from twisted.internet import defer, task, threads
 
 from src.config import settings
+from src.pipelines.io_executor import get_io_threadpool
 from src.utils.logger import get_logger
-from src.utils.proxy_manager import ProxyManager
+from src.utils.proxy_manager import get_proxy_manager
 
 logger = get_logger(__name__)
 
+# Respostas que indicam bloqueio ou falha do proxy, não do portal
+PROXY_FAILURE_STATUS = {403, 407, 429, 502, 503, 504}
+
 
 class ProxyRotationMiddleware:
-    """Rotaciona proxies para cada requisição."""
+    """Escolhe proxy por saúde e devolve o resultado de cada request ao pool.
+
+    A escolha usa só o estado em memória; a sincronização com o Redis roda
+    a cada ``PROXY_STATE_REFRESH_INTERVAL`` no pool de I/O, fora do reactor.
+    """
 
     def __init__(self):
         self.enabled = settings.proxy_enabled
-        self.proxy_manager = ProxyManager()
+        self.proxy_manager = get_proxy_manager()
+        self._sync_loop: Optional[task.LoopingCall] = None
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        middleware = cls()
+        crawler.signals.connect(middleware.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(middleware.spider_closed, signal=signals.spider_closed)
+        return middleware
+
+    def spider_opened(self, spider) -> None:
+        if not self.enabled or not self.proxy_manager.shared_state:
+            return
+        self._sync_loop = task.LoopingCall(self._sync)
+        self._sync_loop.start(settings.proxy_state_refresh_interval, now=True)
+
+    def spider_closed(self, spider) -> None:
+        if self._sync_loop and self._sync_loop.running:
+            self._sync_loop.stop()
+
+    def _sync(self) -> defer.Deferred:
+        from twisted.internet import reactor
+
+        deferred = threads.deferToThreadPool(
+            reactor, get_io_threadpool(), self.proxy_manager.sync_if_due
+        )
+        # Falha não derruba o LoopingCall: os deltas ficam para a próxima rodada
+        deferred.addErrback(
+            lambda failure: logger.warning(
+                "proxy_state_sync_failed", error=failure.getErrorMessage()
+            )
+        )
+        return deferred
 
     def process_request(self, request: Request, spider):  # type: ignore[override]
         if not self.enabled:
             return None
 
+        # Mantém o proxy escolhido pela spider; retries trocam de proxy
+        if request.meta.get("proxy") and not request.meta.get("retry_times"):
+            return None
+
         proxy = self.proxy_manager.get_proxy()
         if proxy:
             request.meta["proxy"] = proxy
             logger.debug("proxy_assigned", proxy=proxy)
         return None
 
+    def process_response(  # type: ignore[override]
+        self, request: Request, response: Response, spider
+    ):
+        proxy: Optional[str] = request.meta.get("proxy")
+        if not proxy:
+            return response
+
+        if response.status in PROXY_FAILURE_STATUS:
+            self.proxy_manager.mark_proxy_failed(proxy)
+            logger.warning("proxy_marked_failed", proxy=proxy, status=response.status)
+        else:
+            self.proxy_manager.mark_proxy_success(proxy, request.meta.get("download_latency"))
+        return response
+
     def process_exception(self, request: Request, exception, spider):  # type: ignore[override]
         proxy: Optional[str] = request.meta.get("proxy")
         if proxy:
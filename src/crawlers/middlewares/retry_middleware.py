@@ -1,23 +1,48 @@
 """Middleware de retry inteligente com backoff exponencial."""
 
 import random
-import time
-from typing import Optional
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
 
 from scrapy import Request
 from scrapy.downloadermiddlewares.retry import RetryMiddleware
+from scrapy.utils.httpobj import urlparse_cached
+from twisted.internet.defer import Deferred
+from twisted.internet.task import deferLater
 
 from src.utils.logger import get_logger
+from src.utils.metrics import retry_wait_duration
 
 logger = get_logger(__name__)
 
+BackoffKey = Tuple[str, str]
+
 
 class ResilientRetryMiddleware(RetryMiddleware):
-    """Retry com jitter e controle de sessão."""
+    """Retry com jitter e backoff por domínio e por proxy.
+
+    A espera não bloqueia a thread do reactor: o request de retry é
+    devolvido por um Deferred agendado com ``callLater``. Mas o request
+    continua em andamento durante o backoff e ocupa uma vaga de
+    ``CONCURRENT_REQUESTS`` (e do slot do domínio) até a espera acabar;
+    muitos retries esperando ao mesmo tempo reduzem a vazão do crawl todo.
+
+    Cada domínio e cada proxy acumulam falhas consecutivas; a espera usa o
+    maior entre o número de tentativas do request e essas sequências, e a
+    sequência zera na primeira resposta bem-sucedida.
+    """
 
     def __init__(self, settings):
         super().__init__(settings)
         self.max_retry_times = settings.getint("RETRY_TIMES", 5)
+        self.max_backoff = settings.getfloat("RETRY_BACKOFF_MAX", 60.0)
+        self._failure_streaks: Dict[BackoffKey, int] = defaultdict(int)
+
+    def process_response(self, request: Request, response, spider):  # type: ignore[override]
+        if response.status not in self.retry_http_codes:
+            for key in self._backoff_keys(request):
+                self._failure_streaks.pop(key, None)
+        return super().process_response(request, response, spider)
 
     def process_exception(self, request: Request, exception, spider):  # type: ignore[override]
         logger.warning("request_exception", url=request.url, error=str(exception))
@@ -28,22 +53,41 @@ class ResilientRetryMiddleware(RetryMiddleware):
         request: Request,
         reason: Optional[str] = None,
         spider=None,
-    ):
-        retries = request.meta.get("retry_times", 0) + 1
-
-        if retries <= self.max_retry_times:
-            delay = self._calculate_delay(retries)
-            time.sleep(delay)
-            logger.info(
-                "retry_request",
-                url=request.url,
-                retries=retries,
-                delay=delay,
-                reason=str(reason),
-            )
-        return super()._retry(request, reason, spider)
+    ) -> Optional[Deferred]:
+        keys = self._backoff_keys(request)
+        for key in keys:
+            self._failure_streaks[key] += 1
+
+        retry_request = super()._retry(request, reason, spider)
+        if retry_request is None:
+            return None
+
+        retries = retry_request.meta.get("retry_times", 1)
+        attempts = max([retries] + [self._failure_streaks[key] for key in keys])
+        delay = self._calculate_delay(attempts)
+        domain = keys[0][1]
+        retry_wait_duration.labels(domain=domain).observe(delay)
+        logger.info(
+            "retry_request",
+            url=request.url,
+            retries=retries,
+            delay=delay,
+            proxy=request.meta.get("proxy"),
+            reason=str(reason),
+        )
+
+        from twisted.internet import reactor
+
+        return deferLater(reactor, delay, lambda: retry_request)
+
+    def _backoff_keys(self, request: Request) -> List[BackoffKey]:
+        keys = [("domain", urlparse_cached(request).hostname or "")]
+        proxy = request.meta.get("proxy")
+        if proxy:
+            keys.append(("proxy", proxy))
+        return keys
 
     def _calculate_delay(self, retries: int) -> float:
-        base = 2 ** retries
+        base = 2 ** min(retries, 16)
         jitter = random.uniform(0, 1)
-        return min(base + jitter, 60.0)
+        return min(base + jitter, self.max_backoff)
@@ -0,0 +1,254 @@
+"""Runner de crawls de longa duração com um reactor Twisted persistente."""
+
+import atexit
+import threading
+import uuid
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Set, Type
+
+import redis
+from scrapy import Spider
+from scrapy.crawler import Crawler, CrawlerRunner
+from twisted.internet import defer
+from twisted.python.failure import Failure
+
+from src.config import settings
+from src.config.scrapy_settings import SCRAPY_SETTINGS
+from src.database.redis.cache import RedisCache
+from src.utils.logger import get_logger
+from src.utils.metrics import crawl_jobs, crawl_jobs_active
+
+logger = get_logger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+FINISHED = "finished"
+FAILED = "failed"
+# Cancelado ainda na fila: a spider nem chegou a rodar
+CANCELLED = "cancelled"
+
+
+@dataclass
+class CrawlJob:
+    """Uma execução de spider submetida ao runner."""
+
+    job_id: str
+    spider: str
+    status: str = QUEUED
+    items: int = 0
+    finish_reason: Optional[str] = None
+    failed_urls: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+    submitted_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in (FINISHED, FAILED, CANCELLED)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class CrawlerRunnerService:
+    """Executa spiders num único reactor que nunca é reiniciado.
+
+    O reactor roda numa thread dedicada iniciada no primeiro uso; tasks
+    Celery submetem jobs com :meth:`run` e bloqueiam só a própria thread
+    até o fim. Até ``CRAWLER_RUNNER_MAX_CONCURRENT`` spiders rodam juntas
+    no mesmo reactor (com ``--pool=threads`` várias tasks do worker
+    compartilham o runner). O estado de cada job é publicado no Redis
+    (namespace ``crawl_jobs``) para consulta por outros processos.
+    """
+
+    def __init__(
+        self,
+        scrapy_settings: Optional[Dict[str, Any]] = None,
+        max_concurrent: Optional[int] = None,
+    ):
+        self.scrapy_settings = scrapy_settings or SCRAPY_SETTINGS
+        self.max_concurrent = max_concurrent or settings.crawler_runner_max_concurrent
+        self.status_cache = RedisCache(namespace="crawl_jobs")
+        self.status_ttl = settings.crawl_job_status_ttl
+
+        self._jobs: Dict[str, CrawlJob] = {}
+        self._started: Dict[str, threading.Event] = {}
+        self._done: Dict[str, threading.Event] = {}
+        self._crawlers: Dict[str, Crawler] = {}
+        self._cancelled: Set[str] = set()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._runner: Optional[CrawlerRunner] = None
+        self._semaphore: Optional[defer.DeferredSemaphore] = None
+
+    def start(self) -> "CrawlerRunnerService":
+        with self._lock:
+            if self._thread is not None:
+                return self
+            from twisted.internet import reactor
+
+            self._runner = CrawlerRunner(self.scrapy_settings)
+            self._semaphore = defer.DeferredSemaphore(self.max_concurrent)
+            # Sinais ficam com o processo principal (Celery); o reactor não os instala
+            self._thread = threading.Thread(
+                target=reactor.run,
+                kwargs={"installSignalHandlers": False},
+                name="crawler-reactor",
+                daemon=True,
+            )
+            self._thread.start()
+        logger.info("crawler_runner_started", max_concurrent=self.max_concurrent)
+        return self
+
+    def submit(
+        self, spider_cls: Type[Spider], job_id: Optional[str] = None, **kwargs: Any
+    ) -> CrawlJob:
+        """Agenda a spider no reactor e retorna imediatamente."""
+        from twisted.internet import reactor
+
+        self.start()
+        job = CrawlJob(job_id=job_id or uuid.uuid4().hex, spider=spider_cls.name)
+        with self._lock:
+            self._jobs[job.job_id] = job
+            self._started[job.job_id] = threading.Event()
+            self._done[job.job_id] = threading.Event()
+        self._report(job.job_id, job.to_dict())
+        reactor.callFromThread(self._schedule, job, spider_cls, kwargs)
+        return job
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> CrawlJob:
+        """Bloqueia até o fim do job; em timeout a spider é encerrada.
+
+        O ``timeout`` conta a partir do início da spider, não da submissão:
+        o tempo na fila do semáforo não consome o prazo do crawl.
+        """
+        self._started[job_id].wait()
+        if not self._done[job_id].wait(timeout):
+            self.cancel(job_id)
+            self._done[job_id].wait()
+        with self._lock:
+            self._started.pop(job_id, None)
+            self._done.pop(job_id, None)
+            return self._jobs.pop(job_id)
+
+    def run(
+        self,
+        spider_cls: Type[Spider],
+        job_id: Optional[str] = None,
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> CrawlJob:
+        job = self.submit(spider_cls, job_id=job_id, **kwargs)
+        return self.wait(job.job_id, timeout if timeout is not None else settings.crawl_job_timeout)
+
+    def cancel(self, job_id: str) -> None:
+        """Encerra a spider em execução ou tira o job da fila."""
+        from twisted.internet import reactor
+
+        logger.warning("crawl_job_cancelled", job_id=job_id)
+        # Na fila: _crawl vê a marca quando o semáforo liberar e não inicia a spider
+        with self._lock:
+            self._cancelled.add(job_id)
+        reactor.callFromThread(self._stop_crawler, job_id)
+
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Estado do job: local se ainda está neste processo, senão do Redis."""
+        job = self._jobs.get(job_id)
+        if job is not None:
+            return job.to_dict()
+        return self.status_cache.get(job_id)
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        from twisted.internet import reactor
+
+        def _shutdown():
+            self._runner.stop().addBoth(lambda _: reactor.stop())
+
+        reactor.callFromThread(_shutdown)
+        self._thread.join(timeout=30)
+
+    # --- thread do reactor -------------------------------------------------
+
+    def _schedule(self, job: CrawlJob, spider_cls: Type[Spider], kwargs: Dict[str, Any]) -> None:
+        deferred = self._semaphore.run(self._crawl, job, spider_cls, kwargs)
+        deferred.addBoth(self._finished, job)
+
+    def _stop_crawler(self, job_id: str) -> None:
+        crawler = self._crawlers.get(job_id)
+        if crawler is not None:
+            crawler.stop()
+
+    def _crawl(self, job: CrawlJob, spider_cls: Type[Spider], kwargs: Dict[str, Any]):
+        with self._lock:
+            cancelled = job.job_id in self._cancelled
+        if cancelled:
+            return None
+
+        crawler = self._runner.create_crawler(spider_cls)
+        self._crawlers[job.job_id] = crawler
+        job.status = RUNNING
+        job.started_at = datetime.utcnow().isoformat()
+        crawl_jobs_active.inc()
+        self._report_async(job)
+        self._started[job.job_id].set()
+        logger.info("crawl_job_started", job_id=job.job_id, spider=job.spider)
+        return self._runner.crawl(crawler, **kwargs).addCallback(lambda _: crawler)
+
+    def _finished(self, result: Any, job: CrawlJob) -> None:
+        crawler = self._crawlers.pop(job.job_id, None)
+        if crawler is not None:
+            crawl_jobs_active.dec()
+        with self._lock:
+            self._cancelled.discard(job.job_id)
+
+        if result is None:
+            job.status = CANCELLED
+        elif isinstance(result, Failure):
+            job.status = FAILED
+            job.error = result.getErrorMessage()
+        else:
+            stats = result.stats.get_stats()
+            job.items = stats.get("item_scraped_count", 0)
+            job.finish_reason = stats.get("finish_reason")
+            job.failed_urls = list(getattr(result.spider, "failed_urls", []))
+            job.status = FINISHED if job.finish_reason == "finished" else FAILED
+        job.finished_at = datetime.utcnow().isoformat()
+
+        crawl_jobs.labels(spider=job.spider, status=job.status).inc()
+        logger.info(
+            "crawl_job_finished",
+            job_id=job.job_id,
+            spider=job.spider,
+            status=job.status,
+            items=job.items,
+            error=job.error,
+        )
+        self._report_async(job)
+        # Libera também quem espera o início de um job que nunca começou
+        self._started[job.job_id].set()
+        self._done[job.job_id].set()
+
+    def _report_async(self, job: CrawlJob) -> None:
+        # Escrita no Redis fora do reactor para não travar as spiders em execução
+        from twisted.internet import reactor
+
+        reactor.callInThread(self._report, job.job_id, job.to_dict())
+
+    def _report(self, job_id: str, state: Dict[str, Any]) -> None:
+        try:
+            self.status_cache.set(job_id, state, ttl=self.status_ttl)
+        except redis.RedisError as exc:
+            logger.warning("crawl_job_status_failed", job_id=job_id, error=str(exc))
+
+
+@lru_cache()
+def get_crawler_runner() -> CrawlerRunnerService:
+    """Runner do processo: reaproveitado por todas as tasks do worker."""
+    runner = CrawlerRunnerService()
+    atexit.register(runner.stop)
+    return runner
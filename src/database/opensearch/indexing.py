@@ -1,16 +1,24 @@
 """Indexação de documentos no OpenSearch."""
 
-from typing import Dict
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, NamedTuple, Optional
 
-from opensearchpy import OpenSearch
+from opensearchpy import OpenSearch, helpers
 from opensearchpy.exceptions import NotFoundError
 
 from src.config import settings
 from src.database.opensearch.connection import get_opensearch_client
+from src.database.opensearch.search import SearchResultCache
 from src.utils.logger import get_logger
+from src.utils.metrics import bulk_index_failures, processing_duration
 
 logger = get_logger(__name__)
 
+# Status que indicam sobrecarga/indisponibilidade temporária do cluster
+RETRYABLE_STATUS = {429, 500, 502, 503, 504, "N/A"}
+
 
 class OpenSearchIndexer:
     """Gerencia indexação de documentos."""
@@ -18,6 +26,17 @@ class OpenSearchIndexer:
     def __init__(self):
         self.client: OpenSearch = get_opensearch_client()
         self.index_name = settings.opensearch_index
+        self.search_cache = (
+            SearchResultCache(self.index_name) if settings.search_cache_enabled else None
+        )
+        # Com cache, a escrita só retorna depois do refresh: invalidar antes
+        # disso deixaria buscas com o índice antigo gravadas na geração nova
+        self.write_refresh = "wait_for" if self.search_cache else None
+
+    def invalidate_search_cache(self) -> None:
+        """Descarta buscas em cache; chamar só com as escritas já visíveis."""
+        if self.search_cache:
+            self.search_cache.invalidate()
 
     def create_index(self) -> None:
         """Cria índice se não existir."""
@@ -54,13 +73,14 @@ class OpenSearchIndexer:
 
     def index_document(self, doc_id: str, document: Dict) -> None:
         """Indexa documento."""
-        self.client.index(index=self.index_name, id=doc_id, body=document)
+        self.client.index(
+            index=self.index_name, id=doc_id, body=document, refresh=self.write_refresh
+        )
+        self.invalidate_search_cache()
         logger.info("document_indexed", id=doc_id)
 
     def bulk_index(self, documents: list) -> None:
         """Indexa múltiplos documentos."""
-        from opensearchpy import helpers
-
         actions = [
             {
                 "_index": self.index_name,
@@ -70,5 +90,237 @@ class OpenSearchIndexer:
             for doc in documents
         ]
 
-        helpers.bulk(self.client, actions)
+        helpers.bulk(self.client, actions, refresh=self.write_refresh)
+        self.invalidate_search_cache()
         logger.info("bulk_indexed", count=len(documents))
+
+
+class _PendingDocument(NamedTuple):
+    doc_id: str
+    source: str
+    size: int
+    attempts: int = 0
+
+
+class BufferedOpenSearchIndexer:
+    """Acumula documentos e indexa em lote com flush em background.
+
+    Lotes são limitados por quantidade de documentos e por bytes do payload.
+    Falhas parciais são reenfileiradas por documento; respostas 429 pausam o
+    flusher e, com o buffer cheio, ``add`` bloqueia quem produz os itens.
+
+    O cache de buscas é invalidado no máximo uma vez a cada
+    ``invalidate_interval`` segundos: com um flush a cada poucos segundos
+    durante o crawl, invalidar a cada lote zeraria a taxa de acerto.
+    """
+
+    def __init__(
+        self,
+        indexer: Optional[OpenSearchIndexer] = None,
+        max_docs: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        max_pending: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        invalidate_interval: Optional[float] = None,
+    ):
+        self.indexer = indexer or OpenSearchIndexer()
+        self.max_docs = max_docs or settings.opensearch_bulk_max_docs
+        self.max_bytes = max_bytes or settings.opensearch_bulk_max_bytes
+        self.flush_interval = flush_interval or settings.opensearch_bulk_flush_interval
+        self.max_pending = max(max_pending or settings.opensearch_bulk_max_pending, self.max_docs)
+        self.max_retries = (
+            settings.opensearch_bulk_max_retries if max_retries is None else max_retries
+        )
+        self.invalidate_interval = (
+            settings.search_cache_invalidate_interval
+            if invalidate_interval is None
+            else invalidate_interval
+        )
+
+        self._serializer = self.indexer.client.transport.serializer
+        self._buffer: Deque[_PendingDocument] = deque()
+        self._buffer_bytes = 0
+        self._cond = threading.Condition()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._backoff_until = 0.0
+        self._throttle_streak = 0
+        self._cache_stale = False
+        self._last_invalidation = float("-inf")
+
+    @property
+    def pending(self) -> int:
+        return len(self._buffer)
+
+    def start(self) -> None:
+        """Inicia thread de flush periódico."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="opensearch-bulk-flusher", daemon=True
+        )
+        self._thread.start()
+
+    def add(self, doc_id: str, document: Dict) -> None:
+        """Enfileira documento; bloqueia enquanto o buffer estiver cheio."""
+        # Serializa uma única vez: mede o payload e congela o estado do item
+        source = self._serializer.dumps(document)
+        pending = _PendingDocument(doc_id, source, len(source.encode("utf-8")))
+
+        with self._cond:
+            if len(self._buffer) >= self.max_pending and self._flusher_alive():
+                logger.warning("bulk_index_backpressure", pending=len(self._buffer))
+            while len(self._buffer) >= self.max_pending and self._flusher_alive():
+                self._cond.wait(timeout=1.0)
+            self._buffer.append(pending)
+            self._buffer_bytes += pending.size
+            full = len(self._buffer) >= self.max_docs or self._buffer_bytes >= self.max_bytes
+
+        if full:
+            if self._flusher_alive():
+                self._wake.set()
+            else:
+                self.flush()
+
+    def flush(self) -> int:
+        """Envia lotes até esvaziar o buffer ou o cluster pedir pausa."""
+        indexed = 0
+        while time.monotonic() >= self._backoff_until:
+            batch = self._take_batch()
+            if not batch:
+                break
+            indexed += self._send_batch(batch)
+        if indexed:
+            self._cache_stale = True
+        self._invalidate_search_cache()
+        return indexed
+
+    def close(self, timeout: float = 30.0) -> None:
+        """Para o flusher e drena o buffer respeitando o backoff."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+
+        deadline = time.monotonic() + timeout
+        while self._buffer and time.monotonic() < deadline:
+            wait = self._backoff_until - time.monotonic()
+            if wait > 0:
+                time.sleep(min(wait, max(deadline - time.monotonic(), 0)))
+            self.flush()
+
+        if self._buffer:
+            logger.error("bulk_index_unflushed", pending=len(self._buffer))
+        self._invalidate_search_cache(force=True)
+
+    def _invalidate_search_cache(self, force: bool = False) -> None:
+        if not self._cache_stale:
+            return
+        now = time.monotonic()
+        if force or now - self._last_invalidation >= self.invalidate_interval:
+            self.indexer.invalidate_search_cache()
+            self._cache_stale = False
+            self._last_invalidation = now
+
+    def _flusher_alive(self) -> bool:
+        return bool(self._thread and self._thread.is_alive() and not self._stop.is_set())
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(timeout=self.flush_interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+
+            wait = self._backoff_until - time.monotonic()
+            if wait > 0:
+                self._stop.wait(wait)
+                continue
+
+            try:
+                self.flush()
+            except Exception as exc:  # pylint: disable=broad-except
+                logger.error("bulk_flush_failed", error=str(exc))
+
+    def _take_batch(self) -> List[_PendingDocument]:
+        batch: List[_PendingDocument] = []
+        batch_bytes = 0
+        with self._cond:
+            while self._buffer and len(batch) < self.max_docs:
+                if batch and batch_bytes + self._buffer[0].size > self.max_bytes:
+                    break
+                pending = self._buffer.popleft()
+                self._buffer_bytes -= pending.size
+                batch_bytes += pending.size
+                batch.append(pending)
+            self._cond.notify_all()
+        return batch
+
+    def _send_batch(self, batch: List[_PendingDocument]) -> int:
+        by_id = {pending.doc_id: pending for pending in batch}
+        actions = (
+            {"_index": self.indexer.index_name, "_id": pending.doc_id, "_source": pending.source}
+            for pending in batch
+        )
+
+        retry: List[_PendingDocument] = []
+        throttled = False
+        failed = 0
+        with processing_duration.labels(pipeline="opensearch_bulk").time():
+            for _, info in helpers.streaming_bulk(
+                self.indexer.client,
+                actions,
+                chunk_size=len(batch),
+                max_chunk_bytes=self.max_bytes,
+                raise_on_error=False,
+                raise_on_exception=False,
+                yield_ok=False,
+                refresh=self.indexer.write_refresh,
+            ):
+                failed += 1
+                result = next(iter(info.values()))
+                status = result.get("status")
+                pending = by_id.get(str(result.get("_id")))
+                bulk_index_failures.labels(status=str(status)).inc()
+                if pending is None:
+                    continue
+
+                if status == 429:
+                    # Nunca descarta por sobrecarga: volta para a fila sem consumir tentativa
+                    throttled = True
+                    retry.append(pending)
+                elif status in RETRYABLE_STATUS and pending.attempts < self.max_retries:
+                    retry.append(pending._replace(attempts=pending.attempts + 1))
+                else:
+                    logger.error(
+                        "bulk_index_document_dropped",
+                        id=pending.doc_id,
+                        status=status,
+                        error=str(result.get("error")),
+                    )
+
+        self._requeue(retry)
+        self._update_backoff(throttled or bool(retry))
+        logger.info("bulk_indexed", count=len(batch) - failed, retried=len(retry))
+        return len(batch) - failed
+
+    def _requeue(self, documents: List[_PendingDocument]) -> None:
+        if not documents:
+            return
+        with self._cond:
+            # Mantém a ordem original à frente dos documentos mais novos
+            for pending in reversed(documents):
+                self._buffer.appendleft(pending)
+                self._buffer_bytes += pending.size
+
+    def _update_backoff(self, throttled: bool) -> None:
+        if not throttled:
+            self._throttle_streak = 0
+            return
+        self._throttle_streak += 1
+        delay = min(2**self._throttle_streak, 60.0)
+        self._backoff_until = time.monotonic() + delay
+        logger.warning("bulk_index_throttled", delay=delay, pending=len(self._buffer))
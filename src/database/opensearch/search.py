@@ -1,11 +1,81 @@
 """Busca em OpenSearch."""
 
-from typing import Dict, List
+import hashlib
+import json
+from datetime import date
+from typing import Any, Dict, List, Optional, Sequence
 
+import redis
 from opensearchpy import OpenSearch
 
 from src.config import settings
 from src.database.opensearch.connection import get_opensearch_client
+from src.database.redis.cache import RedisCache
+from src.utils.logger import get_logger
+from src.utils.metrics import search_cache_requests
+
+logger = get_logger(__name__)
+
+# Campos devolvidos por padrão: os textos longos chegam só como highlight
+SOURCE_FIELDS = (
+    "numero_cnj",
+    "numero_processo",
+    "classe",
+    "assunto",
+    "tribunal",
+    "orgao_julgador",
+    "relator",
+    "portal",
+    "data_distribuicao",
+    "data_julgamento",
+    "data_publicacao",
+)
+SELECTABLE_FIELDS = SOURCE_FIELDS + ("ementa", "decisao", "origem_url")
+HIGHLIGHT_FIELDS = ("ementa", "decisao")
+
+
+class SearchResultCache:
+    """Cache no Redis dos resultados de busca, por consulta normalizada.
+
+    As chaves carregam a geração do índice; os indexadores incrementam a
+    geração após cada escrita (:meth:`invalidate`), o que torna todas as
+    entradas anteriores inalcançáveis de uma vez. As órfãs expiram pelo TTL.
+    Falhas do Redis nunca derrubam a busca nem a indexação.
+    """
+
+    def __init__(self, index_name: str, ttl: Optional[int] = None):
+        self.cache = RedisCache(namespace=f"search:{index_name}")
+        self.ttl = ttl or settings.search_cache_ttl
+
+    @staticmethod
+    def key(params: Dict[str, Any]) -> str:
+        return hashlib.sha256(
+            json.dumps(params, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+
+    def get(self, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        try:
+            # INCRBY 0 lê a geração numa só ida ao Redis (e a cria se não existir)
+            generation = self.cache.increment("generation", 0)
+            result = self.cache.get(f"{generation}:{self.key(params)}")
+        except redis.RedisError as exc:
+            logger.warning("search_cache_unavailable", error=str(exc))
+            return None
+        search_cache_requests.labels(result="hit" if result is not None else "miss").inc()
+        return result
+
+    def set(self, params: Dict[str, Any], result: Dict[str, Any]) -> None:
+        try:
+            generation = self.cache.increment("generation", 0)
+            self.cache.set(f"{generation}:{self.key(params)}", result, ttl=self.ttl)
+        except redis.RedisError as exc:
+            logger.warning("search_cache_unavailable", error=str(exc))
+
+    def invalidate(self) -> None:
+        try:
+            self.cache.increment("generation")
+        except redis.RedisError as exc:
+            logger.warning("search_cache_invalidate_failed", error=str(exc))
 
 
 class OpenSearchSearcher:
@@ -14,6 +84,7 @@ class OpenSearchSearcher:
     def __init__(self):
         self.client: OpenSearch = get_opensearch_client()
         self.index_name = settings.opensearch_index
+        self.cache = SearchResultCache(self.index_name) if settings.search_cache_enabled else None
 
     def search(self, query: str, size: int = 10) -> List[Dict]:
         body = {
@@ -30,3 +101,135 @@ class OpenSearchSearcher:
         response = self.client.search(index=self.index_name, body=body)
         hits = response.get("hits", {}).get("hits", [])
         return [hit["_source"] for hit in hits]
+
+    def search_decisions(
+        self,
+        query: str,
+        size: int = 20,
+        search_after: Optional[Sequence[Any]] = None,
+        tribunal: Optional[str] = None,
+        classe: Optional[str] = None,
+        julgado_de: Optional[date] = None,
+        julgado_ate: Optional[date] = None,
+        fields: Optional[Sequence[str]] = None,
+        aggregations: bool = True,
+    ) -> Dict[str, Any]:
+        """Busca paginada com ``search_after``, highlights e agregações.
+
+        Só os campos de ``fields`` (padrão ``SOURCE_FIELDS``) voltam do
+        ``_source``; ementa e decisão aparecem como trechos destacados.
+        Agregações por tribunal, classe e mês de julgamento são calculadas
+        apenas na primeira página. Resultados idênticos vêm do cache.
+        """
+        params = {
+            # Caixa e espaços não mudam o resultado do analyzer
+            "query": " ".join(query.lower().split()),
+            "size": size,
+            "search_after": list(search_after) if search_after else None,
+            "tribunal": tribunal,
+            "classe": classe,
+            "julgado_de": julgado_de.isoformat() if julgado_de else None,
+            "julgado_ate": julgado_ate.isoformat() if julgado_ate else None,
+            "fields": sorted(set(fields or SOURCE_FIELDS)),
+            "aggregations": aggregations and not search_after,
+        }
+
+        if self.cache:
+            cached = self.cache.get(params)
+            if cached is not None:
+                return cached
+
+        response = self.client.search(index=self.index_name, body=self._search_body(params))
+        result = self._parse_response(response, size)
+        if self.cache:
+            self.cache.set(params, result)
+        return result
+
+    def _search_body(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        filters: List[Dict[str, Any]] = []
+        for field in ("tribunal", "classe"):
+            if params[field] is not None:
+                filters.append({"term": {field: params[field]}})
+        date_range: Dict[str, str] = {}
+        if params["julgado_de"]:
+            date_range["gte"] = params["julgado_de"]
+        if params["julgado_ate"]:
+            # Arredonda para o fim do dia: inclui decisões julgadas na data final
+            date_range["lte"] = f"{params['julgado_ate']}||/d"
+        if date_range:
+            filters.append({"range": {"data_julgamento": date_range}})
+
+        body: Dict[str, Any] = {
+            "size": params["size"],
+            "query": {
+                "bool": {
+                    "must": {
+                        "multi_match": {
+                            "query": params["query"],
+                            "fields": ["ementa^2", "decisao", "assunto"],
+                            "type": "best_fields",
+                        }
+                    },
+                    "filter": filters,
+                }
+            },
+            # numero_cnj desempata o score: search_after precisa de ordem total
+            "sort": [{"_score": "desc"}, {"numero_cnj": "asc"}],
+            "_source": {"includes": params["fields"]},
+            "highlight": {
+                "pre_tags": ["<em>"],
+                "post_tags": ["</em>"],
+                "fields": {
+                    field: {"fragment_size": 150, "number_of_fragments": 3}
+                    for field in HIGHLIGHT_FIELDS
+                },
+            },
+        }
+        if params["search_after"]:
+            body["search_after"] = params["search_after"]
+        if params["aggregations"]:
+            body["aggs"] = {
+                "tribunal": {"terms": {"field": "tribunal", "size": 50}},
+                "classe": {"terms": {"field": "classe", "size": 50}},
+                "data_julgamento": {
+                    "date_histogram": {
+                        "field": "data_julgamento",
+                        "calendar_interval": "month",
+                        "format": "yyyy-MM",
+                        "min_doc_count": 1,
+                    }
+                },
+            }
+        return body
+
+    @staticmethod
+    def _parse_response(response: Dict[str, Any], size: int) -> Dict[str, Any]:
+        hits = response.get("hits", {})
+        items = [
+            {
+                "numero_cnj": hit["_id"],
+                "score": hit.get("_score"),
+                "source": hit.get("_source", {}),
+                "highlight": hit.get("highlight", {}),
+            }
+            for hit in hits.get("hits", [])
+        ]
+        last = hits.get("hits", [])[-1:] if len(items) == size else []
+        aggregations = None
+        if "aggregations" in response:
+            aggregations = {
+                name: [
+                    {
+                        "key": bucket.get("key_as_string", bucket["key"]),
+                        "count": bucket["doc_count"],
+                    }
+                    for bucket in agg.get("buckets", [])
+                ]
+                for name, agg in response["aggregations"].items()
+            }
+        return {
+            "total": hits.get("total", {}).get("value", 0),
+            "items": items,
+            "search_after": last[0]["sort"] if last else None,
+            "aggregations": aggregations,
+        }
@@ -3,7 +3,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, String, Text, func
+from sqlalchemy import Column, Date, DateTime, Index, Integer, MetaData, String, Table, Text, func
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import declarative_base
 
@@ -34,12 +34,74 @@ class JudicialDecisionORM(Base):
     hash_content = Column(String(64), nullable=False, unique=True)
     timestamp_coleta = Column(DateTime(timezone=True), default=datetime.utcnow)
     versao_parser = Column(String(20), default="1.0.0")
-    origem_url = Column(String(1000))
+    origem_url = Column(String(1000), index=True)
     portal = Column(String(50))
     metadata_json = Column("metadata", JSONB, default=dict)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     __table_args__ = (
+        # Listagem keyset (created_at, id), com e sem filtro de igualdade
+        Index("ix_judicial_decisions_created_at_id", "created_at", "id"),
+        Index("ix_judicial_decisions_tribunal_created_at_id", "tribunal", "created_at", "id"),
+        Index("ix_judicial_decisions_portal_created_at_id", "portal", "created_at", "id"),
+        Index("ix_judicial_decisions_classe_created_at_id", "classe", "created_at", "id"),
+        Index("ix_judicial_decisions_data_julgamento", "data_julgamento"),
+        # Marca d'água das exportações incrementais
+        Index("ix_judicial_decisions_updated_at", "updated_at"),
         {},
     )
+
+
+# Campos com completude acompanhada em QualityDailyStatsORM (coluna filled_<campo>)
+QUALITY_FIELDS = (
+    "numero_cnj",
+    "ementa",
+    "decisao",
+    "relator",
+    "assunto",
+    "orgao_julgador",
+    "data_julgamento",
+    "data_publicacao",
+)
+
+
+class QualityDailyStatsORM(Base):
+    """Contadores de qualidade por dia de coleta e portal.
+
+    Atualizados por incremento conforme itens são gravados ou descartados;
+    as métricas de qualidade leem só estas linhas, nunca ``judicial_decisions``.
+    """
+
+    __tablename__ = "quality_daily_stats"
+
+    day = Column(Date, primary_key=True)
+    portal = Column(String(50), primary_key=True)
+    # stored: decisões novas; updated: recoletas que só atualizaram a linha existente
+    stored = Column(Integer, nullable=False, default=0)
+    updated = Column(Integer, nullable=False, default=0)
+    duplicates = Column(Integer, nullable=False, default=0)
+    invalid = Column(Integer, nullable=False, default=0)
+    filled_numero_cnj = Column(Integer, nullable=False, default=0)
+    filled_ementa = Column(Integer, nullable=False, default=0)
+    filled_decisao = Column(Integer, nullable=False, default=0)
+    filled_relator = Column(Integer, nullable=False, default=0)
+    filled_assunto = Column(Integer, nullable=False, default=0)
+    filled_orgao_julgador = Column(Integer, nullable=False, default=0)
+    filled_data_julgamento = Column(Integer, nullable=False, default=0)
+    filled_data_publicacao = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+# Views materializadas: metadata própria para o create_all não criá-las como tabelas
+views_metadata = MetaData()
+
+# Decisões por dia de coleta (UTC), tribunal e portal; criada na migração 0003
+decision_counts_daily = Table(
+    "decision_counts_daily",
+    views_metadata,
+    Column("day", Date, primary_key=True),
+    Column("tribunal", String(200), primary_key=True),
+    Column("portal", String(50), primary_key=True),
+    Column("decisions", Integer, nullable=False),
+)
@@ -1,27 +1,68 @@
 """Repositórios de acesso a dados no PostgreSQL."""
 
-from datetime import datetime
-from typing import Iterable, List, Optional
+import uuid
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
 
-from sqlalchemy import select
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Date,
+    String,
+    cast,
+    func,
+    literal,
+    literal_column,
+    select,
+    text,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from src.database.postgres.connection import get_session
-from src.database.postgres.models import JudicialDecisionORM
+from src.database.postgres.models import (
+    QUALITY_FIELDS,
+    JudicialDecisionORM,
+    QualityDailyStatsORM,
+    decision_counts_daily,
+)
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Projeção das listagens: sem os textos grandes, pedidos só sob demanda
+LIST_COLUMNS = (
+    "id",
+    "numero_cnj",
+    "numero_processo",
+    "classe",
+    "assunto",
+    "sistema_origem",
+    "tribunal",
+    "orgao_julgador",
+    "relator",
+    "portal",
+    "data_distribuicao",
+    "data_julgamento",
+    "data_publicacao",
+    "created_at",
+)
+TEXT_COLUMNS = ("ementa", "decisao")
+
 
 class JudicialDecisionRepository:
     """Acesso a dados de decisões judiciais."""
 
-    def save(self, data: dict) -> JudicialDecisionORM:
+    def save(self, data: dict) -> bool:
+        """Grava a decisão; True se ela é nova, False se atualizou uma existente."""
         with get_session() as session:
             return self._save(session, data)
 
-    def _save(self, session: Session, data: dict) -> JudicialDecisionORM:
+    def _save(self, session: Session, data: dict) -> bool:
+        data = {_ORM_ATTRIBUTES.get(key, key): value for key, value in data.items()}
         existing = session.execute(
             select(JudicialDecisionORM).where(JudicialDecisionORM.numero_cnj == data["numero_cnj"])
         ).scalar_one_or_none()
@@ -31,14 +72,14 @@ class JudicialDecisionRepository:
                 setattr(existing, key, value)
             existing.updated_at = datetime.utcnow()
             logger.info("decision_updated", numero_cnj=data["numero_cnj"])
-            return existing
+            return False
 
         decision = JudicialDecisionORM(**data)
         session.add(decision)
         try:
             session.flush()
             logger.info("decision_saved", numero_cnj=data["numero_cnj"])
-            return decision
+            return True
         except IntegrityError as exc:
             session.rollback()
             logger.error(
@@ -48,6 +89,56 @@ class JudicialDecisionRepository:
             )
             raise
 
+    def bulk_upsert(self, items: Iterable[dict]) -> Set[str]:
+        """Grava lote com um único INSERT ... ON CONFLICT (numero_cnj) DO UPDATE.
+
+        Devolve os ``numero_cnj`` das linhas novas; os demais do lote já
+        existiam e foram atualizados. O DO UPDATE só sobrescreve as colunas
+        que o item trouxe: itens com conjuntos de chaves diferentes vão em
+        statements separados, e um item parcial não apaga o que já está
+        gravado nas demais colunas.
+        """
+        latest: Dict[str, dict] = {}
+        for data in items:
+            # Último item vence: o ON CONFLICT não aceita a mesma chave duas vezes no lote
+            latest[data["numero_cnj"]] = data
+
+        groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+        for data in latest.values():
+            present = tuple(key for key in _UPSERT_COLUMNS if key in data)
+            groups.setdefault(present, []).append(self._to_row(data))
+
+        inserted: Set[str] = set()
+        with get_session() as session:
+            for present, rows in groups.items():
+                result = session.execute(self._upsert_statement(rows, present))
+                inserted.update(row.numero_cnj for row in result if row.inserted)
+
+        logger.info("decisions_bulk_upserted", count=len(latest), inserted=len(inserted))
+        return inserted
+
+    def _upsert_statement(self, rows: List[Dict[str, Any]], present: Sequence[str]):
+        table = JudicialDecisionORM.__table__
+        stmt = insert(table).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.numero_cnj],
+            set_={
+                **{key: stmt.excluded[key] for key in present if key not in ("id", "numero_cnj")},
+                "updated_at": func.now(),
+            },
+        )
+        # xmax = 0 só na versão criada pelo INSERT; o DO UPDATE grava o xid atual
+        return stmt.returning(
+            table.c.numero_cnj, literal_column("xmax = 0", Boolean).label("inserted")
+        )
+
+    def _to_row(self, data: dict) -> Dict[str, Any]:
+        # Defaults só valem para o INSERT; o DO UPDATE usa apenas as chaves do item
+        return {
+            key: data[key] if key in data else _column_default(JudicialDecisionORM.__table__.c[key])
+            for key in _UPSERT_COLUMNS
+        }
+
     def exists_hash(self, hash_content: str) -> bool:
         with get_session() as session:
             result = session.execute(
@@ -55,6 +146,130 @@ class JudicialDecisionRepository:
             ).scalar_one_or_none()
             return result is not None
 
+    def iter_dedup_corpus(self, batch_size: int = 1000) -> Iterator[Tuple[str, str, str, str]]:
+        """Percorre (hash_content, numero_cnj, ementa, decisao) com cursor server-side."""
+        with get_session() as session:
+            result = session.execute(
+                select(
+                    JudicialDecisionORM.hash_content,
+                    JudicialDecisionORM.numero_cnj,
+                    JudicialDecisionORM.ementa,
+                    JudicialDecisionORM.decisao,
+                ).execution_options(yield_per=batch_size)
+            )
+            for row in result:
+                yield row.hash_content, row.numero_cnj, row.ementa, row.decisao
+
+    def iter_stale_urls(
+        self, portal: str, max_age: timedelta, batch_size: int = 1000
+    ) -> Iterator[str]:
+        """URLs do portal sem coleta nem atualização há mais de ``max_age``.
+
+        Mais antigas primeiro; percorre com cursor server-side.
+        """
+        last_seen = func.greatest(
+            JudicialDecisionORM.timestamp_coleta, JudicialDecisionORM.updated_at
+        )
+        with get_session() as session:
+            result = session.execute(
+                select(JudicialDecisionORM.origem_url)
+                .where(
+                    JudicialDecisionORM.portal == portal,
+                    JudicialDecisionORM.origem_url.isnot(None),
+                    last_seen < datetime.utcnow() - max_age,
+                )
+                .order_by(last_seen)
+                .execution_options(yield_per=batch_size)
+            )
+            for (origem_url,) in result:
+                yield origem_url
+
+    def touch_collected(self, urls: Sequence[str]) -> int:
+        """Marca páginas revisitadas sem mudança como coletadas agora."""
+        if not urls:
+            return 0
+        with get_session() as session:
+            result = session.execute(
+                update(JudicialDecisionORM)
+                .where(JudicialDecisionORM.origem_url.in_(list(urls)))
+                # updated_at fica como está: o conteúdo não mudou
+                .values(timestamp_coleta=func.now(), updated_at=JudicialDecisionORM.updated_at)
+                .execution_options(synchronize_session=False)
+            )
+        logger.info("decisions_touched", count=result.rowcount)
+        return result.rowcount
+
+    def iter_export_batches(
+        self,
+        columns: Sequence[str],
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        batch_size: int = 5000,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Lotes de linhas (só ``columns``) com ``since < updated_at <= until``.
+
+        Cursor server-side: a memória fica limitada a um lote, qualquer que
+        seja o tamanho da tabela.
+        """
+        table = JudicialDecisionORM.__table__
+        stmt = select(*[table.c[name] for name in columns])
+        if since is not None:
+            stmt = stmt.where(table.c.updated_at > since)
+        if until is not None:
+            stmt = stmt.where(table.c.updated_at <= until)
+
+        with get_session() as session:
+            result = session.execute(
+                stmt.execution_options(stream_results=True, yield_per=batch_size)
+            )
+            for partition in result.mappings().partitions():
+                yield [dict(row) for row in partition]
+
+    def db_now(self) -> datetime:
+        """Relógio do banco (base das marcas d'água de ``updated_at``)."""
+        with get_session() as session:
+            return session.execute(select(func.now())).scalar_one()
+
+    def list_page(
+        self,
+        limit: int = 50,
+        after: Optional[Tuple[datetime, uuid.UUID]] = None,
+        tribunal: Optional[str] = None,
+        portal: Optional[str] = None,
+        classe: Optional[str] = None,
+        julgado_de: Optional[datetime] = None,
+        julgado_ate: Optional[datetime] = None,
+        include_text: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Página de decisões, mais recentes primeiro, com filtros no SQL.
+
+        Paginação keyset em ``(created_at, id)``: ``after`` é a chave da
+        última linha da página anterior, e o custo não cresce com a
+        profundidade da página. Filtros de igualdade usam os índices
+        compostos ``(filtro, created_at, id)``.
+        """
+        table = JudicialDecisionORM.__table__
+        names = LIST_COLUMNS + (TEXT_COLUMNS if include_text else ())
+        stmt = select(*[table.c[name] for name in names])
+
+        for column, value in (
+            (table.c.tribunal, tribunal),
+            (table.c.portal, portal),
+            (table.c.classe, classe),
+        ):
+            if value is not None:
+                stmt = stmt.where(column == value)
+        if julgado_de is not None:
+            stmt = stmt.where(table.c.data_julgamento >= julgado_de)
+        if julgado_ate is not None:
+            stmt = stmt.where(table.c.data_julgamento <= julgado_ate)
+        if after is not None:
+            stmt = stmt.where(tuple_(table.c.created_at, table.c.id) < tuple_(*after))
+
+        stmt = stmt.order_by(table.c.created_at.desc(), table.c.id.desc()).limit(limit)
+        with get_session() as session:
+            return [dict(row) for row in session.execute(stmt).mappings()]
+
     def list_recent(self, limit: int = 50) -> List[JudicialDecisionORM]:
         with get_session() as session:
             return (
@@ -71,3 +286,213 @@ class JudicialDecisionRepository:
                 .filter(JudicialDecisionORM.numero_cnj == numero_cnj)
                 .one_or_none()
             )
+
+
+class QualityStatsRepository:
+    """Contadores diários de qualidade por portal."""
+
+    def increment(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """Soma os contadores de cada (day, portal) com um único upsert.
+
+        Cada linha traz ``day``, ``portal`` e os incrementos de
+        ``QUALITY_COUNTERS`` (ausentes valem zero); as chaves não se repetem.
+        """
+        values = [
+            {
+                "day": row["day"],
+                "portal": row["portal"],
+                **{name: row.get(name, 0) for name in QUALITY_COUNTERS},
+            }
+            for row in rows
+        ]
+        if not values:
+            return 0
+
+        table = QualityDailyStatsORM.__table__
+        stmt = insert(table).values(values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.day, table.c.portal],
+            set_={
+                **{name: table.c[name] + stmt.excluded[name] for name in QUALITY_COUNTERS},
+                "updated_at": func.now(),
+            },
+        )
+        with get_session() as session:
+            session.execute(stmt)
+        return len(values)
+
+    def totals(self, since: date, portal: Optional[str] = None) -> Dict[str, int]:
+        """Soma dos contadores a partir de ``since``: lê uma linha por dia e portal."""
+        table = QualityDailyStatsORM.__table__
+        stmt = select(
+            *[func.coalesce(func.sum(table.c[name]), 0).label(name) for name in QUALITY_COUNTERS]
+        ).where(table.c.day >= since)
+        if portal is not None:
+            stmt = stmt.where(table.c.portal == portal)
+        with get_session() as session:
+            row = session.execute(stmt).mappings().one()
+        return {name: int(value) for name, value in row.items()}
+
+    def daily(self, since: date, portal: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Contadores somados por dia a partir de ``since``."""
+        table = QualityDailyStatsORM.__table__
+        stmt = select(
+            table.c.day,
+            *[func.sum(table.c[name]).label(name) for name in QUALITY_COUNTERS],
+        ).where(table.c.day >= since)
+        if portal is not None:
+            stmt = stmt.where(table.c.portal == portal)
+        stmt = stmt.group_by(table.c.day).order_by(table.c.day)
+        with get_session() as session:
+            return [
+                {key: int(value) if key != "day" else value for key, value in row.items()}
+                for row in session.execute(stmt).mappings()
+            ]
+
+    def backfill_from_decisions(self, since: Optional[date] = None) -> int:
+        """Recalcula ``stored`` e ``filled_*`` varrendo ``judicial_decisions`` uma vez.
+
+        Para dados coletados antes dos contadores existirem. Recoletas
+        (``updated``) e descartes (``duplicates``/``invalid``) não deixam
+        rastro na tabela e são mantidos.
+        """
+        decisions = JudicialDecisionORM.__table__
+        stats = QualityDailyStatsORM.__table__
+        day = cast(func.timezone("UTC", decisions.c.created_at), Date)
+        portal = func.coalesce(decisions.c.portal, literal(UNKNOWN_PORTAL))
+
+        filled = []
+        for name in QUALITY_FIELDS:
+            column = decisions.c[name]
+            condition = column.isnot(None)
+            if isinstance(column.type, String):
+                condition = condition & (column != "")
+            filled.append(func.count().filter(condition).label(f"filled_{name}"))
+
+        source = select(day.label("day"), portal.label("portal"), func.count(), *filled)
+        if since is not None:
+            source = source.where(day >= since)
+        source = source.group_by(day, portal)
+
+        counters = ["stored"] + [f"filled_{name}" for name in QUALITY_FIELDS]
+        stmt = insert(stats).from_select(["day", "portal", *counters], source)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[stats.c.day, stats.c.portal],
+            set_={
+                **{name: stmt.excluded[name] for name in counters},
+                "updated_at": func.now(),
+            },
+        )
+        with get_session() as session:
+            result = session.execute(stmt)
+        logger.info("quality_stats_backfilled", rows=result.rowcount)
+        return result.rowcount
+
+
+class DecisionCountsRepository:
+    """Leitura e refresh da view ``decision_counts_daily``.
+
+    A view guarda uma linha por (dia, tribunal, portal); as consultas do
+    dashboard somam essas linhas em vez de varrer ``judicial_decisions``.
+    """
+
+    def refresh(self) -> None:
+        """Recalcula a view sem bloquear leituras (exige o índice único da view)."""
+        with get_session() as session:
+            session.execute(
+                text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {decision_counts_daily.name}")
+            )
+        logger.info("decision_counts_refreshed")
+
+    def totals(
+        self,
+        portal: Optional[str] = None,
+        tribunal: Optional[str] = None,
+        since: Optional[date] = None,
+    ) -> Dict[str, int]:
+        view = decision_counts_daily
+        stmt = self._filtered(
+            select(
+                func.coalesce(func.sum(view.c.decisions), 0).label("decisions"),
+                func.count(view.c.tribunal.distinct()).label("tribunais"),
+                func.count(view.c.portal.distinct()).label("portais"),
+            ),
+            portal,
+            tribunal,
+            since,
+        )
+        with get_session() as session:
+            row = session.execute(stmt).mappings().one()
+        return {name: int(value) for name, value in row.items()}
+
+    def by_tribunal(
+        self,
+        portal: Optional[str] = None,
+        tribunal: Optional[str] = None,
+        since: Optional[date] = None,
+    ) -> Dict[str, int]:
+        view = decision_counts_daily
+        total = func.sum(view.c.decisions)
+        stmt = self._filtered(select(view.c.tribunal, total), portal, tribunal, since)
+        stmt = stmt.group_by(view.c.tribunal).order_by(total.desc())
+        with get_session() as session:
+            return {name: int(count) for name, count in session.execute(stmt)}
+
+    def by_day(
+        self,
+        portal: Optional[str] = None,
+        tribunal: Optional[str] = None,
+        since: Optional[date] = None,
+    ) -> List[Tuple[date, int]]:
+        view = decision_counts_daily
+        stmt = self._filtered(
+            select(view.c.day, func.sum(view.c.decisions)), portal, tribunal, since
+        )
+        stmt = stmt.group_by(view.c.day).order_by(view.c.day)
+        with get_session() as session:
+            return [(day, int(count)) for day, count in session.execute(stmt)]
+
+    def portals(self) -> List[str]:
+        view = decision_counts_daily
+        with get_session() as session:
+            return list(
+                session.execute(select(view.c.portal).distinct().order_by(view.c.portal)).scalars()
+            )
+
+    @staticmethod
+    def _filtered(stmt, portal: Optional[str], tribunal: Optional[str], since: Optional[date]):
+        view = decision_counts_daily
+        if portal is not None:
+            stmt = stmt.where(view.c.portal == portal)
+        if tribunal is not None:
+            stmt = stmt.where(view.c.tribunal == tribunal)
+        if since is not None:
+            stmt = stmt.where(view.c.day >= since)
+        return stmt
+
+
+# Portal das decisões sem ``portal`` nos contadores de qualidade
+UNKNOWN_PORTAL = "desconhecido"
+
+QUALITY_COUNTERS = ("stored", "updated", "duplicates", "invalid") + tuple(
+    f"filled_{name}" for name in QUALITY_FIELDS
+)
+
+# Chave do item -> atributo do ORM (``metadata`` é reservado pelo declarative).
+# No Core a coluna continua com a chave ``metadata``.
+_ORM_ATTRIBUTES = {"metadata": "metadata_json"}
+
+_UPSERT_COLUMNS = [
+    column.key
+    for column in JudicialDecisionORM.__table__.columns
+    if column.key not in ("created_at", "updated_at")
+]
+
+
+def _column_default(column: Column) -> Any:
+    default = column.default
+    if default is None:
+        return None
+    if default.is_callable:
+        return default.arg(None)
+    return default.arg
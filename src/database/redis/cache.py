@@ -2,38 +2,144 @@
 
 import json
 from datetime import datetime, timedelta
-from typing import Any, Optional
+from typing import Any, Dict, Mapping, Optional, Sequence
 
+import msgpack
+
+from src.config import settings
 from src.database.redis.connection import get_redis_client
+from src.utils.local_cache import MISSING, LocalTTLCache
+
+# json: envelope com stored_at (formato original); raw: string como está;
+# msgpack: binário compacto, sem envelope
+ENCODINGS = ("json", "raw", "msgpack")
 
 
 class RedisCache:
-    """Fornece operações de cache usando Redis."""
+    """Fornece operações de cache usando Redis.
+
+    ``encoding`` escolhe o formato gravado: ``json`` (padrão, compatível com
+    as chaves já existentes), ``raw`` (valores str/int/float sem envelope,
+    lidos de volta como str) ou ``msgpack``. Operações em lote usam MGET e
+    pipelines: uma ida ao Redis por chamada, não por chave.
+
+    Com ``local_ttl`` as leituras passam antes por um LRU em memória do
+    processo; escritas por este processo o atualizam, mas escritas de
+    outros processos só são vistas depois de ``local_ttl`` segundos. Chaves
+    ausentes no Redis não entram no LRU: uma chave criada por outro processo
+    aparece já na leitura seguinte.
+    """
 
-    def __init__(self, namespace: str = "crawler"):
-        self.client = get_redis_client()
+    def __init__(
+        self,
+        namespace: str = "crawler",
+        encoding: str = "json",
+        local_ttl: Optional[float] = None,
+        local_maxsize: Optional[int] = None,
+    ):
+        if encoding not in ENCODINGS:
+            raise ValueError(f"Encoding deve ser um de {ENCODINGS}")
+        # msgpack é binário: precisa de um cliente que não decodifique as respostas
+        if encoding == "msgpack":
+            self.client = get_redis_client(decode_responses=False)
+        else:
+            self.client = get_redis_client()
         self.namespace = namespace
+        self.encoding = encoding
+        self.local: Optional[LocalTTLCache] = None
+        if local_ttl:
+            self.local = LocalTTLCache(
+                local_maxsize or settings.redis_local_cache_maxsize, local_ttl
+            )
 
     def _key(self, key: str) -> str:
         return f"{self.namespace}:{key}"
 
     def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
-        data = json.dumps({"value": value, "stored_at": datetime.utcnow().isoformat()})
-        self.client.set(self._key(key), data, ex=ttl)
+        self.client.set(self._key(key), self._encode(value), ex=ttl)
+        self._remember(key, value)
 
     def get(self, key: str) -> Optional[Any]:
+        if self.local is not None:
+            value = self.local.get(key)
+            if value is not MISSING:
+                return value
+
         data = self.client.get(self._key(key))
-        if not data:
-            return None
-        payload = json.loads(data)
-        return payload.get("value")
+        value = self._decode(data)
+        if data is not None:
+            self._remember(key, value)
+        return value
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, Optional[Any]]:
+        """Valores de várias chaves com um único MGET (None para as ausentes)."""
+        result: Dict[str, Optional[Any]] = {}
+        remote = []
+        for key in keys:
+            value = self.local.get(key) if self.local is not None else MISSING
+            if value is MISSING:
+                remote.append(key)
+            else:
+                result[key] = value
+
+        if remote:
+            stored = self.client.mget([self._key(key) for key in remote])
+            for key, data in zip(remote, stored):
+                result[key] = self._decode(data)
+                if data is not None:
+                    self._remember(key, result[key])
+        return result
+
+    def set_many(self, items: Mapping[str, Any], ttl: Optional[int] = None) -> None:
+        """Grava várias chaves num pipeline (uma ida ao Redis, sem transação)."""
+        if not items:
+            return
+        pipe = self.client.pipeline(transaction=False)
+        for key, value in items.items():
+            pipe.set(self._key(key), self._encode(value), ex=ttl)
+        pipe.execute()
+        for key, value in items.items():
+            self._remember(key, value)
+
+    def set_if_absent(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
+        """SET NX atômico: True se a chave foi criada, False se já existia."""
+        created = bool(self.client.set(self._key(key), self._encode(value), ex=ttl, nx=True))
+        if created:
+            self._remember(key, value)
+        return created
 
     def delete(self, key: str) -> None:
         self.client.delete(self._key(key))
+        if self.local is not None:
+            self.local.pop(key)
 
     def increment(self, key: str, amount: int = 1) -> int:
-        return self.client.incr(self._key(key), amount)
+        value = self.client.incr(self._key(key), amount)
+        if self.local is not None:
+            # O valor no Redis é um inteiro cru, fora do encoding: a próxima leitura vai ao Redis
+            self.local.pop(key)
+        return value
 
     def set_with_expiration(self, key: str, value: Any, expires_in: timedelta) -> None:
         ttl = int(expires_in.total_seconds())
         self.set(key, value, ttl=ttl)
+
+    def _remember(self, key: str, value: Any) -> None:
+        if self.local is not None:
+            self.local.set(key, value)
+
+    def _encode(self, value: Any) -> Any:
+        if self.encoding == "json":
+            return json.dumps({"value": value, "stored_at": datetime.utcnow().isoformat()})
+        if self.encoding == "msgpack":
+            return msgpack.packb(value, use_bin_type=True)
+        return value
+
+    def _decode(self, data: Any) -> Optional[Any]:
+        if data is None:
+            return None
+        if self.encoding == "json":
+            return json.loads(data).get("value") if data else None
+        if self.encoding == "msgpack":
+            return msgpack.unpackb(data, raw=False)
+        return data
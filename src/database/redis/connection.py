@@ -8,9 +8,10 @@ from src.config import settings
 
 
 @lru_cache()
-def get_redis_client() -> redis.Redis:
+def get_redis_client(decode_responses: bool = True) -> redis.Redis:
+    """Cliente do processo; ``decode_responses=False`` para valores binários."""
     return redis.from_url(
         settings.redis_uri,
         max_connections=settings.redis_max_connections,
-        decode_responses=True,
+        decode_responses=decode_responses,
     )
@@ -1,57 +1,152 @@
 """Pipeline de deduplicação usando hash e MinHash."""
 
 import hashlib
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Tuple, Union
 
-from datasketch import MinHash, MinHashLSH
-from scrapy import Spider
+from datasketch import MinHash
+from itemadapter import ItemAdapter
+from scrapy import Spider, signals
 from scrapy.exceptions import DropItem
-
+from twisted.internet.defer import Deferred
+
+from src.config import settings
+from src.pipelines.io_executor import PipelineIOExecutor
+from src.pipelines.signals import decisions_persisted
+from src.services.minhash_index import (
+    DUPLICATE_EXACT,
+    DUPLICATE_FUZZY,
+    MemoryMinHashIndex,
+    build_minhash_index,
+    warm_start_index,
+)
 from src.utils.logger import get_logger
 from src.utils.metrics import duplicates_found
+from src.utils.minhash import MinHashSignatureEngine, decision_text
 
 logger = get_logger(__name__)
 
 
-class DeduplicationPipeline:
-    """Detecta e remove duplicatas."""
-
-    def __init__(self):
-        self.lsh = MinHashLSH(threshold=0.8, num_perm=128)
-        self.seen_hashes: set = set()
+class DuplicateItem(DropItem):
+    """Item descartado por duplicar uma decisão já coletada."""
 
-    def process_item(self, item: Dict[str, Any], spider: Spider) -> Dict[str, Any]:
-        # Método 1: Hash exato
-        content_hash = self._generate_content_hash(item)
 
-        if content_hash in self.seen_hashes:
+class DeduplicationPipeline:
+    """Detecta e remove duplicatas.
+
+    O índice só recebe decisões já gravadas no PostgreSQL (sinal
+    ``decisions_persisted``): um item perdido depois desta etapa não fica
+    marcado como visto. Enquanto isso, os itens aprovados e ainda não
+    gravados ficam num índice em memória, para que duplicatas dentro do
+    mesmo lote também sejam barradas.
+
+    Versões anteriores do mesmo ``numero_cnj`` não contam como duplicata
+    fuzzy: a recoleta de uma decisão revisada segue para o upsert.
+    """
+
+    def __init__(self, crawler=None):
+        # Hash exato e LSH ficam no mesmo índice (Redis compartilhado por padrão)
+        self.index = build_minhash_index()
+        self.signature_engine = MinHashSignatureEngine(shingle_size=settings.dedup_shingle_size)
+        self.io = PipelineIOExecutor("deduplication")
+        self.pending = MemoryMinHashIndex()
+        self._pending_minhashes: Dict[str, Tuple[str, MinHash]] = {}
+        if crawler is not None:
+            crawler.signals.connect(self.decisions_persisted, signal=decisions_persisted)
+            crawler.signals.connect(self.item_discarded, signal=signals.item_dropped)
+            crawler.signals.connect(self.item_discarded, signal=signals.item_error)
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(crawler)
+
+    def open_spider(self, spider: Spider) -> Deferred:
+        return self.io.run(self._warm_start)
+
+    def _warm_start(self) -> None:
+        if settings.dedup_lsh_warm_start and self.index.size() == 0:
+            warm_start_index(self.index, engine=self.signature_engine)
+
+    def close_spider(self, spider: Spider) -> Deferred:
+        d = self.io.drain()
+        d.addCallback(lambda _: self.io.run(self.index.report_stats))
+        return d
+
+    def decisions_persisted(self, items: List[dict]) -> Optional[Deferred]:
+        """Move para o índice os itens que chegaram ao PostgreSQL."""
+        entries = []
+        for data in items:
+            content_hash = data.get("hash_content")
+            pending = self._pending_minhashes.pop(content_hash, None)
+            if pending is not None:
+                self.pending.remove(content_hash)
+                entries.append((content_hash, *pending))
+        if not entries:
+            return None
+        if not self.index.blocking_io:
+            self.index.insert_many(entries)
+            return None
+        return self.io.run(self.index.insert_many, entries)
+
+    def item_discarded(self, item: Any, **kwargs) -> None:
+        """Item descartado ou com erro depois desta etapa: não foi gravado."""
+        try:
+            content_hash = ItemAdapter(item).get("hash_content")
+        except TypeError:
+            return
+        if self._pending_minhashes.pop(content_hash, None) is not None:
+            self.pending.remove(content_hash)
+
+    def process_item(self, item: Any, spider: Spider) -> Union[Any, Deferred]:
+        # Aceita dict ou JudicialDecisionSchema vindo do estágio de validação
+        adapter = ItemAdapter(item)
+
+        # Método 1: Hash exato / Método 2: MinHash para fuzzy matching
+        content_hash = self._generate_content_hash(adapter)
+        minhash = self._generate_minhash(adapter)
+        numero_cnj = adapter["numero_cnj"]
+
+        if not self.index.blocking_io:
+            duplicate = self.index.find_duplicate(content_hash, numero_cnj, minhash)
+            return self._resolve(duplicate, adapter, item, content_hash, minhash)
+
+        # Consulta ao Redis no pool de I/O; o reactor segue com os downloads
+        d = self.io.run(self.index.find_duplicate, content_hash, numero_cnj, minhash)
+        d.addCallback(self._resolve, adapter, item, content_hash, minhash)
+        return d
+
+    def _resolve(
+        self,
+        duplicate: Optional[str],
+        adapter: ItemAdapter,
+        item: Any,
+        content_hash: str,
+        minhash: MinHash,
+    ) -> Any:
+        # Na thread do reactor: confere também os itens aprovados ainda não gravados
+        numero_cnj = adapter["numero_cnj"]
+        duplicate = duplicate or self.pending.find_duplicate(content_hash, numero_cnj, minhash)
+
+        if duplicate == DUPLICATE_EXACT:
             duplicates_found.labels(tipo="exact").inc()
-            logger.warning("duplicate_exact", numero_cnj=item.get("numero_cnj"))
-            raise DropItem("Duplicata exata")
+            logger.warning("duplicate_exact", numero_cnj=adapter.get("numero_cnj"))
+            raise DuplicateItem("Duplicata exata")
 
-        # Método 2: MinHash para fuzzy matching
-        minhash = self._generate_minhash(item)
-        if self.lsh.query(minhash):
+        if duplicate == DUPLICATE_FUZZY:
             duplicates_found.labels(tipo="fuzzy").inc()
-            logger.warning("duplicate_fuzzy", numero_cnj=item.get("numero_cnj"))
-            raise DropItem("Duplicata fuzzy (similaridade > 80%)")
+            logger.warning("duplicate_fuzzy", numero_cnj=adapter.get("numero_cnj"))
+            raise DuplicateItem("Duplicata fuzzy (similaridade > 80%)")
 
-        self.seen_hashes.add(content_hash)
-        self.lsh.insert(content_hash, minhash)
-        item["hash_content"] = content_hash
+        adapter["hash_content"] = content_hash
+        self.pending.insert_many([(content_hash, numero_cnj, minhash)])
+        self._pending_minhashes[content_hash] = (numero_cnj, minhash)
 
-        logger.info("item_unique", numero_cnj=item.get("numero_cnj"))
+        logger.info("item_unique", numero_cnj=adapter.get("numero_cnj"))
         return item
 
-    def _generate_content_hash(self, item: Dict[str, Any]) -> str:
+    def _generate_content_hash(self, item: ItemAdapter) -> str:
         content = f"{item['numero_cnj']}{item.get('ementa', '')}{item.get('decisao', '')}"
         return hashlib.sha256(content.encode("utf-8")).hexdigest()
 
-    def _generate_minhash(self, item: Dict[str, Any]) -> MinHash:
-        text = f"{item.get('ementa', '')} {item.get('decisao', '')}"
-
-        minhash = MinHash(num_perm=128)
-        for word in text.lower().split():
-            minhash.update(word.encode("utf8"))
-
-        return minhash
+    def _generate_minhash(self, item: ItemAdapter) -> MinHash:
+        text = decision_text(item.get("ementa"), item.get("decisao"))
+        return self.signature_engine.minhash(text)
@@ -1,11 +1,12 @@
 """Pipeline para enriquecimento de dados."""
 
-from typing import Any, Dict
+from typing import Any
 
+from itemadapter import ItemAdapter
 from scrapy import Spider
 
 from src.models.metadata import CollectionMetadata
-from src.utils.cnj_utils import extract_cnj_components, get_segmento_name, get_tribunal_name
+from src.utils.cnj_utils import CNJNumber
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -14,23 +15,25 @@ logger = get_logger(__name__)
 class EnrichmentPipeline:
     """Adiciona metadados derivados e enriquecimentos."""
 
-    def process_item(self, item: Dict[str, Any], spider: Spider) -> Dict[str, Any]:
-        components = extract_cnj_components(item["numero_cnj"])
-        if components:
-            item.setdefault("metadata", {})
-            item["metadata"].update(
+    def process_item(self, item: Any, spider: Spider) -> Any:
+        adapter = ItemAdapter(item)
+        if adapter.get("metadata") is None:
+            adapter["metadata"] = {}
+
+        cnj = CNJNumber.parse(adapter["numero_cnj"])
+        if cnj:
+            adapter["metadata"].update(
                 {
-                    "sequencial": components["sequencial"],
-                    "segmento_codigo": components["segmento"],
-                    "segmento_nome": get_segmento_name(components["segmento"]),
-                    "tribunal_codigo": components["tribunal"],
-                    "tribunal_nome": get_tribunal_name(components["tribunal"]),
-                    "origem_codigo": components["origem"],
+                    "sequencial": cnj.sequencial,
+                    "segmento_codigo": cnj.segmento,
+                    "segmento_nome": cnj.segmento_nome,
+                    "tribunal_codigo": cnj.tribunal,
+                    "tribunal_nome": cnj.tribunal_nome,
+                    "origem_codigo": cnj.origem,
                 }
             )
 
-        item.setdefault("metadata", {})
-        item["metadata"].update(
+        adapter["metadata"].update(
             {
                 "spider": spider.name,
                 "portal": getattr(spider, "portal", "desconhecido"),
@@ -38,5 +41,5 @@ class EnrichmentPipeline:
             }
         )
 
-        logger.info("item_enriched", numero_cnj=item["numero_cnj"])
+        logger.info("item_enriched", numero_cnj=adapter["numero_cnj"])
         return item
@@ -0,0 +1,87 @@
+"""Execução de I/O bloqueante dos pipelines fora da thread do reactor."""
+
+from typing import Any, Callable, List, Optional
+
+from twisted.internet import defer, threads
+from twisted.python.threadpool import ThreadPool
+
+from src.config import settings
+from src.utils.metrics import pipeline_inflight_writes
+
+_threadpool: Optional[ThreadPool] = None
+
+
+def get_io_threadpool() -> ThreadPool:
+    """Pool de threads compartilhado pelos pipelines do processo.
+
+    Separado do pool padrão do reactor (usado pelo resolvedor DNS) para que
+    bancos lentos não atrasem as resoluções de nome dos downloads.
+    """
+    global _threadpool
+    if _threadpool is None:
+        # Import tardio: não instalar o reactor padrão antes do Scrapy
+        from twisted.internet import reactor
+
+        _threadpool = ThreadPool(
+            minthreads=1,
+            maxthreads=max(settings.pipeline_io_threads, 1),
+            name="pipeline-io",
+        )
+        _threadpool.start()
+        reactor.addSystemEventTrigger("during", "shutdown", _threadpool.stop)
+    return _threadpool
+
+
+class PipelineIOExecutor:
+    """Roda chamadas bloqueantes no pool e limita as escritas em andamento.
+
+    Chamadas acima de ``max_inflight`` aguardam no semáforo sem ocupar
+    thread; como o Scrapy só libera o item quando o Deferred dispara, a
+    espera também segura o engine (ver ``SCRAPER_SLOT_MAX_ACTIVE_SIZE``).
+    """
+
+    def __init__(self, pipeline: str, max_inflight: Optional[int] = None):
+        self.pipeline = pipeline
+        self.max_inflight = max(max_inflight or settings.pipeline_max_inflight_writes, 1)
+        self._semaphore = defer.DeferredSemaphore(self.max_inflight)
+        self._inflight = 0
+        self._drain_waiters: List[defer.Deferred] = []
+
+    def run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> defer.Deferred:
+        """Agenda ``func`` no pool; o Deferred dispara com o resultado."""
+        self._inflight += 1
+        d = self._semaphore.run(self._call_in_thread, func, *args, **kwargs)
+        return d.addBoth(self._finished)
+
+    def _call_in_thread(self, func: Callable[..., Any], *args: Any, **kwargs: Any):
+        gauge = pipeline_inflight_writes.labels(pipeline=self.pipeline)
+        gauge.inc()
+        from twisted.internet import reactor
+
+        d = threads.deferToThreadPool(reactor, get_io_threadpool(), func, *args, **kwargs)
+
+        def done(result):
+            gauge.dec()
+            return result
+
+        return d.addBoth(done)
+
+    def _finished(self, result: Any) -> Any:
+        self._inflight -= 1
+        if not self._inflight:
+            waiters, self._drain_waiters = self._drain_waiters, []
+            for waiter in waiters:
+                waiter.callback(None)
+        return result
+
+    @property
+    def inflight(self) -> int:
+        return self._inflight
+
+    def drain(self) -> defer.Deferred:
+        """Deferred que dispara quando todas as chamadas agendadas terminam."""
+        if not self._inflight:
+            return defer.succeed(None)
+        waiter = defer.Deferred()
+        self._drain_waiters.append(waiter)
+        return waiter
@@ -2,10 +2,10 @@
 
 from typing import Any, Dict
 
-import pandas as pd
 from scrapy import Spider
 
 from src.utils.cnj_utils import normalize_cnj_number
+from src.utils.date_parser import parse_court_date
 from src.utils.logger import get_logger
 from src.utils.validators import sanitize_text
 
@@ -16,6 +16,13 @@ class NormalizationPipeline:
     """Aplica transformações e normalizações ao item."""
 
     def process_item(self, item: Dict[str, Any], spider: Spider) -> Dict[str, Any]:
+        item = self.normalize(item)
+
+        logger.info("item_normalized", numero_cnj=item.get("numero_cnj"))
+        return item
+
+    def normalize(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Normaliza o item in-place (CNJ, textos, partes e datas)."""
         item["numero_cnj"] = self._normalize_cnj(item["numero_cnj"])
         item["classe"] = sanitize_text(item.get("classe"))
         item["assunto"] = sanitize_text(item.get("assunto"))
@@ -29,10 +36,7 @@ class NormalizationPipeline:
             parte["tipo"] = sanitize_text(parte.get("tipo"))
             parte["documento"] = sanitize_text(parte.get("documento"))
 
-        item = self._normalize_dates(item)
-
-        logger.info("item_normalized", numero_cnj=item.get("numero_cnj"))
-        return item
+        return self._normalize_dates(item)
 
     def _normalize_cnj(self, numero_cnj: str) -> str:
         normalized = normalize_cnj_number(numero_cnj)
@@ -43,5 +47,5 @@ class NormalizationPipeline:
     def _normalize_dates(self, item: Dict[str, Any]) -> Dict[str, Any]:
         for key in ["data_distribuicao", "data_julgamento", "data_publicacao"]:
             if item.get(key):
-                item[key] = pd.to_datetime(item[key])
+                item[key] = parse_court_date(item[key])
         return item
@@ -0,0 +1,58 @@
+"""Pipeline único de normalização seguida de validação."""
+
+from typing import Any, Dict
+
+from pydantic import ValidationError
+from scrapy import Spider
+from scrapy.exceptions import DropItem
+
+from src.models.schemas import JudicialDecisionSchema
+from src.pipelines.normalization_pipeline import NormalizationPipeline
+from src.utils.cnj_utils import CNJNumber
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class InvalidItem(DropItem):
+    """Item descartado por falhar na validação."""
+
+
+class NormalizeValidatePipeline:
+    """Normaliza o item bruto e valida uma única vez com Pydantic.
+
+    Substitui ``ValidationPipeline`` + ``NormalizationPipeline``: a validação
+    recebe dados já normalizados (CNJ, textos, datas dd/mm/yyyy) e o item
+    segue para os próximos estágios como ``JudicialDecisionSchema``. Formato
+    do CNJ, ordem das datas e presença de partes já são garantidos pelo
+    schema; aqui só resta o dígito verificador.
+    """
+
+    def __init__(self):
+        self.normalizer = NormalizationPipeline()
+
+    def process_item(self, item: Dict[str, Any], spider: Spider) -> JudicialDecisionSchema:
+        if isinstance(item, JudicialDecisionSchema):
+            return item
+
+        try:
+            decision = JudicialDecisionSchema(**self.normalizer.normalize(item))
+        except (ValidationError, ValueError) as exc:
+            logger.error(
+                "validation_failed",
+                error=str(exc),
+                item=item.get("numero_cnj", "unknown"),
+            )
+            raise InvalidItem(f"Validação falhou: {exc}") from exc
+
+        cnj = CNJNumber.parse(decision.numero_cnj)
+        if cnj is None or not cnj.checksum_valid:
+            logger.error("validation_failed", error="checksum", item=decision.numero_cnj)
+            raise InvalidItem(f"Dígito verificador CNJ inválido: {decision.numero_cnj}")
+
+        logger.info(
+            "item_validated",
+            numero_cnj=decision.numero_cnj,
+            spider=getattr(spider, "name", None),
+        )
+        return decision
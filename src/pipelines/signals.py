@@ -0,0 +1,13 @@
+"""Sinais próprios dos pipelines.
+
+``decisions_persisted`` é enviado pelo ``StoragePipeline`` na thread do
+reactor depois que um conjunto de decisões foi gravado no PostgreSQL, com
+``items`` (lista dos dicts gravados) e ``inserted`` (``numero_cnj`` das
+linhas novas; os demais itens atualizaram decisões existentes). Estado que
+só pode existir para decisões efetivamente persistidas (hashes de
+deduplicação, estado de página, contadores de qualidade) deve ser
+registrado a partir dele, e não de ``item_scraped``: no modo em lote o item
+segue adiante antes de o lote chegar ao banco.
+"""
+
+decisions_persisted = object()
@@ -1,14 +1,23 @@
 """Pipeline de persistência de dados nos bancos."""
 
-from typing import Any, Dict
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
 
+from itemadapter import ItemAdapter
 from scrapy import Spider
+from sqlalchemy.exc import IntegrityError
+from twisted.internet import task
+from twisted.internet.defer import Deferred, DeferredLock, succeed
+from twisted.python.failure import Failure
 
 from src.config import settings
 from src.database.mongodb.repositories import RawDocumentRepository
-from src.database.opensearch.indexing import OpenSearchIndexer
+from src.database.opensearch.indexing import BufferedOpenSearchIndexer, OpenSearchIndexer
 from src.database.postgres.repositories import JudicialDecisionRepository
+from src.pipelines.io_executor import PipelineIOExecutor
+from src.pipelines.signals import decisions_persisted
 from src.utils.logger import get_logger
+from src.utils.metrics import processing_duration
 
 logger = get_logger(__name__)
 
@@ -16,34 +25,237 @@ logger = get_logger(__name__)
 class StoragePipeline:
     """Persiste itens validados nos diferentes storages."""
 
-    def __init__(self):
+    def __init__(self, crawler=None):
+        self.crawler = crawler
         self.pg_repo = JudicialDecisionRepository()
         self.mongo_repo = RawDocumentRepository() if settings.enable_mongodb else None
         self.opensearch = OpenSearchIndexer() if settings.enable_opensearch else None
+        self.opensearch_buffer: Optional[BufferedOpenSearchIndexer] = None
 
-    def open_spider(self, spider: Spider):
+        # Modo em lote: itens acumulam até atingir tamanho ou latência máxima
+        self.bulk_enabled = settings.storage_bulk_enabled
+        self.batch_size = max(settings.storage_batch_size, 1)
+        self.batch_max_latency = settings.storage_batch_max_latency
+        self.flush_retries = max(settings.storage_flush_retries, 1)
+        self.flush_retry_backoff = settings.storage_flush_retry_backoff
+        self._pg_buffer: List[Dict[str, Any]] = []
+        self._pg_buffer_started: Optional[float] = None
+        self._flush_loop: Optional[task.LoopingCall] = None
+
+        # I/O dos bancos fora da thread do reactor
+        self.io = PipelineIOExecutor("storage")
+        self._batch_lock = DeferredLock()
+        # IReactorTime usado no backoff dos retries; None = reactor global
+        self.clock = None
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(crawler)
+
+    def open_spider(self, spider: Spider) -> Deferred:
+        if self.bulk_enabled and self.batch_max_latency > 0:
+            # Garante flush por latência mesmo quando a spider para de produzir itens
+            self._flush_loop = task.LoopingCall(self._flush_if_stale)
+            self._flush_loop.start(self.batch_max_latency, now=False)
+
+        return self.io.run(self._open_backends)
+
+    def _open_backends(self) -> None:
         if self.opensearch:
             self.opensearch.create_index()
+            if settings.opensearch_bulk_enabled:
+                self.opensearch_buffer = BufferedOpenSearchIndexer(self.opensearch)
+                self.opensearch_buffer.start()
+
+    def close_spider(self, spider: Spider) -> Deferred:
+        if self._flush_loop and self._flush_loop.running:
+            self._flush_loop.stop()
+
+        # Espera as escritas em andamento antes do último lote e do fechamento
+        d = self.io.drain()
+        # Adquirir e soltar o lock espera um flush por latência ainda em retry
+        d.addCallback(lambda _: self._batch_lock.acquire())
+        d.addCallback(lambda lock: lock.release())
+        d.addCallback(lambda _: self._final_flush())
+        if self.opensearch_buffer:
+            d.addBoth(self._close_opensearch_buffer)
+        return d
+
+    def _final_flush(self) -> Deferred:
+        # Último lote: sem buffer para onde voltar, a falha derruba o fechamento
+        batch = self._take_batch()
+
+        def lost(failure: Failure) -> Failure:
+            logger.critical("storage_batch_lost", size=len(batch), error=failure.getErrorMessage())
+            return failure
 
-    def process_item(self, item: Dict[str, Any], spider: Spider) -> Dict[str, Any]:
-        # PostgreSQL: dados estruturados
-        self.pg_repo.save(item)
+        return self._flush_batch(batch, requeue=False).addErrback(lost)
+
+    def _close_opensearch_buffer(self, result: Any) -> Deferred:
+        # Fecha o buffer mesmo se o último lote falhou, preservando o resultado
+        d = self.io.run(self.opensearch_buffer.close)
+        d.addCallback(lambda _: result)
+        return d
+
+    def process_item(self, item: Any, spider: Spider) -> Deferred:
+        """Agenda a persistência no pool de I/O e devolve um Deferred.
+
+        A thread do reactor só converte o item e mexe no buffer; as chamadas
+        aos bancos rodam em ``PipelineIOExecutor``, limitadas por
+        ``PIPELINE_MAX_INFLIGHT_WRITES``.
+        """
+        # Converte uma única vez; o item pode ser dict ou JudicialDecisionSchema
+        data = ItemAdapter(item).asdict()
+        batch = self._buffer_item(data) if self.bulk_enabled else None
+
+        d = self.io.run(self._write_item, data)
+        if batch:
+            # O item que completa o lote espera o flush: backpressure sobre o engine
+            d.addCallback(lambda _: self._flush_batch(batch))
+        elif not self.bulk_enabled:
+            d.addCallback(lambda inserted: self._persisted(([data], inserted)))
+        d.addCallback(lambda _: item)
+        return d
+
+    def _write_item(self, data: Dict[str, Any]) -> Set[str]:
+        # PostgreSQL: dados estruturados (no modo em lote, gravados no flush)
+        inserted: Set[str] = set()
+        if not self.bulk_enabled and self.pg_repo.save(data):
+            inserted.add(data["numero_cnj"])
 
         # MongoDB: HTML/JSON bruto (se disponível)
-        if self.mongo_repo and "raw_html" in item:
+        if self.mongo_repo and "raw_html" in data:
             self.mongo_repo.save_raw_html(
-                numero_cnj=item["numero_cnj"],
-                html=item["raw_html"],
-                url=item.get("origem_url", ""),
-                metadata=item.get("metadata", {}),
+                numero_cnj=data["numero_cnj"],
+                html=data["raw_html"],
+                url=data.get("origem_url", ""),
+                metadata=data.get("metadata", {}),
             )
 
         # OpenSearch: indexação para busca full-text
-        if self.opensearch:
+        if self.opensearch_buffer:
+            self.opensearch_buffer.add(data["numero_cnj"], data)
+        elif self.opensearch:
             self.opensearch.index_document(
-                doc_id=item["numero_cnj"],
-                document=item,
+                doc_id=data["numero_cnj"],
+                document=data,
             )
 
-        logger.info("item_persisted", numero_cnj=item["numero_cnj"])
-        return item
+        logger.info("item_persisted", numero_cnj=data["numero_cnj"])
+        return inserted
+
+    def flush(self) -> Deferred:
+        """Grava o lote pendente no PostgreSQL; dispara com o total gravado."""
+        return self._flush_batch(self._take_batch())
+
+    def _flush_batch(self, batch: List[Dict[str, Any]], requeue: bool = True) -> Deferred:
+        """Grava o lote com retries; se todos falharem, devolve-o ao buffer.
+
+        Com ``requeue=False`` (fechamento da spider) a falha é propagada.
+        """
+        if not batch:
+            return succeed(0)
+        # Um lote por vez, na ordem de chegada: upserts do mesmo CNJ não se invertem.
+        # O lock fica retido durante os retries e a devolução ao buffer pelo mesmo motivo.
+        return self._batch_lock.run(self._write_with_retry, batch, 1, requeue)
+
+    def _write_with_retry(
+        self, batch: List[Dict[str, Any]], attempt: int, requeue: bool
+    ) -> Deferred:
+        d = self.io.run(self._write_batch, batch)
+        d.addCallbacks(self._persisted, self._retry_batch, errbackArgs=(batch, attempt, requeue))
+        return d
+
+    def _retry_batch(
+        self, failure: Failure, batch: List[Dict[str, Any]], attempt: int, requeue: bool
+    ) -> Union[Failure, Deferred, int]:
+        if attempt < self.flush_retries:
+            delay = self.flush_retry_backoff * 2 ** (attempt - 1)
+            logger.warning(
+                "storage_batch_retry",
+                size=len(batch),
+                attempt=attempt,
+                delay=delay,
+                error=failure.getErrorMessage(),
+            )
+            return task.deferLater(
+                self._clock(), delay, self._write_with_retry, batch, attempt + 1, requeue
+            )
+        if not requeue:
+            return failure
+
+        # Lote volta para a frente do buffer e sai no próximo flush (tamanho ou latência)
+        logger.error("storage_batch_requeued", size=len(batch), error=failure.getErrorMessage())
+        self._pg_buffer[:0] = batch
+        if self._pg_buffer_started is None:
+            self._pg_buffer_started = time.monotonic()
+        return 0
+
+    def _clock(self):
+        if self.clock is not None:
+            return self.clock
+        from twisted.internet import reactor
+
+        return reactor
+
+    def _write_batch(self, batch: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Set[str]]:
+        """Grava o lote; devolve os itens que chegaram ao PostgreSQL e os CNJs novos."""
+        with processing_duration.labels(pipeline="storage_batch").time():
+            try:
+                inserted = self.pg_repo.bulk_upsert(batch)
+                # O upsert mantém só a última versão de cada CNJ repetido no lote
+                saved = list({data["numero_cnj"]: data for data in batch}.values())
+            except IntegrityError as exc:
+                # Conflito de hash_content derruba o lote inteiro; isola item a item
+                logger.warning("storage_batch_conflict", size=len(batch), error=str(exc))
+                saved, inserted = self._upsert_one_by_one(batch)
+
+        logger.info(
+            "storage_batch_flushed", size=len(batch), saved=len(saved), inserted=len(inserted)
+        )
+        return saved, inserted
+
+    def _persisted(self, result: Tuple[List[Dict[str, Any]], Set[str]]) -> int:
+        # Na thread do reactor: os receptores não precisam de lock
+        items, inserted = result
+        if items and self.crawler is not None:
+            self.crawler.signals.send_catch_log(decisions_persisted, items=items, inserted=inserted)
+        return len(items)
+
+    def _take_batch(self) -> List[Dict[str, Any]]:
+        batch, self._pg_buffer = self._pg_buffer, []
+        self._pg_buffer_started = None
+        return batch
+
+    def _buffer_item(self, item: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        """Acumula o item e devolve o lote a gravar quando atinge o tamanho."""
+        if not self._pg_buffer:
+            self._pg_buffer_started = time.monotonic()
+        self._pg_buffer.append(item)
+
+        if len(self._pg_buffer) >= self.batch_size:
+            return self._take_batch()
+        return None
+
+    def _flush_if_stale(self) -> Optional[Deferred]:
+        if self._pg_buffer_started is None:
+            return None
+        if time.monotonic() - self._pg_buffer_started < self.batch_max_latency:
+            return None
+        # Falhas não chegam ao LoopingCall: o lote volta ao buffer (_retry_batch)
+        return self.flush()
+
+    def _upsert_one_by_one(
+        self, batch: List[Dict[str, Any]]
+    ) -> Tuple[List[Dict[str, Any]], Set[str]]:
+        saved: Dict[str, Dict[str, Any]] = {}
+        inserted: Set[str] = set()
+        for data in batch:
+            try:
+                inserted |= self.pg_repo.bulk_upsert([data])
+                # Mesma regra do lote: a última versão de cada CNJ vence
+                saved.pop(data["numero_cnj"], None)
+                saved[data["numero_cnj"]] = data
+            except IntegrityError:
+                logger.error("storage_item_dropped", numero_cnj=data.get("numero_cnj"))
+        return list(saved.values()), inserted
@@ -7,7 +7,7 @@ from scrapy import Spider
 from scrapy.exceptions import DropItem
 
 from src.models.schemas import JudicialDecisionSchema
-from src.utils.cnj_utils import validate_cnj_checksum, validate_cnj_format
+from src.utils.cnj_utils import CNJNumber
 from src.utils.logger import get_logger
 from src.utils.metrics import duplicates_found
 
@@ -44,10 +44,11 @@ class ValidationPipeline:
             raise DropItem(f"Validação falhou: {exc}") from exc
 
     def _validate_cnj_number(self, numero_cnj: str) -> None:
-        if not validate_cnj_format(numero_cnj):
+        cnj = CNJNumber.parse(numero_cnj)
+        if cnj is None:
             raise ValueError(f"Formato CNJ inválido: {numero_cnj}")
 
-        if not validate_cnj_checksum(numero_cnj):
+        if not cnj.checksum_valid:
             raise ValueError(f"Dígito verificador CNJ inválido: {numero_cnj}")
 
     def _validate_dates(self, item: JudicialDecisionSchema) -> None:
@@ -0,0 +1,213 @@
+"""Particionamento de crawls em shards e acompanhamento da execução."""
+
+import json
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from src.config import settings
+from src.database.redis.connection import get_redis_client
+from src.utils.cnj_utils import CNJNumber
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+PENDING = "pending"
+RUNNING = "running"
+# Falhou, mas a task já está agendada para nova tentativa
+RETRYING = "retrying"
+DONE = "done"
+# Concluído com algumas URLs com falha, guardadas para recoleta avulsa
+PARTIAL = "partial"
+FAILED = "failed"
+
+
+@dataclass(frozen=True)
+class CrawlShard:
+    """Fatia de um crawl executada por uma única task Celery.
+
+    ``kind == "cnj"``: sequenciais ``[seq_start, seq_end)`` de um ano e de
+    uma origem (foro). ``kind == "dates"``: janela de datas
+    ``[date_start, date_end]`` em ISO. Serializável em JSON para o broker.
+    """
+
+    spider: str
+    kind: str
+    ano: Optional[int] = None
+    origem: Optional[str] = None
+    seq_start: Optional[int] = None
+    seq_end: Optional[int] = None
+    date_start: Optional[str] = None
+    date_end: Optional[str] = None
+
+    @property
+    def shard_id(self) -> str:
+        if self.kind == "cnj":
+            return (
+                f"{self.spider}:cnj:{self.ano}:{self.origem}:"
+                f"{self.seq_start:07d}-{self.seq_end:07d}"
+            )
+        return f"{self.spider}:dates:{self.date_start}:{self.date_end}"
+
+    @property
+    def dates(self) -> Tuple[date, date]:
+        return date.fromisoformat(self.date_start), date.fromisoformat(self.date_end)
+
+    def cnj_numbers(self, segmento: str, tribunal: str) -> Iterator[CNJNumber]:
+        """Números CNJ do shard, com dígito verificador calculado."""
+        for sequencial in range(self.seq_start, self.seq_end):
+            yield CNJNumber.build(sequencial, self.ano, segmento, tribunal, self.origem)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CrawlShard":
+        return cls(**data)
+
+
+def cnj_shards(
+    spider: str,
+    anos: Iterable[int],
+    origens: Iterable[str],
+    sequencial_max: int,
+    shard_size: Optional[int] = None,
+) -> List[CrawlShard]:
+    """Um shard por ano x origem x faixa de ``shard_size`` sequenciais."""
+    anos, origens = list(anos), list(origens)
+    if not anos or not origens or sequencial_max <= 0:
+        raise ValueError("Shards CNJ exigem anos, origens e sequencial_max positivo")
+    shard_size = shard_size or settings.crawl_shard_sequential_size
+    return [
+        CrawlShard(
+            spider=spider,
+            kind="cnj",
+            ano=ano,
+            origem=origem,
+            seq_start=start,
+            seq_end=min(start + shard_size, sequencial_max),
+        )
+        for ano in anos
+        for origem in origens
+        for start in range(0, sequencial_max, shard_size)
+    ]
+
+
+def date_shards(
+    spider: str, start: date, end: date, window_days: Optional[int] = None
+) -> List[CrawlShard]:
+    """Janelas consecutivas de ``window_days`` dias cobrindo ``[start, end]``."""
+    if end < start:
+        raise ValueError(f"Período inválido: {start} > {end}")
+    window = timedelta(days=window_days or settings.crawl_shard_date_window_days)
+    shards: List[CrawlShard] = []
+    current = start
+    while current <= end:
+        window_end = min(current + window - timedelta(days=1), end)
+        shards.append(
+            CrawlShard(
+                spider=spider,
+                kind="dates",
+                date_start=current.isoformat(),
+                date_end=window_end.isoformat(),
+            )
+        )
+        current = window_end + timedelta(days=1)
+    return shards
+
+
+class ShardTracker:
+    """Estado dos shards de uma execução, guardado no Redis.
+
+    Hash ``crawl_shards:{run_id}`` com shard_id -> JSON (shard, status,
+    tentativas, itens, erro e, em shards ``partial``, as URLs com falha).
+    Cada shard tem uma única task por vez, então
+    as atualizações não disputam a mesma entrada. Uma execução interrompida
+    é retomada despachando só os shards que não terminaram.
+    """
+
+    def __init__(self, run_id: str, ttl: Optional[int] = None):
+        self.run_id = run_id
+        self.key = f"crawl_shards:{run_id}"
+        self.ttl = ttl or settings.crawl_shard_state_ttl
+        self.client = get_redis_client()
+
+    def register(self, shards: Sequence[CrawlShard]) -> None:
+        """Cadastra shards novos; os já conhecidos mantêm o estado."""
+        pipe = self.client.pipeline(transaction=False)
+        for shard in shards:
+            state = {"shard": shard.to_dict(), "status": PENDING, "attempts": 0}
+            pipe.hsetnx(self.key, shard.shard_id, json.dumps(state))
+        pipe.expire(self.key, self.ttl)
+        pipe.execute()
+
+    def mark_running(self, shard: CrawlShard) -> None:
+        state = self._state(shard)
+        self._save(shard, state, status=RUNNING, attempts=state.get("attempts", 0) + 1)
+
+    def mark_done(self, shard: CrawlShard, items: int) -> None:
+        self._save(shard, self._state(shard), status=DONE, items=items, error=None, failed_urls=[])
+
+    def mark_partial(
+        self, shard: CrawlShard, items: int, failed_urls: Sequence[str], error: Optional[str] = None
+    ) -> None:
+        """Shard coletado exceto ``failed_urls``; ``retry_failed_shards`` refaz só elas."""
+        self._save(
+            shard,
+            self._state(shard),
+            status=PARTIAL,
+            items=items,
+            error=error,
+            failed_urls=list(failed_urls),
+        )
+
+    def mark_retrying(self, shard: CrawlShard, error: str) -> None:
+        self._save(shard, self._state(shard), status=RETRYING, error=error)
+
+    def mark_failed(self, shard: CrawlShard, error: str) -> None:
+        """Falha definitiva: tentativas esgotadas, só ``retry_failed_shards`` redespacha."""
+        self._save(shard, self._state(shard), status=FAILED, error=error)
+
+    def state(self, shard: CrawlShard) -> Dict[str, Any]:
+        return self._state(shard)
+
+    def states(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            shard_id: json.loads(raw) for shard_id, raw in self.client.hgetall(self.key).items()
+        }
+
+    def shards(self, *statuses: str) -> List[CrawlShard]:
+        """Shards da execução com um dos ``statuses``."""
+        return [
+            CrawlShard.from_dict(state["shard"])
+            for state in self.states().values()
+            if state["status"] in statuses
+        ]
+
+    def failed_urls(self) -> List[Tuple[CrawlShard, List[str]]]:
+        """Shards ``partial`` com as URLs que ainda faltam."""
+        return [
+            (CrawlShard.from_dict(state["shard"]), state.get("failed_urls", []))
+            for state in self.states().values()
+            if state["status"] == PARTIAL
+        ]
+
+    def summary(self) -> Dict[str, int]:
+        counts = {PENDING: 0, RUNNING: 0, RETRYING: 0, DONE: 0, PARTIAL: 0, FAILED: 0}
+        for state in self.states().values():
+            counts[state["status"]] += 1
+        return counts
+
+    def _state(self, shard: CrawlShard) -> Dict[str, Any]:
+        raw = self.client.hget(self.key, shard.shard_id)
+        return json.loads(raw) if raw else {"shard": shard.to_dict(), "attempts": 0}
+
+    def _save(self, shard: CrawlShard, state: Dict[str, Any], **changes: Any) -> None:
+        state.update(changes, updated_at=datetime.utcnow().isoformat())
+        pipe = self.client.pipeline(transaction=False)
+        pipe.hset(self.key, shard.shard_id, json.dumps(state))
+        pipe.expire(self.key, self.ttl)
+        pipe.execute()
+        if "failed_urls" in changes:
+            changes["failed_urls"] = len(changes["failed_urls"])
+        logger.info("crawl_shard_state", run_id=self.run_id, shard=shard.shard_id, **changes)
@@ -10,14 +10,12 @@ class DeduplicationService:
     """Mantém registro de hashes conhecidos no Redis."""
 
     def __init__(self):
-        self.cache = RedisCache(namespace="dedup")
+        # Só a existência da chave importa: valor cru, sem envelope JSON
+        self.cache = RedisCache(namespace="dedup", encoding="raw")
 
     def is_duplicate(self, hash_content: str) -> bool:
-        key = f"hash:{hash_content}"
-        if self.cache.get(key):
-            return True
-        self.cache.set(key, True)
-        return False
+        # SET NX: consulta e registro numa só ida ao Redis, sem corrida entre workers
+        return not self.cache.set_if_absent(f"hash:{hash_content}", 1)
 
     def reset(self) -> None:
         # Em um cenário real, usaríamos scan + delete
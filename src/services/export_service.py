@@ -0,0 +1,198 @@
+"""Exportação em massa das decisões para Parquet ou JSONL compactado."""
+
+import gzip
+import json
+import os
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import DateTime, Text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+
+from src.config import settings
+from src.database.postgres.models import JudicialDecisionORM
+from src.database.postgres.repositories import JudicialDecisionRepository
+from src.database.redis.cache import RedisCache
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+FORMATS = ("parquet", "jsonl")
+
+_TABLE = JudicialDecisionORM.__table__
+EXPORT_COLUMNS = [column.name for column in _TABLE.columns]
+
+
+@dataclass
+class ExportResult:
+    path: Optional[Path]
+    rows: int
+    since: Optional[datetime]
+    watermark: datetime
+
+
+class DecisionExporter:
+    """Copia ``judicial_decisions`` para arquivo com memória constante.
+
+    As linhas vêm de um cursor server-side em lotes de ``batch_size``; no
+    Parquet só um row group (``row_group_size`` linhas) fica em memória por
+    vez, no JSONL só o lote corrente. O arquivo é escrito com nome
+    temporário e renomeado no fim, então leitores nunca veem dump parcial.
+
+    No modo incremental exporta só linhas com ``updated_at`` acima da marca
+    d'água da última execução bem-sucedida (guardada no Redis). A nova marca
+    é o ``now()`` do banco no início da exportação menos ``watermark_lag``:
+    ``updated_at`` recebe o início da transação, e uma transação iniciada
+    antes da exportação mas confirmada depois dela ficaria abaixo da marca
+    para sempre. Linhas mais novas que a marca ficam para a próxima execução.
+
+    Uma decisão atualizada de novo sai em mais de um arquivo; quem consome
+    os dumps deve deduplicar por ``numero_cnj``, ficando com o maior
+    ``updated_at``.
+    """
+
+    def __init__(
+        self,
+        output_dir: Optional[str] = None,
+        fmt: Optional[str] = None,
+        columns: Optional[Sequence[str]] = None,
+        batch_size: Optional[int] = None,
+        row_group_size: Optional[int] = None,
+        compression: Optional[str] = None,
+        watermark_lag: Optional[float] = None,
+        name: str = "judicial_decisions",
+    ):
+        self.output_dir = Path(output_dir or settings.export_output_dir)
+        self.fmt = fmt or settings.export_format
+        if self.fmt not in FORMATS:
+            raise ValueError(f"Formato de exportação deve ser um de {FORMATS}")
+        self.columns = list(columns or EXPORT_COLUMNS)
+        unknown = set(self.columns) - set(EXPORT_COLUMNS)
+        if unknown:
+            raise ValueError(f"Colunas desconhecidas: {sorted(unknown)}")
+        self.batch_size = batch_size or settings.export_batch_size
+        self.row_group_size = row_group_size or settings.export_row_group_size
+        self.compression = compression or settings.export_parquet_compression
+        self.watermark_lag = timedelta(
+            seconds=settings.export_watermark_lag if watermark_lag is None else watermark_lag
+        )
+        self.name = name
+        self.repository = JudicialDecisionRepository()
+        self.cache = RedisCache(namespace="export")
+        # Colunas JSONB viram texto JSON no Parquet (esquema fixo por coluna)
+        self._json_columns = {
+            name for name in self.columns if isinstance(_TABLE.c[name].type, JSONB)
+        }
+        self._uuid_columns = {
+            name for name in self.columns if isinstance(_TABLE.c[name].type, UUID)
+        }
+
+    def export(self, incremental: bool = True, since: Optional[datetime] = None) -> ExportResult:
+        if since is None and incremental:
+            since = self.get_watermark()
+        watermark = self.repository.db_now() - self.watermark_lag
+        if since is not None and watermark <= since:
+            # Execuções mais próximas que o lag: nada confirmado com segurança ainda
+            watermark = since
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        suffix = "parquet" if self.fmt == "parquet" else "jsonl.gz"
+        kind = "incremental" if since else "full"
+        path = self.output_dir / f"{self.name}-{kind}-{watermark:%Y%m%dT%H%M%S}.{suffix}"
+        tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+
+        batches = self.repository.iter_export_batches(
+            self.columns, since=since, until=watermark, batch_size=self.batch_size
+        )
+        logger.info("export_started", format=self.fmt, since=since, until=watermark, path=str(path))
+        try:
+            if self.fmt == "parquet":
+                rows = self._write_parquet(tmp_path, batches)
+            else:
+                rows = self._write_jsonl(tmp_path, batches)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+        if rows:
+            os.replace(tmp_path, path)
+        else:
+            # Nada novo desde a última marca: não deixa arquivo vazio para trás
+            tmp_path.unlink(missing_ok=True)
+            path = None
+        self.set_watermark(watermark)
+        logger.info("export_finished", rows=rows, path=str(path) if path else None)
+        return ExportResult(path=path, rows=rows, since=since, watermark=watermark)
+
+    def get_watermark(self) -> Optional[datetime]:
+        stored = self.cache.get(f"{self.name}_watermark")
+        return datetime.fromisoformat(stored) if stored else None
+
+    def set_watermark(self, watermark: datetime) -> None:
+        self.cache.set(f"{self.name}_watermark", watermark.isoformat())
+
+    def arrow_schema(self) -> pa.Schema:
+        fields = []
+        for name in self.columns:
+            column_type = _TABLE.c[name].type
+            if isinstance(column_type, DateTime):
+                arrow_type = pa.timestamp("us", tz="UTC" if column_type.timezone else None)
+            else:
+                # String, Text, UUID e JSONB (serializado)
+                arrow_type = pa.large_string() if isinstance(column_type, Text) else pa.string()
+            fields.append(pa.field(name, arrow_type, nullable=_TABLE.c[name].nullable))
+        return pa.schema(fields)
+
+    def _write_parquet(self, path: Path, batches) -> int:
+        schema = self.arrow_schema()
+        rows = 0
+        pending: List[pa.Table] = []
+        pending_rows = 0
+        with pq.ParquetWriter(path, schema, compression=self.compression) as writer:
+            for batch in batches:
+                pending.append(pa.Table.from_pylist(self._to_parquet_rows(batch), schema=schema))
+                pending_rows += len(batch)
+                rows += len(batch)
+                if pending_rows >= self.row_group_size:
+                    self._write_row_group(writer, pending)
+                    pending, pending_rows = [], 0
+            if pending:
+                self._write_row_group(writer, pending)
+        return rows
+
+    def _write_row_group(self, writer: pq.ParquetWriter, tables: List[pa.Table]) -> None:
+        writer.write_table(pa.concat_tables(tables), row_group_size=self.row_group_size)
+
+    def _write_jsonl(self, path: Path, batches) -> int:
+        rows = 0
+        with gzip.open(path, "wt", encoding="utf-8") as output:
+            for batch in batches:
+                output.writelines(
+                    json.dumps(row, ensure_ascii=False, default=_json_default) + "\n"
+                    for row in batch
+                )
+                rows += len(batch)
+        return rows
+
+    def _to_parquet_rows(self, batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if not self._json_columns and not self._uuid_columns:
+            return batch
+        for row in batch:
+            for name in self._json_columns:
+                if row[name] is not None:
+                    row[name] = json.dumps(row[name], ensure_ascii=False, default=_json_default)
+            for name in self._uuid_columns:
+                if row[name] is not None:
+                    row[name] = str(row[name])
+        return batch
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
@@ -0,0 +1,234 @@
+"""Índices MinHash LSH para deduplicação (memória ou Redis compartilhado)."""
+
+import hashlib
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from datasketch import MinHash, MinHashLSH
+
+from src.config import settings
+from src.database.postgres.repositories import JudicialDecisionRepository
+from src.database.redis.connection import get_redis_client
+from src.utils.logger import get_logger
+from src.utils.metrics import lsh_memory_bytes, lsh_query_duration
+from src.utils.minhash import LSH_THRESHOLD, NUM_PERM, MinHashSignatureEngine, decision_text
+
+logger = get_logger(__name__)
+
+DUPLICATE_EXACT = "exact"
+DUPLICATE_FUZZY = "fuzzy"
+
+
+class MemoryMinHashIndex:
+    """Índice em memória do processo (não compartilhado entre workers)."""
+
+    backend = "memory"
+    # Sem I/O: o pipeline consulta direto na thread do reactor
+    blocking_io = False
+
+    def __init__(self, threshold: float = LSH_THRESHOLD, num_perm: int = NUM_PERM):
+        self.lsh = MinHashLSH(threshold=threshold, num_perm=num_perm)
+        # hash_content -> numero_cnj; a chave no LSH é o par (numero_cnj, hash_content)
+        self.seen_hashes: Dict[str, str] = {}
+
+    def find_duplicate(self, content_hash: str, numero_cnj: str, minhash: MinHash) -> Optional[str]:
+        """Tipo de duplicata do documento, sem inseri-lo no índice.
+
+        Candidatos do próprio ``numero_cnj`` são versões anteriores da mesma
+        decisão, não duplicatas: a recoleta revisada segue para o upsert.
+        """
+        if content_hash in self.seen_hashes:
+            return DUPLICATE_EXACT
+
+        started = time.perf_counter()
+        candidates = self.lsh.query(minhash)
+        lsh_query_duration.labels(backend=self.backend).observe(time.perf_counter() - started)
+        if any(cnj != numero_cnj for cnj, _ in candidates):
+            return DUPLICATE_FUZZY
+        return None
+
+    def insert_many(self, entries: Iterable[Tuple[str, str, MinHash]]) -> int:
+        """Insere ``(hash_content, numero_cnj, minhash)``; retorna quantos eram inéditos."""
+        count = 0
+        for content_hash, numero_cnj, minhash in entries:
+            if content_hash in self.seen_hashes:
+                continue
+            self.seen_hashes[content_hash] = numero_cnj
+            self.lsh.insert((numero_cnj, content_hash), minhash)
+            count += 1
+        return count
+
+    def remove(self, content_hash: str) -> None:
+        numero_cnj = self.seen_hashes.pop(content_hash, None)
+        if numero_cnj is not None:
+            self.lsh.remove((numero_cnj, content_hash))
+
+    def size(self) -> int:
+        return len(self.seen_hashes)
+
+    def memory_usage(self) -> int:
+        # Estimativa grosseira: assinatura uint64 por documento + chave
+        return self.size() * (self.lsh.h * 8 + 64)
+
+    def report_stats(self) -> Dict[str, int]:
+        stats = {"documents": self.size(), "memory_bytes": self.memory_usage()}
+        lsh_memory_bytes.labels(backend=self.backend).set(stats["memory_bytes"])
+        logger.info("lsh_index_stats", backend=self.backend, **stats)
+        return stats
+
+
+class RedisMinHashIndex:
+    """Índice LSH em bandas armazenado no Redis e compartilhado entre workers.
+
+    Layout das chaves (``{namespace}`` = ``settings.dedup_lsh_namespace``):
+
+    - ``{namespace}:hashes``: SET com os ``hash_content`` já vistos;
+    - ``{namespace}:band:{i}:{digest}``: SET com os ``numero_cnj`` dos
+      documentos cujo trecho ``i`` da assinatura tem aquele digest.
+
+    Consulta e inserção usam um pipeline cada, independente do número de
+    bandas. Um documento é gravado em todas as chaves ou em nenhuma, como no
+    índice em memória.
+    """
+
+    backend = "redis"
+    blocking_io = True
+
+    def __init__(
+        self,
+        namespace: Optional[str] = None,
+        threshold: float = LSH_THRESHOLD,
+        num_perm: int = NUM_PERM,
+        client=None,
+    ):
+        self.client = client or get_redis_client()
+        self.namespace = namespace or settings.dedup_lsh_namespace
+        # Reaproveita a escolha ótima de (b, r) do datasketch para o mesmo threshold
+        params = MinHashLSH(threshold=threshold, num_perm=num_perm)
+        self.hashranges: List[Tuple[int, int]] = params.hashranges
+
+    @property
+    def hashes_key(self) -> str:
+        return f"{self.namespace}:hashes"
+
+    def _band_keys(self, minhash: MinHash) -> List[str]:
+        keys = []
+        for band, (start, end) in enumerate(self.hashranges):
+            digest = hashlib.blake2b(
+                minhash.hashvalues[start:end].tobytes(), digest_size=8
+            ).hexdigest()
+            keys.append(f"{self.namespace}:band:{band}:{digest}")
+        return keys
+
+    def find_duplicate(self, content_hash: str, numero_cnj: str, minhash: MinHash) -> Optional[str]:
+        """Tipo de duplicata do documento, sem inseri-lo no índice.
+
+        Só leitura: o documento entra no índice por :meth:`insert_many`
+        depois de gravado no PostgreSQL. Dois workers com o mesmo conteúdo
+        ao mesmo tempo podem passar ambos; o índice único de
+        ``hash_content`` no banco barra o segundo. Bandas que só contêm o
+        próprio ``numero_cnj`` (versão anterior da decisão) não contam.
+        """
+        band_keys = self._band_keys(minhash)
+
+        started = time.perf_counter()
+        pipe = self.client.pipeline(transaction=False)
+        pipe.sismember(self.hashes_key, content_hash)
+        for key in band_keys:
+            pipe.scard(key)
+            pipe.sismember(key, numero_cnj)
+        seen, *buckets = pipe.execute()
+        lsh_query_duration.labels(backend=self.backend).observe(time.perf_counter() - started)
+
+        if seen:
+            return DUPLICATE_EXACT
+        # Algum balde com membro além do próprio CNJ: outra decisão parecida
+        if any(size > own for size, own in zip(buckets[::2], buckets[1::2])):
+            return DUPLICATE_FUZZY
+        return None
+
+    def insert_many(self, entries: Iterable[Tuple[str, str, MinHash]]) -> int:
+        """Insere ``(hash_content, numero_cnj, minhash)``; retorna quantos eram inéditos."""
+        pipe = self.client.pipeline(transaction=False)
+        positions: List[int] = []
+        for content_hash, numero_cnj, minhash in entries:
+            # Posição do SADD em hashes_key: 1 se o hash era inédito
+            positions.append(len(pipe))
+            pipe.sadd(self.hashes_key, content_hash)
+            for key in self._band_keys(minhash):
+                pipe.sadd(key, numero_cnj)
+        if not positions:
+            return 0
+        results = pipe.execute()
+        return sum(results[position] for position in positions)
+
+    def size(self) -> int:
+        return int(self.client.scard(self.hashes_key))
+
+    def memory_usage(self, scan_count: int = 1000) -> int:
+        """Soma ``MEMORY USAGE`` das chaves do índice (custo O(chaves))."""
+        total = 0
+        batch: List[str] = []
+        for key in self.client.scan_iter(match=f"{self.namespace}:*", count=scan_count):
+            batch.append(key)
+            if len(batch) >= scan_count:
+                total += self._memory_of(batch)
+                batch = []
+        if batch:
+            total += self._memory_of(batch)
+        return total
+
+    def _memory_of(self, keys: List[str]) -> int:
+        pipe = self.client.pipeline(transaction=False)
+        for key in keys:
+            pipe.memory_usage(key)
+        return sum(value or 0 for value in pipe.execute())
+
+    def report_stats(self) -> Dict[str, int]:
+        stats = {"documents": self.size(), "memory_bytes": self.memory_usage()}
+        lsh_memory_bytes.labels(backend=self.backend).set(stats["memory_bytes"])
+        logger.info("lsh_index_stats", backend=self.backend, **stats)
+        return stats
+
+
+def build_minhash_index(backend: Optional[str] = None):
+    """Cria o índice configurado em ``DEDUP_LSH_BACKEND``."""
+    backend = backend or settings.dedup_lsh_backend
+    if backend == "redis":
+        return RedisMinHashIndex()
+    if backend == "memory":
+        return MemoryMinHashIndex()
+    raise ValueError(f"Backend LSH desconhecido: {backend}")
+
+
+def warm_start_index(
+    index,
+    batch_size: int = 1000,
+    engine: Optional[MinHashSignatureEngine] = None,
+    repository: Optional[JudicialDecisionRepository] = None,
+) -> int:
+    """Popula o índice a partir das decisões já persistidas no PostgreSQL."""
+    repo = repository or JudicialDecisionRepository()
+    engine = engine or MinHashSignatureEngine(shingle_size=settings.dedup_shingle_size)
+    hashes: List[str] = []
+    cnjs: List[str] = []
+    texts: List[str] = []
+    total = 0
+
+    def insert_batch() -> int:
+        return index.insert_many(zip(hashes, cnjs, engine.minhashes(texts)))
+
+    for hash_content, numero_cnj, ementa, decisao in repo.iter_dedup_corpus(batch_size=batch_size):
+        hashes.append(hash_content)
+        cnjs.append(numero_cnj)
+        texts.append(decision_text(ementa, decisao))
+        if len(hashes) >= batch_size:
+            total += insert_batch()
+            hashes, cnjs, texts = [], [], []
+            logger.info("lsh_warm_start_progress", inserted=total)
+
+    if hashes:
+        total += insert_batch()
+
+    logger.info("lsh_warm_start_finished", backend=index.backend, inserted=total)
+    return total
@@ -0,0 +1,47 @@
+"""Estado por URL para crawl incremental (validadores HTTP e hash do corpo)."""
+
+from typing import Dict, Mapping, Optional
+
+from src.config import settings
+from src.database.redis.connection import get_redis_client
+
+
+class PageStateStore:
+    """ETag, Last-Modified e hash do corpo da última coleta de cada página.
+
+    Chave Redis ``{namespace}:{origem_url}`` (hash). Expira após
+    ``INCREMENTAL_STATE_TTL`` sem nova coleta, o que força um download
+    completo das páginas esquecidas. ``versao_parser`` registra o parser
+    que extraiu a página: estado de outra versão não vale como "sem mudança".
+    """
+
+    FIELDS = ("etag", "last_modified", "body_hash", "versao_parser")
+
+    def __init__(self, namespace: str = "page_state", ttl: Optional[int] = None, client=None):
+        self.client = client or get_redis_client()
+        self.namespace = namespace
+        self.ttl = ttl or settings.incremental_state_ttl
+
+    def _key(self, url: str) -> str:
+        return f"{self.namespace}:{url}"
+
+    def get(self, url: str) -> Dict[str, str]:
+        return self.client.hgetall(self._key(url))
+
+    def set(self, url: str, state: Dict[str, Optional[str]]) -> None:
+        self.set_many({url: state})
+
+    def set_many(self, states: Mapping[str, Dict[str, Optional[str]]]) -> None:
+        """Grava o estado de várias páginas numa só transação."""
+        if not states:
+            return
+        pipe = self.client.pipeline(transaction=True)
+        for url, state in states.items():
+            mapping = {name: state[name] for name in self.FIELDS if state.get(name)}
+            key = self._key(url)
+            # Substitui o estado inteiro: validador ausente na resposta nova não pode sobrar
+            pipe.delete(key)
+            if mapping:
+                pipe.hset(key, mapping=mapping)
+                pipe.expire(key, self.ttl)
+        pipe.execute()
@@ -1,53 +1,91 @@
 """Monitoramento de portais para detectar mudanças estruturais."""
 
-import hashlib
-from typing import Any, Dict, Optional
+import random
+from collections import defaultdict
+from typing import Dict, Optional
 
-from scrapy.http import Response
+from scrapy.http import Response, TextResponse
 
+from src.config import settings
 from src.database.redis.cache import RedisCache
+from src.utils.dom_fingerprint import dom_fingerprint, hamming_similarity
 from src.utils.logger import get_logger
+from src.utils.metrics import structure_checks
 
 logger = get_logger(__name__)
 
 
 class PortalMonitor:
-    """Monitora estrutura dos portais para detectar mudanças."""
+    """Monitora estrutura dos portais para detectar mudanças.
+
+    A estrutura é o SimHash do esqueleto do DOM (caminhos de tags e
+    classes), calculado sobre a árvore que o Scrapy já parseou para os
+    seletores. O baseline de cada portal fica no LRU local do cache e só é
+    relido do Redis a cada ``PORTAL_MONITOR_BASELINE_REFRESH`` segundos.
+    """
 
     def __init__(self):
-        self.cache = RedisCache(namespace="portal_monitor")
+        self.similarity_threshold = settings.portal_monitor_similarity_threshold
+        self.baseline_refresh = settings.portal_monitor_baseline_refresh
+        self.cache = RedisCache(namespace="portal_monitor", local_ttl=self.baseline_refresh)
+
+    def check_response(self, response: Response) -> bool:
+        """Registra baseline se necessário e detecta mudança com um único parse."""
+        fingerprint = self.fingerprint(response)
+        if fingerprint is None:
+            return False
+        self.record_response(response, fingerprint)
+        return self.detect_changes(response, fingerprint)
 
-    def record_response(self, response: Response) -> None:
+    def record_response(self, response: Response, fingerprint: Optional[int] = None) -> None:
         """Registra estrutura da resposta para baseline."""
         portal = self._extract_portal_name(response.url)
-        structure_hash = self._generate_structure_hash(response)
+        if self._get_baseline(portal) is not None:
+            return
 
-        baseline = self.cache.get(f"{portal}_baseline")
-        if not baseline:
-            self.cache.set(f"{portal}_baseline", structure_hash)
-            logger.info("baseline_created", portal=portal)
+        fingerprint = fingerprint if fingerprint is not None else self.fingerprint(response)
+        if fingerprint is None:
+            return
+        self.cache.set(self._baseline_key(portal), format(fingerprint, "016x"))
+        logger.info("baseline_created", portal=portal)
 
-    def detect_changes(self, response: Response) -> bool:
+    def detect_changes(self, response: Response, fingerprint: Optional[int] = None) -> bool:
         """Detecta se estrutura do portal mudou."""
         portal = self._extract_portal_name(response.url)
-        current_hash = self._generate_structure_hash(response)
+        baseline = self._get_baseline(portal)
+        if baseline is None:
+            return False
 
-        baseline = self.cache.get(f"{portal}_baseline")
-        if not baseline:
+        fingerprint = fingerprint if fingerprint is not None else self.fingerprint(response)
+        if fingerprint is None or fingerprint == baseline:
             return False
 
-        if current_hash != baseline:
-            similarity = self._calculate_similarity(current_hash, baseline)
-            if similarity < 0.7:
-                logger.warning(
-                    "portal_structure_changed",
-                    portal=portal,
-                    similarity=similarity,
-                )
-                return True
+        similarity = hamming_similarity(fingerprint, baseline)
+        if similarity < self.similarity_threshold:
+            logger.warning(
+                "portal_structure_changed",
+                portal=portal,
+                similarity=similarity,
+            )
+            return True
 
         return False
 
+    def fingerprint(self, response: Response) -> Optional[int]:
+        """SimHash do esqueleto do DOM (None para respostas não textuais)."""
+        if not isinstance(response, TextResponse) or not response.body:
+            return None
+        # response.selector é cacheado: o parse é o mesmo usado pela extração
+        return dom_fingerprint(response.selector.root)
+
+    def _get_baseline(self, portal: str) -> Optional[int]:
+        stored = self.cache.get(self._baseline_key(portal))
+        return int(stored, 16) if stored else None
+
+    def _baseline_key(self, portal: str) -> str:
+        # Chave nova: baselines MD5 antigos não são comparáveis com SimHash
+        return f"{portal}_skeleton_baseline"
+
     def _extract_portal_name(self, url: str) -> str:
         if "esaj" in url:
             return "esaj"
@@ -57,12 +95,51 @@ class PortalMonitor:
             return "eproc"
         return "unknown"
 
-    def _generate_structure_hash(self, response: Response) -> str:
-        body = response.body[:10000]
-        return hashlib.md5(body).hexdigest()
 
-    def _calculate_similarity(self, hash1: str, hash2: str) -> float:
-        if hash1 == hash2:
-            return 1.0
-        matching = sum(c1 == c2 for c1, c2 in zip(hash1, hash2))
-        return matching / len(hash1)
+class StructureCheckSampler:
+    """Decide quais respostas passam pela checagem estrutural.
+
+    Por portal, checa a cada ``every`` respostas ou, se ``rate`` > 0, uma
+    fração aleatória. A primeira resposta do portal é sempre checada (cria
+    o baseline). Depois de falha de extração, as próximas
+    ``failure_window`` respostas do portal são todas checadas.
+    """
+
+    def __init__(self, every: int = 1, rate: float = 0.0, failure_window: int = 0):
+        self.every = max(every, 1)
+        self.rate = min(max(rate, 0.0), 1.0)
+        self.failure_window = max(failure_window, 0)
+        self._seen: Dict[str, int] = defaultdict(int)
+        self._forced: Dict[str, int] = defaultdict(int)
+
+    @classmethod
+    def from_settings(cls, spider_settings) -> "StructureCheckSampler":
+        """Lê ``PORTAL_MONITOR_SAMPLE_*`` dos settings da spider."""
+        return cls(
+            every=spider_settings.getint("PORTAL_MONITOR_SAMPLE_EVERY", 1),
+            rate=spider_settings.getfloat("PORTAL_MONITOR_SAMPLE_RATE", 0.0),
+            failure_window=spider_settings.getint("PORTAL_MONITOR_FAILURE_WINDOW", 0),
+        )
+
+    def should_check(self, portal: str) -> bool:
+        seen = self._seen[portal]
+        self._seen[portal] = seen + 1
+
+        if self._forced[portal] > 0:
+            self._forced[portal] -= 1
+            sampled = True
+        elif seen == 0:
+            sampled = True
+        elif self.rate > 0:
+            sampled = random.random() < self.rate
+        else:
+            sampled = seen % self.every == 0
+
+        structure_checks.labels(portal=portal, result="sampled" if sampled else "skipped").inc()
+        return sampled
+
+    def report_failure(self, portal: str) -> None:
+        """Extração falhou ou veio vazia: checa todas as próximas respostas."""
+        if self.failure_window and not self._forced[portal]:
+            logger.info("structure_checks_forced", portal=portal, responses=self.failure_window)
+        self._forced[portal] = self.failure_window
@@ -0,0 +1,95 @@
+"""Acumulador dos contadores diários de qualidade."""
+
+import threading
+from collections import defaultdict
+from datetime import date, datetime, timezone
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from src.database.postgres.models import QUALITY_FIELDS
+from src.database.postgres.repositories import UNKNOWN_PORTAL, QualityStatsRepository
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DUPLICATE = "duplicates"
+INVALID = "invalid"
+
+
+class QualityStatsRecorder:
+    """Conta itens gravados e descartados em memória e grava por incremento.
+
+    Decisões novas (``stored``) e recoletas de decisões já gravadas
+    (``updated``) são contadas à parte: só as novas entram na completude.
+
+    Cada item custa só um dicionário atualizado; :meth:`flush` soma os
+    contadores pendentes de cada (dia, portal) no PostgreSQL com um único
+    upsert. Se a gravação falhar, os contadores voltam para o acumulador e
+    entram no próximo flush.
+    """
+
+    def __init__(self, repository: Optional[QualityStatsRepository] = None):
+        self.repository = repository or QualityStatsRepository()
+        self._pending: Dict[Tuple[date, str], Dict[str, int]] = defaultdict(
+            lambda: defaultdict(int)
+        )
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def record_stored(self, item: Mapping[str, Any], portal: Optional[str] = None) -> None:
+        """Decisão nova: conta em ``stored`` e na completude dos campos."""
+        filled = [name for name in QUALITY_FIELDS if _is_filled(item.get(name))]
+        with self._lock:
+            counters = self._pending[self._key(item.get("portal") or portal)]
+            counters["stored"] += 1
+            for name in filled:
+                counters[f"filled_{name}"] += 1
+
+    def record_updated(self, item: Mapping[str, Any], portal: Optional[str] = None) -> None:
+        """Decisão recoletada que só atualizou a linha existente."""
+        with self._lock:
+            self._pending[self._key(item.get("portal") or portal)]["updated"] += 1
+
+    def record_dropped(self, reason: str, portal: Optional[str] = None) -> None:
+        if reason not in (DUPLICATE, INVALID):
+            raise ValueError(f"Motivo de descarte desconhecido: {reason}")
+        with self._lock:
+            self._pending[self._key(portal)][reason] += 1
+
+    def flush(self) -> int:
+        """Grava os contadores pendentes; retorna quantas linhas (dia, portal)."""
+        with self._lock:
+            pending, self._pending = self._pending, defaultdict(lambda: defaultdict(int))
+        if not pending:
+            return 0
+
+        rows = [
+            {"day": day, "portal": portal, **counters}
+            for (day, portal), counters in pending.items()
+        ]
+        try:
+            written = self.repository.increment(rows)
+        except Exception:
+            self._restore(pending)
+            raise
+        logger.info("quality_stats_flushed", rows=written)
+        return written
+
+    def _restore(self, pending: Dict[Tuple[date, str], Dict[str, int]]) -> None:
+        with self._lock:
+            for key, counters in pending.items():
+                for name, value in counters.items():
+                    self._pending[key][name] += value
+
+    @staticmethod
+    def _key(portal: Optional[str]) -> Tuple[date, str]:
+        return datetime.now(timezone.utc).date(), portal or UNKNOWN_PORTAL
+
+
+def _is_filled(value: Any) -> bool:
+    # Mesmo critério do backfill: None e texto vazio não contam como preenchidos
+    if isinstance(value, (str, list, dict)):
+        return bool(value)
+    return value is not None
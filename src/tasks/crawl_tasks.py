@@ -1,21 +1,185 @@
 """Tasks relacionadas a execução de crawlers."""
 
-from celery import shared_task
-from scrapy.crawler import CrawlerProcess
+import uuid
+from datetime import date
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
-from src.config.scrapy_settings import SCRAPY_SETTINGS
+from celery import chord, shared_task
+
+from src.config import settings
 from src.crawlers.esaj.tjsp_spider import TJSPESAJSpider
+from src.crawlers.runner import FINISHED, CrawlJob, get_crawler_runner
+from src.services.alert_service import AlertService
+from src.services.crawl_sharding import (
+    DONE,
+    FAILED,
+    PARTIAL,
+    PENDING,
+    CrawlShard,
+    ShardTracker,
+    cnj_shards,
+    date_shards,
+)
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Spiders que podem ser executadas em shards, por nome
+SPIDERS = {TJSPESAJSpider.name: TJSPESAJSpider}
+
 
 @shared_task(bind=True, name="tasks.run_tjsp_esaj")
-def run_tjsp_esaj(self):
+def run_tjsp_esaj(self) -> Dict[str, Any]:
     """Executa spider TJSP eSAJ com resistência."""
-    process = CrawlerProcess(SCRAPY_SETTINGS)
-
     logger.info("celery_task_start", task=self.name)
-    process.crawl(TJSPESAJSpider)
-    process.start()
-    logger.info("celery_task_finished", task=self.name)
+    # Reactor persistente do worker: o processo não precisa ser reciclado
+    job = get_crawler_runner().run(TJSPESAJSpider, job_id=self.request.id)
+    logger.info("celery_task_finished", task=self.name, status=job.status, items=job.items)
+    return job.to_dict()
+
+
+@shared_task(bind=True, name="tasks.run_sharded_crawl")
+def run_sharded_crawl(
+    self,
+    spider: str = TJSPESAJSpider.name,
+    kind: str = "cnj",
+    run_id: Optional[str] = None,
+    anos: Optional[Sequence[int]] = None,
+    origens: Optional[Sequence[str]] = None,
+    sequencial_max: Optional[int] = None,
+    date_start: Optional[str] = None,
+    date_end: Optional[str] = None,
+) -> str:
+    """Particiona o crawl e despacha um chord com uma task por shard.
+
+    Repetir a chamada com o mesmo ``run_id`` retoma a execução: shards já
+    concluídos ou em andamento não são despachados de novo.
+    """
+    if spider not in SPIDERS:
+        raise ValueError(f"Spider desconhecida: {spider}")
+
+    run_id = run_id or f"{spider}-{uuid.uuid4().hex[:12]}"
+    if kind == "cnj":
+        shards = cnj_shards(spider, anos or [], origens or [], sequencial_max or 0)
+    elif kind == "dates":
+        if not date_start or not date_end:
+            raise ValueError("Shards por data exigem date_start e date_end")
+        shards = date_shards(spider, date.fromisoformat(date_start), date.fromisoformat(date_end))
+    else:
+        raise ValueError(f"Tipo de shard desconhecido: {kind}")
+
+    tracker = ShardTracker(run_id)
+    tracker.register(shards)
+    pending = tracker.shards(PENDING, FAILED)
+    logger.info("sharded_crawl_start", run_id=run_id, shards=len(shards), dispatched=len(pending))
+    _dispatch(run_id, pending)
+    return run_id
+
+
+@shared_task(
+    bind=True,
+    name="tasks.crawl_shard",
+    max_retries=settings.crawl_shard_max_retries,
+    acks_late=True,
+)
+def crawl_shard(
+    self, run_id: str, shard_data: Dict[str, Any], urls: Optional[Sequence[str]] = None
+) -> Dict[str, Any]:
+    """Executa a spider restrita a um shard.
+
+    Falhas são retentadas só para este shard (estado ``retrying``);
+    esgotadas as tentativas, o shard fica ``failed`` e o resultado segue
+    para o chord sem derrubar a agregação dos demais. Poucas URLs com
+    falha (até ``CRAWL_SHARD_MAX_FAILED_RATIO`` das páginas visitadas) não
+    refazem o shard: ele fica ``partial`` com essas URLs, e uma nova
+    chamada com ``urls`` recoleta só elas.
+    """
+    shard = CrawlShard.from_dict(shard_data)
+    tracker = ShardTracker(run_id)
+    previous_items = tracker.state(shard).get("items", 0) if urls else 0
+    tracker.mark_running(shard)
+    spider_kwargs = {"start_urls": list(urls)} if urls else {"shard": shard}
+
+    try:
+        job = get_crawler_runner().run(
+            SPIDERS[shard.spider], job_id=f"{run_id}:{shard.shard_id}", **spider_kwargs
+        )
+        too_many_failures = not urls and _failed_ratio(job) > settings.crawl_shard_max_failed_ratio
+        if job.status != FINISHED or too_many_failures:
+            raise RuntimeError(
+                job.error
+                or f"shard terminou com {job.finish_reason} e "
+                f"{len(job.failed_urls)} URLs com falha"
+            )
+    except Exception as exc:  # pylint: disable=broad-except
+        if self.request.retries < self.max_retries:
+            # Não é "failed": retry_failed_shards não pode redespachar em paralelo
+            tracker.mark_retrying(shard, str(exc))
+            countdown = settings.crawl_shard_retry_backoff * 2**self.request.retries
+            raise self.retry(exc=exc, countdown=countdown)
+        logger.error("crawl_shard_failed", run_id=run_id, shard=shard.shard_id, error=str(exc))
+        if urls:
+            # O resto do shard já foi coletado: continua parcial, com as mesmas URLs
+            tracker.mark_partial(shard, previous_items, urls, error=str(exc))
+            return {"shard_id": shard.shard_id, "status": PARTIAL, "items": 0, "error": str(exc)}
+        tracker.mark_failed(shard, str(exc))
+        return {"shard_id": shard.shard_id, "status": FAILED, "items": 0, "error": str(exc)}
+
+    items = previous_items + job.items
+    if job.failed_urls:
+        tracker.mark_partial(shard, items, job.failed_urls)
+        return {"shard_id": shard.shard_id, "status": PARTIAL, "items": job.items, "error": None}
+    tracker.mark_done(shard, items)
+    return {"shard_id": shard.shard_id, "status": DONE, "items": job.items, "error": None}
+
+
+@shared_task(bind=True, name="tasks.aggregate_crawl_shards")
+def aggregate_crawl_shards(self, results: List[Dict[str, Any]], run_id: str) -> Dict[str, Any]:
+    """Callback do chord: consolida itens e shards com falha da execução."""
+    failed = [result["shard_id"] for result in results if result["status"] == FAILED]
+    items = sum(result["items"] for result in results)
+    summary = ShardTracker(run_id).summary()
+    logger.info(
+        "sharded_crawl_finished",
+        run_id=run_id,
+        items=items,
+        shards=len(results),
+        failed=len(failed),
+        **summary,
+    )
+    if failed:
+        AlertService().send_alert(
+            level="warning",
+            message=f"{len(failed)} shards falharam na execução {run_id}",
+            metadata={"run_id": run_id, "shards": failed[:10]},
+        )
+    return {"run_id": run_id, "items": items, "shards": len(results), "failed": failed}
+
+
+@shared_task(bind=True, name="tasks.retry_failed_shards")
+def retry_failed_shards(self, run_id: str) -> int:
+    """Redespacha os shards ``failed`` inteiros e, dos ``partial``, só as URLs com falha."""
+    tracker = ShardTracker(run_id)
+    shards = tracker.shards(FAILED)
+    partial = tracker.failed_urls()
+    logger.info("crawl_shards_retry", run_id=run_id, shards=len(shards), partial=len(partial))
+    _dispatch(run_id, shards, partial)
+    return len(shards) + len(partial)
+
+
+def _dispatch(
+    run_id: str,
+    shards: Sequence[CrawlShard],
+    partial: Sequence[Tuple[CrawlShard, List[str]]] = (),
+) -> None:
+    signatures = [crawl_shard.s(run_id, shard.to_dict()) for shard in shards]
+    signatures += [crawl_shard.s(run_id, shard.to_dict(), urls) for shard, urls in partial if urls]
+    if not signatures:
+        return
+    chord(signatures)(aggregate_crawl_shards.s(run_id))
+
+
+def _failed_ratio(job: CrawlJob) -> float:
+    # Páginas visitadas ~ itens extraídos + URLs que falharam
+    failed = len(job.failed_urls)
+    return failed / max(job.items + failed, 1)
@@ -0,0 +1,15 @@
+"""Tasks de manutenção dos agregados do dashboard."""
+
+from celery import shared_task
+
+from src.database.postgres.repositories import DecisionCountsRepository
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@shared_task(bind=True, name="tasks.refresh_dashboard_aggregates", ignore_result=True)
+def refresh_dashboard_aggregates(self) -> None:
+    """Atualiza ``decision_counts_daily``; agendada pelo Celery beat."""
+    DecisionCountsRepository().refresh()
+    logger.info("dashboard_aggregates_refreshed", task=self.name)
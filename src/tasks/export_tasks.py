@@ -0,0 +1,30 @@
+"""Tasks de exportação em massa."""
+
+from typing import Any, Dict, List, Optional
+
+from celery import shared_task
+
+from src.services.export_service import DecisionExporter
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@shared_task(bind=True, name="tasks.export_decisions")
+def export_decisions(
+    self,
+    fmt: Optional[str] = None,
+    columns: Optional[List[str]] = None,
+    incremental: bool = True,
+    output_dir: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Dump noturno das decisões; incremental pela marca d'água de ``updated_at``."""
+    exporter = DecisionExporter(output_dir=output_dir, fmt=fmt, columns=columns)
+    result = exporter.export(incremental=incremental)
+    logger.info("export_task_finished", task=self.name, rows=result.rows)
+    return {
+        "path": str(result.path) if result.path else None,
+        "rows": result.rows,
+        "since": result.since.isoformat() if result.since else None,
+        "watermark": result.watermark.isoformat(),
+    }
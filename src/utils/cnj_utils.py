@@ -1,7 +1,162 @@
 """Utilitários para número CNJ (Conselho Nacional de Justiça)."""
 
 import re
-from typing import Dict, Optional
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+# Padrões compilados uma única vez no import do módulo
+_CNJ_PATTERN = re.compile(r"^(\d{7})-(\d{2})\.(\d{4})\.(\d)\.(\d{2})\.(\d{4})$")
+_NORMALIZE_PATTERNS = (
+    re.compile(r"(\d{7})-?(\d{2})\.?(\d{4})\.?(\d)\.?(\d{2})\.?(\d{4})"),
+    re.compile(r"(\d{7})(\d{2})(\d{4})(\d)(\d{2})(\d{4})"),
+)
+
+TRIBUNAIS: Dict[str, str] = {
+    "01": "STF - Supremo Tribunal Federal",
+    "02": "CNJ - Conselho Nacional de Justiça",
+    "03": "STJ - Superior Tribunal de Justiça",
+    "04": "JF - Justiça Federal",
+    "05": "JT - Justiça do Trabalho",
+    "06": "JE - Justiça Eleitoral",
+    "07": "JM - Justiça Militar da União",
+    "08": "TJDFT - Tribunal de Justiça do Distrito Federal e Territórios",
+    "09": "TJAC - Tribunal de Justiça do Acre",
+    "10": "TJAL - Tribunal de Justiça de Alagoas",
+    "11": "TJAP - Tribunal de Justiça do Amapá",
+    "12": "TJAM - Tribunal de Justiça do Amazonas",
+    "13": "TJBA - Tribunal de Justiça da Bahia",
+    "14": "TJCE - Tribunal de Justiça do Ceará",
+    "15": "TJES - Tribunal de Justiça do Espírito Santo",
+    "16": "TJGO - Tribunal de Justiça de Goiás",
+    "17": "TJMA - Tribunal de Justiça do Maranhão",
+    "18": "TJMT - Tribunal de Justiça de Mato Grosso",
+    "19": "TJMS - Tribunal de Justiça de Mato Grosso do Sul",
+    "20": "TJMG - Tribunal de Justiça de Minas Gerais",
+    "21": "TJPA - Tribunal de Justiça do Pará",
+    "22": "TJPB - Tribunal de Justiça da Paraíba",
+    "23": "TJPR - Tribunal de Justiça do Paraná",
+    "24": "TJPE - Tribunal de Justiça de Pernambuco",
+    "25": "TJPI - Tribunal de Justiça do Piauí",
+    "26": "TJSP - Tribunal de Justiça de São Paulo",
+    "27": "TJRJ - Tribunal de Justiça do Rio de Janeiro",
+    "28": "TJRN - Tribunal de Justiça do Rio Grande do Norte",
+    "29": "TJRS - Tribunal de Justiça do Rio Grande do Sul",
+    "30": "TJRO - Tribunal de Justiça de Rondônia",
+    "31": "TJRR - Tribunal de Justiça de Roraima",
+    "32": "TJSC - Tribunal de Justiça de Santa Catarina",
+    "33": "TJSE - Tribunal de Justiça de Sergipe",
+    "34": "TJTO - Tribunal de Justiça de Tocantins",
+}
+
+SEGMENTOS: Dict[str, str] = {
+    "1": "Supremo Tribunal Federal",
+    "2": "Conselho Nacional de Justiça",
+    "3": "Superior Tribunal de Justiça",
+    "4": "Justiça Federal",
+    "5": "Justiça do Trabalho",
+    "6": "Justiça Eleitoral",
+    "7": "Justiça Militar da União",
+    "8": "Justiça Estadual",
+    "9": "Justiça Militar Estadual",
+}
+
+# Layout NNNNNNN-DD.AAAA.J.TR.OOOO para validação vetorizada em lote
+_CNJ_LENGTH = 25
+_SEPARATORS = {7: ord("-"), 10: ord("."), 15: ord("."), 17: ord("."), 20: ord(".")}
+_DIGIT_POSITIONS = np.array([i for i in range(_CNJ_LENGTH) if i not in _SEPARATORS])
+# Ordem do cálculo do dígito: origem + ano + segmento + tribunal + sequencial
+_CHECKSUM_POSITIONS = np.array(
+    list(range(21, 25)) + list(range(11, 15)) + [16] + [18, 19] + list(range(0, 7))
+)
+_DIGITO_POSITIONS = np.array([8, 9])
+
+
+class CNJNumber:
+    """Número CNJ interpretado uma única vez.
+
+    Exemplo:
+        >>> cnj = CNJNumber.parse("0001234-56.2024.8.26.0100")
+        >>> cnj.tribunal_nome
+        'TJSP - Tribunal de Justiça de São Paulo'
+    """
+
+    __slots__ = ("sequencial", "digito", "ano", "segmento", "tribunal", "origem")
+
+    def __init__(
+        self,
+        sequencial: str,
+        digito: str,
+        ano: str,
+        segmento: str,
+        tribunal: str,
+        origem: str,
+    ):
+        self.sequencial = sequencial
+        self.digito = digito
+        self.ano = ano
+        self.segmento = segmento
+        self.tribunal = tribunal
+        self.origem = origem
+
+    @classmethod
+    def parse(cls, numero_cnj: str) -> Optional["CNJNumber"]:
+        """Interpreta número no formato NNNNNNN-DD.AAAA.J.TR.OOOO ou retorna None."""
+        match = _CNJ_PATTERN.match(numero_cnj)
+        if not match:
+            return None
+        return cls(*match.groups())
+
+    @classmethod
+    def build(
+        cls, sequencial: int, ano: int, segmento: str, tribunal: str, origem: str
+    ) -> "CNJNumber":
+        """Monta o número a partir dos componentes, calculando o dígito."""
+        sequencial_str = f"{sequencial:07d}"
+        ano_str = f"{ano:04d}"
+        num_str = origem + ano_str + segmento + tribunal + sequencial_str
+        digito = f"{98 - int(num_str) % 97:02d}"
+        return cls(sequencial_str, digito, ano_str, segmento, tribunal, origem)
+
+    @property
+    def checksum_valid(self) -> bool:
+        num_str = self.origem + self.ano + self.segmento + self.tribunal + self.sequencial
+        return 98 - int(num_str) % 97 == int(self.digito)
+
+    @property
+    def tribunal_nome(self) -> str:
+        return get_tribunal_name(self.tribunal)
+
+    @property
+    def segmento_nome(self) -> str:
+        return get_segmento_name(self.segmento)
+
+    def components(self) -> Dict[str, str]:
+        return {
+            "sequencial": self.sequencial,
+            "digito": self.digito,
+            "ano": self.ano,
+            "segmento": self.segmento,
+            "tribunal": self.tribunal,
+            "origem": self.origem,
+        }
+
+    def __str__(self) -> str:
+        return (
+            f"{self.sequencial}-{self.digito}.{self.ano}.{self.segmento}."
+            f"{self.tribunal}.{self.origem}"
+        )
+
+    def __repr__(self) -> str:
+        return f"CNJNumber('{self}')"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, CNJNumber):
+            return NotImplemented
+        return str(self) == str(other)
+
+    def __hash__(self) -> int:
+        return hash(str(self))
 
 
 def validate_cnj_format(numero_cnj: str) -> bool:
@@ -16,8 +171,7 @@ def validate_cnj_format(numero_cnj: str) -> bool:
     Returns:
         True se válido, False caso contrário
     """
-    pattern = r"^\d{7}-\d{2}\.\d{4}\.\d\.\d{2}\.\d{4}$"
-    return bool(re.match(pattern, numero_cnj))
+    return _CNJ_PATTERN.match(numero_cnj) is not None
 
 
 def extract_cnj_components(numero_cnj: str) -> Optional[Dict[str, str]]:
@@ -41,23 +195,8 @@ def extract_cnj_components(numero_cnj: str) -> Optional[Dict[str, str]]:
             'origem': '0100'
         }
     """
-    if not validate_cnj_format(numero_cnj):
-        return None
-
-    pattern = r"^(\d{7})-(\d{2})\.(\d{4})\.(\d)\.(\d{2})\.(\d{4})$"
-    match = re.match(pattern, numero_cnj)
-
-    if not match:
-        return None
-
-    return {
-        "sequencial": match.group(1),
-        "digito": match.group(2),
-        "ano": match.group(3),
-        "segmento": match.group(4),
-        "tribunal": match.group(5),
-        "origem": match.group(6),
-    }
+    cnj = CNJNumber.parse(numero_cnj)
+    return cnj.components() if cnj else None
 
 
 def validate_cnj_checksum(numero_cnj: str) -> bool:
@@ -70,25 +209,42 @@ def validate_cnj_checksum(numero_cnj: str) -> bool:
     Returns:
         True se dígito válido, False caso contrário
     """
-    components = extract_cnj_components(numero_cnj)
-    if not components:
-        return False
+    cnj = CNJNumber.parse(numero_cnj)
+    return cnj is not None and cnj.checksum_valid
+
+
+def validate_cnj_batch(numeros: Iterable[str]) -> np.ndarray:
+    """
+    Valida formato e dígito verificador de vários números em uma chamada.
+    
+    Args:
+        numeros: Lista ou array de números CNJ
+        
+    Returns:
+        Array booleano com o resultado de cada número (mesma ordem)
+    """
+    encoded = [numero.encode("ascii", "replace") for numero in numeros]
+    if not encoded:
+        return np.zeros(0, dtype=bool)
+
+    lengths = np.fromiter((len(value) for value in encoded), dtype=np.int64, count=len(encoded))
+    chars = np.array(encoded, dtype=f"S{_CNJ_LENGTH}").view(np.uint8)
+    chars = chars.reshape(len(encoded), _CNJ_LENGTH)
 
-    # Calcula dígito verificador
-    num_str = (
-        components["origem"]
-        + components["ano"]
-        + components["segmento"]
-        + components["tribunal"]
-        + components["sequencial"]
-    )
+    valid = lengths == _CNJ_LENGTH
+    for position, separator in _SEPARATORS.items():
+        valid &= chars[:, position] == separator
 
-    remainder = int(num_str) % 97
-    calculated_digit = 98 - remainder
+    digits = chars.astype(np.int64) - ord("0")
+    valid &= ((digits[:, _DIGIT_POSITIONS] >= 0) & (digits[:, _DIGIT_POSITIONS] <= 9)).all(axis=1)
 
-    expected_digit = int(components["digito"])
+    # Horner módulo 97: evita montar o inteiro de 18 dígitos linha a linha
+    remainder = np.zeros(len(encoded), dtype=np.int64)
+    for position in _CHECKSUM_POSITIONS:
+        remainder = (remainder * 10 + digits[:, position]) % 97
+    digito = digits[:, _DIGITO_POSITIONS[0]] * 10 + digits[:, _DIGITO_POSITIONS[1]]
 
-    return calculated_digit == expected_digit
+    return valid & (98 - remainder == digito)
 
 
 def get_tribunal_name(tribunal_code: str) -> str:
@@ -101,44 +257,7 @@ def get_tribunal_name(tribunal_code: str) -> str:
     Returns:
         Nome do tribunal
     """
-    tribunais = {
-        "01": "STF - Supremo Tribunal Federal",
-        "02": "CNJ - Conselho Nacional de Justiça",
-        "03": "STJ - Superior Tribunal de Justiça",
-        "04": "JF - Justiça Federal",
-        "05": "JT - Justiça do Trabalho",
-        "06": "JE - Justiça Eleitoral",
-        "07": "JM - Justiça Militar da União",
-        "08": "TJDFT - Tribunal de Justiça do Distrito Federal e Territórios",
-        "09": "TJAC - Tribunal de Justiça do Acre",
-        "10": "TJAL - Tribunal de Justiça de Alagoas",
-        "11": "TJAP - Tribunal de Justiça do Amapá",
-        "12": "TJAM - Tribunal de Justiça do Amazonas",
-        "13": "TJBA - Tribunal de Justiça da Bahia",
-        "14": "TJCE - Tribunal de Justiça do Ceará",
-        "15": "TJES - Tribunal de Justiça do Espírito Santo",
-        "16": "TJGO - Tribunal de Justiça de Goiás",
-        "17": "TJMA - Tribunal de Justiça do Maranhão",
-        "18": "TJMT - Tribunal de Justiça de Mato Grosso",
-        "19": "TJMS - Tribunal de Justiça de Mato Grosso do Sul",
-        "20": "TJMG - Tribunal de Justiça de Minas Gerais",
-        "21": "TJPA - Tribunal de Justiça do Pará",
-        "22": "TJPB - Tribunal de Justiça da Paraíba",
-        "23": "TJPR - Tribunal de Justiça do Paraná",
-        "24": "TJPE - Tribunal de Justiça de Pernambuco",
-        "25": "TJPI - Tribunal de Justiça do Piauí",
-        "26": "TJSP - Tribunal de Justiça de São Paulo",
-        "27": "TJRJ - Tribunal de Justiça do Rio de Janeiro",
-        "28": "TJRN - Tribunal de Justiça do Rio Grande do Norte",
-        "29": "TJRS - Tribunal de Justiça do Rio Grande do Sul",
-        "30": "TJRO - Tribunal de Justiça de Rondônia",
-        "31": "TJRR - Tribunal de Justiça de Roraima",
-        "32": "TJSC - Tribunal de Justiça de Santa Catarina",
-        "33": "TJSE - Tribunal de Justiça de Sergipe",
-        "34": "TJTO - Tribunal de Justiça de Tocantins",
-    }
-
-    return tribunais.get(tribunal_code, f"Tribunal desconhecido ({tribunal_code})")
+    return TRIBUNAIS.get(tribunal_code, f"Tribunal desconhecido ({tribunal_code})")
 
 
 def get_segmento_name(segmento_code: str) -> str:
@@ -151,19 +270,7 @@ def get_segmento_name(segmento_code: str) -> str:
     Returns:
         Nome do segmento
     """
-    segmentos = {
-        "1": "Supremo Tribunal Federal",
-        "2": "Conselho Nacional de Justiça",
-        "3": "Superior Tribunal de Justiça",
-        "4": "Justiça Federal",
-        "5": "Justiça do Trabalho",
-        "6": "Justiça Eleitoral",
-        "7": "Justiça Militar da União",
-        "8": "Justiça Estadual",
-        "9": "Justiça Militar Estadual",
-    }
-
-    return segmentos.get(segmento_code, f"Segmento desconhecido ({segmento_code})")
+    return SEGMENTOS.get(segmento_code, f"Segmento desconhecido ({segmento_code})")
 
 
 def normalize_cnj_number(numero: str) -> Optional[str]:
@@ -180,14 +287,9 @@ def normalize_cnj_number(numero: str) -> Optional[str]:
     numero = numero.strip()
 
     # Tenta diferentes padrões
-    patterns = [
-        r"(\d{7})-?(\d{2})\.?(\d{4})\.?(\d)\.?(\d{2})\.?(\d{4})",
-        r"(\d{7})(\d{2})(\d{4})(\d)(\d{2})(\d{4})",
-    ]
-
-    for pattern in patterns:
-        match = re.match(pattern, numero)
+    for pattern in _NORMALIZE_PATTERNS:
+        match = pattern.match(numero)
         if match:
-            return f"{match.group(1)}-{match.group(2)}.{match.group(3)}.{match.group(4)}.{match.group(5)}.{match.group(6)}"
+            return "{}-{}.{}.{}.{}.{}".format(*match.groups())
 
     return None
@@ -0,0 +1,80 @@
+"""Parser de datas no formato usado pelos tribunais brasileiros."""
+
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Optional, Union
+
+from dateutil import parser
+
+DateInput = Union[str, date, datetime, None]
+
+
+def parse_court_date(value: DateInput) -> Optional[datetime]:
+    """
+    Converte data de tribunal para ``datetime``.
+
+    Formatos com caminho rápido: ``dd/mm/yyyy``, ``dd/mm/yyyy HH:MM``,
+    ``dd/mm/yyyy HH:MM:SS`` e ISO 8601. Demais formatos caem no
+    ``dateutil`` com ``dayfirst=True``, como ``validators.validate_date``.
+
+    Args:
+        value: String, ``date`` ou ``datetime``
+
+    Returns:
+        ``datetime`` ou None para valores vazios
+
+    Raises:
+        ValueError: se a string não puder ser interpretada
+    """
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+
+    value = value.strip()
+    if not value:
+        return None
+    return _parse_cached(value)
+
+
+@lru_cache(maxsize=65536)
+def _parse_cached(value: str) -> datetime:
+    # datetime é imutável: o mesmo objeto pode ser devolvido a vários itens
+    parsed = _parse_fixed_format(value)
+    if parsed is not None:
+        return parsed
+
+    try:
+        return parser.parse(value, dayfirst=True)
+    except (ValueError, OverflowError) as exc:
+        raise ValueError(f"Data inválida: {value}") from exc
+
+
+def _parse_fixed_format(value: str) -> Optional[datetime]:
+    length = len(value)
+    try:
+        if length >= 10 and value[2] == "/" and value[5] == "/":
+            day, month, year = int(value[0:2]), int(value[3:5]), int(value[6:10])
+            if length == 10:
+                return datetime(year, month, day)
+            if length == 16 and value[10] == " " and value[13] == ":":
+                return datetime(year, month, day, int(value[11:13]), int(value[14:16]))
+            if length == 19 and value[10] == " " and value[13] == ":" and value[16] == ":":
+                return datetime(
+                    year,
+                    month,
+                    day,
+                    int(value[11:13]),
+                    int(value[14:16]),
+                    int(value[17:19]),
+                )
+            return None
+
+        if length >= 10 and value[4] == "-" and value[7] == "-":
+            return datetime.fromisoformat(value)
+    except ValueError:
+        # Formato parecido mas não exato (ex.: sufixo "Z" em Python < 3.11)
+        return None
+    return None
@@ -0,0 +1,68 @@
+"""Impressão digital estrutural (esqueleto do DOM) via SimHash."""
+
+import hashlib
+from typing import Iterable, Optional, Set
+
+import numpy as np
+from lxml import html as lxml_html
+
+FINGERPRINT_BITS = 64
+
+# Conteúdo destes elementos muda a cada página e não descreve o layout
+_IGNORED_TAGS = frozenset({"script", "style", "noscript", "template", "svg"})
+
+# Quantos ancestrais entram em cada shingle (ex.: div.main>table.result>tr)
+_PATH_SHINGLE_SIZE = 3
+
+
+def skeleton_shingles(root, shingle_size: int = _PATH_SHINGLE_SIZE) -> Set[str]:
+    """Caminhos ``tag.classes`` dos últimos ``shingle_size`` níveis de cada elemento.
+
+    Texto, atributos (exceto ``class``) e repetições são ignorados: uma lista
+    de resultados com 10 ou 50 linhas gera os mesmos shingles.
+    """
+    features: Set[str] = set()
+    stack = [(root, ())]
+    while stack:
+        element, ancestors = stack.pop()
+        for child in element:
+            tag = child.tag
+            if not isinstance(tag, str) or tag in _IGNORED_TAGS:
+                # Comentários e instruções de processamento não têm tag textual
+                continue
+            classes = child.get("class")
+            label = f"{tag}.{'.'.join(sorted(classes.split()))}" if classes else tag
+            path = (ancestors + (label,))[-shingle_size:]
+            features.add(">".join(path))
+            stack.append((child, path))
+    return features
+
+
+def simhash(features: Iterable[str]) -> int:
+    """SimHash de 64 bits: features parecidas geram hashes com poucos bits diferentes."""
+    digests = b"".join(
+        hashlib.blake2b(feature.encode("utf8"), digest_size=8).digest() for feature in features
+    )
+    if not digests:
+        return 0
+    bits = np.unpackbits(np.frombuffer(digests, dtype=np.uint8)).reshape(-1, FINGERPRINT_BITS)
+    # Bit i do resultado = maioria dos bits i das features
+    majority = bits.sum(axis=0) * 2 > bits.shape[0]
+    return int.from_bytes(np.packbits(majority).tobytes(), "big")
+
+
+def hamming_similarity(left: int, right: int) -> float:
+    """Fração de bits iguais entre duas impressões digitais."""
+    return 1.0 - bin(left ^ right).count("1") / FINGERPRINT_BITS
+
+
+def dom_fingerprint(root) -> int:
+    """SimHash do esqueleto de uma árvore lxml já parseada."""
+    return simhash(skeleton_shingles(root))
+
+
+def html_fingerprint(markup: str) -> Optional[int]:
+    """Parseia ``markup`` e devolve a impressão digital (None se vazio)."""
+    if not markup or not markup.strip():
+        return None
+    return dom_fingerprint(lxml_html.fromstring(markup))
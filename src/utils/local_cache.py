@@ -0,0 +1,56 @@
+"""Cache LRU em memória do processo com expiração por item."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Tuple
+
+MISSING = object()
+
+
+class LocalTTLCache:
+    """LRU limitado a ``maxsize`` itens, cada um válido por ``ttl`` segundos.
+
+    Seguro entre threads. ``get`` devolve ``MISSING`` (não ``None``) na
+    ausência, para que ``None`` também possa ser guardado como resultado
+    negativo.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, clock: Callable[[], float] = time.monotonic):
+        if maxsize < 1:
+            raise ValueError("maxsize deve ser positivo")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._items: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: Hashable) -> Any:
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None:
+                return MISSING
+            value, expires_at = entry
+            if expires_at <= self._clock():
+                del self._items[key]
+                return MISSING
+            self._items.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._items[key] = (value, self._clock() + self.ttl)
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._items.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
@@ -32,6 +32,24 @@ processing_duration = Histogram(
     ["pipeline"],
 )
 
+bulk_index_failures = Counter(
+    "crawler_bulk_index_failures_total",
+    "Falhas por documento na indexação em lote",
+    ["status"],
+)
+
+lsh_query_duration = Histogram(
+    "crawler_lsh_query_duration_seconds",
+    "Latência de consulta ao índice MinHash LSH",
+    ["backend"],
+)
+
+lsh_memory_bytes = Gauge(
+    "crawler_lsh_memory_bytes",
+    "Memória ocupada pelo índice MinHash LSH",
+    ["backend"],
+)
+
 active_spiders = Gauge(
     "crawler_active_spiders",
     "Quantidade de spiders ativas",
@@ -43,3 +61,67 @@ portal_health = Gauge(
     "Saúde calculada do portal",
     ["portal"],
 )
+
+pipeline_inflight_writes = Gauge(
+    "crawler_pipeline_inflight_writes",
+    "Escritas bloqueantes em execução no pool de I/O dos pipelines",
+    ["pipeline"],
+)
+
+retry_wait_duration = Histogram(
+    "crawler_retry_wait_seconds",
+    "Tempo de espera (backoff) antes de cada retry",
+    ["domain"],
+    buckets=(0.5, 1, 2, 4, 8, 16, 32, 60, 120),
+)
+
+proxy_pool_available = Gauge(
+    "crawler_proxy_pool_available",
+    "Proxies fora de quarentena no pool",
+)
+
+structure_checks = Counter(
+    "crawler_structure_checks_total",
+    "Respostas checadas (sampled) ou puladas (skipped) pelo monitor de estrutura",
+    ["portal", "result"],
+)
+
+selector_fallbacks = Counter(
+    "crawler_selector_fallbacks_total",
+    "Campos extraídos por um seletor que não é o primeiro declarado",
+    ["portal", "field"],
+)
+
+browser_pool_in_use = Gauge(
+    "crawler_browser_pool_in_use",
+    "Navegadores do pool Selenium emprestados no momento",
+)
+
+browsers_recycled = Counter(
+    "crawler_browsers_recycled_total",
+    "Navegadores fechados e recriados pelo pool",
+    ["reason"],
+)
+
+crawl_jobs_active = Gauge(
+    "crawler_crawl_jobs_active",
+    "Spiders em execução no reactor persistente do worker",
+)
+
+crawl_jobs = Counter(
+    "crawler_crawl_jobs_total",
+    "Jobs de crawl finalizados pelo runner",
+    ["spider", "status"],
+)
+
+incremental_pages = Counter(
+    "crawler_incremental_pages_total",
+    "Páginas revisitadas no modo incremental por resultado",
+    ["portal", "result"],
+)
+
+search_cache_requests = Counter(
+    "crawler_search_cache_requests_total",
+    "Buscas full-text atendidas pelo cache (hit) ou pelo cluster (miss)",
+    ["result"],
+)
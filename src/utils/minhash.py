@@ -0,0 +1,99 @@
+"""Utilitários de MinHash para deduplicação fuzzy."""
+
+import hashlib
+import struct
+from functools import lru_cache
+from typing import List, Optional, Sequence
+
+import numpy as np
+from datasketch import MinHash
+
+NUM_PERM = 128
+LSH_THRESHOLD = 0.8
+
+# Constantes do datasketch: (a * h + b) % primo de Mersenne, truncado em 32 bits
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+# Limita a matriz (shingles x permutações) de documentos muito longos
+_MAX_ROWS_PER_CHUNK = 4096
+
+
+def decision_text(ementa: Optional[str], decisao: Optional[str]) -> str:
+    """Texto usado na assinatura MinHash de uma decisão."""
+    return f"{ementa or ''} {decisao or ''}"
+
+
+def generate_minhash(text: str) -> MinHash:
+    """Gera MinHash com uma atualização por palavra (caminho de referência)."""
+    minhash = MinHash(num_perm=NUM_PERM)
+    for word in text.lower().split():
+        minhash.update(word.encode("utf8"))
+    return minhash
+
+
+def shingles(text: str, size: int = 1) -> List[str]:
+    """Shingles de ``size`` palavras (minúsculas), sem repetição e em ordem."""
+    words = text.lower().split()
+    if size <= 1:
+        return list(dict.fromkeys(words))
+    if len(words) < size:
+        return [" ".join(words)] if words else []
+    # zip das listas deslocadas gera as janelas de ``size`` palavras
+    grams = zip(*(words[offset:] for offset in range(size)))
+    return list(dict.fromkeys(" ".join(gram) for gram in grams))
+
+
+@lru_cache(maxsize=200_000)
+def _shingle_hash(shingle: str) -> int:
+    # Mesmo hash de datasketch.hashfunc.sha1_hash32; vocabulário jurídico se repete muito
+    return struct.unpack("<I", hashlib.sha1(shingle.encode("utf8")).digest()[:4])[0]
+
+
+class MinHashSignatureEngine:
+    """Calcula assinaturas MinHash em lote com operações NumPy.
+
+    Com ``shingle_size=1`` as assinaturas são idênticas às de
+    :func:`generate_minhash`, preservando os dados LSH já gravados.
+    """
+
+    def __init__(self, num_perm: int = NUM_PERM, shingle_size: int = 1, seed: int = 1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.seed = seed
+        # Gerar permutações é caro; faz uma vez e reaproveita em todas as assinaturas
+        self.permutations = MinHash(num_perm=num_perm, seed=seed).permutations
+        self._a = self.permutations[0][np.newaxis, :]
+        self._b = self.permutations[1][np.newaxis, :]
+
+    def signatures(self, texts: Sequence[str]) -> np.ndarray:
+        """Matriz ``(len(texts), num_perm)`` de hashvalues uint64."""
+        result = np.full((len(texts), self.num_perm), _MAX_HASH, dtype=np.uint64)
+        for row, text in enumerate(texts):
+            tokens = shingles(text, self.shingle_size)
+            if not tokens:
+                continue
+            hashes = np.fromiter(
+                (_shingle_hash(token) for token in tokens), dtype=np.uint64, count=len(tokens)
+            )
+            for start in range(0, len(hashes), _MAX_ROWS_PER_CHUNK):
+                stop = start + _MAX_ROWS_PER_CHUNK
+                chunk = hashes[start:stop, np.newaxis]
+                permuted = (chunk * self._a + self._b) % _MERSENNE_PRIME & _MAX_HASH
+                np.minimum(result[row], permuted.min(axis=0), out=result[row])
+        return result
+
+    def minhashes(self, texts: Sequence[str]) -> List[MinHash]:
+        """Assinaturas do lote como objetos ``MinHash`` do datasketch."""
+        return [
+            MinHash(
+                num_perm=self.num_perm,
+                seed=self.seed,
+                hashvalues=hashvalues,
+                permutations=self.permutations,
+            )
+            for hashvalues in self.signatures(texts)
+        ]
+
+    def minhash(self, text: str) -> MinHash:
+        return self.minhashes([text])[0]
@@ -1,20 +1,82 @@
-"""Gerenciador de proxies com rotação."""
+"""Gerenciador de proxies com seleção ponderada por saúde."""
 
 import random
-from typing import List, Optional
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+import redis
 
 from src.config import settings
+from src.database.redis.connection import get_redis_client
 from src.utils.logger import get_logger
+from src.utils.metrics import proxy_pool_available
 
 logger = get_logger(__name__)
 
+# Latência (s) em que a nota do proxy cai pela metade
+_LATENCY_REFERENCE = 1.0
+
+
+@dataclass
+class ProxyHealth:
+    """Estado de saúde de um proxy (local + deltas ainda não enviados ao Redis)."""
+
+    proxy: str
+    successes: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    latency_ewma: Optional[float] = None
+    cooldown_until: float = 0.0
+
+    # Alterações desde a última sincronização
+    pending_successes: int = 0
+    pending_failures: int = 0
+    pending_reset: bool = False
+    pending_latency: bool = False
+
+    @property
+    def success_rate(self) -> float:
+        # Suavização de Laplace: proxy novo começa em 50%, não em 0 nem 100%
+        return (self.successes + 1) / (self.successes + self.failures + 2)
+
+    def available(self, now: float) -> bool:
+        return now >= self.cooldown_until
+
+    def score(self) -> float:
+        latency = self.latency_ewma or 0.0
+        return self.success_rate / (1.0 + latency / _LATENCY_REFERENCE)
+
 
 class ProxyManager:
-    """Gerencia pool de proxies com rotação."""
+    """Pool de proxies com nota por taxa de sucesso e latência (EWMA).
+
+    A escolha é aleatória ponderada pela nota. Após
+    ``PROXY_FAILURE_THRESHOLD`` falhas seguidas o proxy entra em quarentena
+    (exponencial, até ``PROXY_QUARANTINE_MAX_SECONDS``) e volta ao pool sozinho.
+
+    Com ``PROXY_SHARED_STATE`` o estado é compartilhado entre workers via
+    Redis (hash ``proxy_pool:{proxy}``). As chamadas ao Redis acontecem no
+    máximo uma vez a cada ``PROXY_STATE_REFRESH_INTERVAL``, enviando os
+    contadores acumulados e lendo o estado dos outros workers.
+
+    ``get_proxy`` e os ``mark_proxy_*`` só mexem na memória. Quem sincroniza
+    é o chamador, fora da thread do reactor, via :meth:`sync_if_due`: o
+    ``ProxyRotationMiddleware`` num ``LoopingCall`` que despacha para o pool
+    de I/O e o ``BrowserPool`` no checkin, que já roda em thread própria.
+    """
+
+    key_prefix = "proxy_pool"
 
     def __init__(self):
         self.proxies: List[str] = []
-        self.current_index = 0
+        self.health: Dict[str, ProxyHealth] = {}
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._last_sync = 0.0
+        self.shared_state = settings.proxy_shared_state
         self.load_proxies()
 
     def load_proxies(self) -> None:
@@ -26,6 +88,10 @@ class ProxyManager:
         # TODO: Integrar com provedores reais (Luminati, Oxylabs, BrightData)
         # Por enquanto, usa lista estática de exemplo
         self.proxies = self._load_static_proxies()
+        # Proxies que continuam na lista preservam o histórico
+        self.health = {
+            proxy: self.health.get(proxy) or ProxyHealth(proxy) for proxy in self.proxies
+        }
 
         if self.proxies:
             logger.info("proxies_loaded", count=len(self.proxies))
@@ -42,28 +108,155 @@ class ProxyManager:
         ]
 
     def get_proxy(self) -> Optional[str]:
-        """Retorna próximo proxy do pool."""
+        """Escolhe proxy disponível com probabilidade proporcional à nota."""
         if not self.proxies:
             return None
 
-        proxy = self.proxies[self.current_index]
-        self.current_index = (self.current_index + 1) % len(self.proxies)
-
-        return proxy
+        with self._lock:
+            now = time.time()
+            available = [h for h in self.health.values() if h.available(now)]
+            proxy_pool_available.set(len(available))
+            if not available:
+                # Todos em quarentena: usa o que sai primeiro em vez de ir sem proxy
+                return min(self.health.values(), key=lambda h: h.cooldown_until).proxy
+            weights = [h.score() for h in available]
+            return random.choices(available, weights=weights)[0].proxy
 
     def get_random_proxy(self) -> Optional[str]:
-        """Retorna proxy aleatório."""
+        """Retorna proxy aleatório entre os que não estão em quarentena."""
         if not self.proxies:
             return None
 
-        return random.choice(self.proxies)
+        now = time.time()
+        available = [h.proxy for h in self.health.values() if h.available(now)]
+        return random.choice(available or self.proxies)
+
+    def mark_proxy_success(self, proxy: str, latency: Optional[float] = None) -> None:
+        """Registra resposta boa e atualiza a latência média do proxy."""
+        with self._lock:
+            health = self.health.get(proxy)
+            if health is None:
+                return
+            health.successes += 1
+            health.pending_successes += 1
+            health.consecutive_failures = 0
+            health.pending_reset = True
+            if latency is not None:
+                alpha = settings.proxy_latency_alpha
+                previous = health.latency_ewma
+                health.latency_ewma = (
+                    latency if previous is None else alpha * latency + (1 - alpha) * previous
+                )
+                health.pending_latency = True
 
     def mark_proxy_failed(self, proxy: str) -> None:
-        """Marca proxy como falhado e remove do pool."""
-        if proxy in self.proxies:
-            self.proxies.remove(proxy)
-            logger.warning("proxy_removed", proxy=proxy, remaining=len(self.proxies))
+        """Registra falha; após falhas seguidas o proxy entra em quarentena."""
+        with self._lock:
+            health = self.health.get(proxy)
+            if health is None:
+                return
+            health.failures += 1
+            health.pending_failures += 1
+            health.consecutive_failures += 1
+
+            excess = health.consecutive_failures - settings.proxy_failure_threshold
+            if excess >= 0:
+                quarantine = min(
+                    settings.proxy_quarantine_seconds * 2 ** min(excess, 16),
+                    settings.proxy_quarantine_max_seconds,
+                )
+                health.cooldown_until = time.time() + quarantine
+                logger.warning(
+                    "proxy_quarantined",
+                    proxy=proxy,
+                    seconds=quarantine,
+                    consecutive_failures=health.consecutive_failures,
+                )
 
     def reload_proxies(self) -> None:
         """Recarrega lista de proxies."""
         self.load_proxies()
+
+    def sync_if_due(self) -> None:
+        """Sincroniza com o Redis se o intervalo venceu. Bloqueia: fora do reactor."""
+        if not self.shared_state or not self.proxies:
+            return
+        with self._sync_lock:
+            now = time.monotonic()
+            if now - self._last_sync < settings.proxy_state_refresh_interval:
+                return
+            self._last_sync = now
+        try:
+            self.sync_shared_state()
+        except redis.RedisError as exc:
+            # Redis fora do ar não impede a coleta: segue com o estado local
+            logger.warning("proxy_state_sync_failed", error=str(exc))
+
+    def sync_shared_state(self) -> None:
+        """Envia os deltas locais e incorpora o estado dos outros workers."""
+        with self._lock:
+            sent = [
+                (
+                    health,
+                    health.pending_successes,
+                    health.pending_failures,
+                    health.pending_reset,
+                    health.consecutive_failures,
+                    health.latency_ewma if health.pending_latency else None,
+                    health.cooldown_until,
+                )
+                for health in self.health.values()
+            ]
+        if not sent:
+            return
+
+        pipe = get_redis_client().pipeline(transaction=False)
+        for health, successes, failures, reset, consecutive, latency, cooldown in sent:
+            key = f"{self.key_prefix}:{health.proxy}"
+            if successes:
+                pipe.hincrby(key, "successes", successes)
+            if failures:
+                pipe.hincrby(key, "failures", failures)
+            if reset:
+                pipe.hset(key, "consecutive_failures", consecutive)
+            elif failures:
+                pipe.hincrby(key, "consecutive_failures", failures)
+            if latency is not None:
+                pipe.hset(key, "latency_ewma", latency)
+            if cooldown:
+                pipe.hset(key, "cooldown_until", cooldown)
+        for health, *_ in sent:
+            pipe.hgetall(f"{self.key_prefix}:{health.proxy}")
+        results = pipe.execute()
+        # Os HGETALL vêm depois das escritas enfileiradas acima
+        first = len(results) - len(sent)
+        remote_states = results[first:]
+
+        with self._lock:
+            for (health, successes, failures, reset, _, latency, _), remote in zip(
+                sent, remote_states
+            ):
+                # Mantém o que foi registrado durante a ida ao Redis
+                health.pending_successes -= successes
+                health.pending_failures -= failures
+                health.pending_reset = health.pending_reset and not reset
+                health.pending_latency = health.pending_latency and latency is None
+                if not remote:
+                    continue
+                health.successes = int(remote.get("successes", 0)) + health.pending_successes
+                health.failures = int(remote.get("failures", 0)) + health.pending_failures
+                if not health.pending_reset:
+                    health.consecutive_failures = (
+                        int(remote.get("consecutive_failures", 0)) + health.pending_failures
+                    )
+                if "latency_ewma" in remote and not health.pending_latency:
+                    health.latency_ewma = float(remote["latency_ewma"])
+                health.cooldown_until = max(
+                    health.cooldown_until, float(remote.get("cooldown_until", 0.0))
+                )
+
+
+@lru_cache()
+def get_proxy_manager() -> ProxyManager:
+    """Pool compartilhado pelo middleware e pelas spiders do processo."""
+    return ProxyManager()
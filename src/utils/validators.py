@@ -63,5 +63,5 @@ def sanitize_text(value: Optional[str]) -> Optional[str]:
     """Remove espaços extras e normaliza texto."""
     if value is None:
         return None
-    cleaned = re.sub(r"\s+", " ", value)
-    return cleaned.strip()
+    # str.split() sem argumentos colapsa os mesmos espaços que \s+ e já remove as bordas
+    return " ".join(value.split())
@@ -21,3 +21,115 @@ def sample_decision():
             {"nome": "João da Silva", "tipo": "Autor"},
         ],
     }
+
+
+class FakeRedis:
+    """Subconjunto em memória da API do redis-py usado pelos serviços."""
+
+    def __init__(self):
+        self.data = {}
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    def delete(self, *keys):
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    def exists(self, *keys):
+        return sum(key in self.data for key in keys)
+
+    def expire(self, key, seconds):
+        return key in self.data
+
+    def incr(self, key, amount=1):
+        self.data[key] = int(self.data.get(key, 0)) + amount
+        return self.data[key]
+
+    def sadd(self, key, *members):
+        current = self.data.setdefault(key, set())
+        added = len(set(members) - current)
+        current.update(members)
+        return added
+
+    def srem(self, key, *members):
+        current = self.data.get(key, set())
+        removed = len(set(members) & current)
+        current.difference_update(members)
+        if not current:
+            self.data.pop(key, None)
+        return removed
+
+    def sismember(self, key, member):
+        return int(member in self.data.get(key, set()))
+
+    def smembers(self, key):
+        return set(self.data.get(key, set()))
+
+    def scard(self, key):
+        return len(self.data.get(key, set()))
+
+    def hset(self, key, field=None, value=None, mapping=None):
+        values = dict(mapping or {})
+        if field is not None:
+            values[field] = value
+        self.data.setdefault(key, {}).update({name: str(item) for name, item in values.items()})
+        return len(values)
+
+    def hincrby(self, key, field, amount=1):
+        current = self.data.setdefault(key, {})
+        current[field] = str(int(current.get(field, 0)) + amount)
+        return int(current[field])
+
+    def hsetnx(self, key, field, value):
+        current = self.data.setdefault(key, {})
+        if field in current:
+            return 0
+        current[field] = value
+        return 1
+
+    def hget(self, key, field):
+        return self.data.get(key, {}).get(field)
+
+    def hgetall(self, key):
+        return dict(self.data.get(key, {}))
+
+
+class FakePipeline:
+    """Enfileira os comandos e os executa em ordem no ``execute``."""
+
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def __len__(self):
+        return len(self.commands)
+
+    def __getattr__(self, name):
+        method = getattr(self.client, name)
+
+        def queue(*args, **kwargs):
+            self.commands.append((method, args, kwargs))
+            return self
+
+        return queue
+
+    def execute(self):
+        commands, self.commands = self.commands, []
+        return [method(*args, **kwargs) for method, args, kwargs in commands]
+
+
+@pytest.fixture
+def fake_redis():
+    return FakeRedis()
@@ -0,0 +1,192 @@
+"""Testes para checkout, checkin e reciclagem do pool de navegadores."""
+
+import pytest
+
+# src.config exige as settings do ambiente completo
+pytest.importorskip("src.config")
+
+from src.crawlers.base import browser_pool  # noqa: E402
+from src.crawlers.base.browser_pool import BrowserPool  # noqa: E402
+
+
+class _Driver:
+    def __init__(self, number):
+        self.number = number
+        self.alive = True
+        self.quit_calls = 0
+        self.browser_pid = 1000 + number
+
+    def execute_script(self, script):
+        return 1 if self.alive else 0
+
+    @property
+    def window_handles(self):
+        return ["main"] if self.alive else []
+
+    def quit(self):
+        self.quit_calls += 1
+
+
+class _Factory:
+    def __init__(self, fail_on=()):
+        self.fail_on = set(fail_on)
+        self.drivers = []
+
+    def __call__(self, proxy):
+        number = len(self.drivers) + 1
+        self.drivers.append(None)
+        if number in self.fail_on:
+            raise RuntimeError("chrome não subiu")
+        driver = _Driver(number)
+        self.drivers[-1] = driver
+        return driver
+
+
+class _Proxies:
+    def __init__(self):
+        self.results = []
+
+    def get_proxy(self):
+        return "http://proxy1.example.com:8080"
+
+    def mark_proxy_success(self, proxy, latency=None):
+        self.results.append("success")
+
+    def mark_proxy_failed(self, proxy):
+        self.results.append("failed")
+
+    def sync_if_due(self):
+        self.results.append("sync")
+
+
+def _pool(factory, size=2, max_pages=3):
+    pool = BrowserPool(
+        size=size, max_pages=max_pages, checkout_timeout=0.05, driver_factory=factory
+    )
+    pool.proxy_manager = _Proxies()
+    return pool
+
+
+def test_start_warms_every_slot():
+    factory = _Factory()
+    pool = _pool(factory).start()
+
+    assert len(factory.drivers) == 2
+    assert pool._idle.qsize() == 2
+    pool.start()
+    assert len(factory.drivers) == 2
+
+
+def test_start_failure_releases_only_its_slot():
+    factory = _Factory(fail_on={2})
+    pool = _pool(factory, size=3)
+
+    with pytest.raises(RuntimeError):
+        pool.start()
+    assert pool._created == 1
+
+    # Os slots não criados continuam disponíveis
+    pool.start()
+    assert pool._created == 3
+    assert pool._idle.qsize() == 3
+
+
+def test_checkout_waits_and_times_out_when_exhausted():
+    pool = _pool(_Factory(), size=1)
+    browser = pool.checkout()
+
+    with pytest.raises(TimeoutError):
+        pool.checkout()
+
+    pool.checkin(browser)
+    assert pool.checkout() is browser
+
+
+def test_checkin_reports_proxy_result():
+    pool = _pool(_Factory())
+
+    with pool.browser():
+        pass
+    with pytest.raises(ValueError):
+        with pool.browser() as browser:
+            browser.driver.alive = False
+            raise ValueError("página quebrou")
+
+    assert pool.proxy_manager.results == ["success", "sync", "failed", "sync"]
+
+
+def test_recycles_after_max_pages():
+    factory = _Factory()
+    pool = _pool(factory, size=1, max_pages=2)
+
+    for _ in range(2):
+        with pool.browser() as browser:
+            first = browser
+    with pool.browser() as browser:
+        assert browser is not first
+
+    assert first.driver.quit_calls == 1
+    assert len(factory.drivers) == 2
+
+
+def test_unhealthy_idle_browser_is_replaced_on_checkout():
+    factory = _Factory()
+    pool = _pool(factory, size=1)
+    with pool.browser() as browser:
+        stale = browser
+    stale.driver.alive = False
+
+    with pool.browser() as browser:
+        assert browser is not stale
+    assert stale.driver.quit_calls == 1
+
+
+def test_failed_replacement_frees_slot():
+    factory = _Factory(fail_on={2})
+    pool = _pool(factory, size=1, max_pages=1)
+
+    with pool.browser():
+        pass
+    assert pool._created == 0
+
+    with pool.browser() as browser:
+        assert browser.driver.number == 3
+
+
+def test_close_quits_idle_and_returned_browsers():
+    pool = _pool(_Factory()).start()
+    borrowed = pool.checkout()
+
+    pool.close()
+    pool.checkin(borrowed)
+
+    assert all(driver.quit_calls == 1 for driver in pool.driver_factory.drivers)
+    with pytest.raises(RuntimeError):
+        pool.checkout()
+
+
+def test_memory_is_sampled_every_interval(monkeypatch):
+    measured = []
+
+    def _rss(pid):
+        measured.append(pid)
+        return 2048 * 1024 * 1024
+
+    monkeypatch.setattr(browser_pool, "_process_tree_rss", _rss)
+    pool = BrowserPool(
+        size=1,
+        max_pages=100,
+        max_memory_mb=1024,
+        memory_check_interval=3,
+        checkout_timeout=0.05,
+        driver_factory=_Factory(),
+    )
+    pool.proxy_manager = _Proxies()
+
+    for _ in range(3):
+        with pool.browser() as browser:
+            first = browser
+
+    # Só a terceira página mede o RSS, e o navegador acima do limite é reciclado
+    assert measured == [1001]
+    assert first.driver.quit_calls == 1
@@ -0,0 +1,18 @@
+"""Testes para o registro das tasks no app Celery."""
+
+from pathlib import Path
+
+import pytest
+
+# src.config exige as settings do ambiente completo
+pytest.importorskip("src.config")
+
+from src.config.celery_config import celery_app  # noqa: E402
+
+
+def test_every_task_module_is_included():
+    tasks_dir = Path(__file__).resolve().parents[2] / "src" / "tasks"
+
+    modules = {f"src.tasks.{path.stem}" for path in tasks_dir.glob("*_tasks.py")}
+
+    assert modules == set(celery_app.conf.include)
@@ -1,8 +1,10 @@
 """Testes para utilidades CNJ."""
 
 from src.utils.cnj_utils import (
+    CNJNumber,
     extract_cnj_components,
     normalize_cnj_number,
+    validate_cnj_batch,
     validate_cnj_checksum,
     validate_cnj_format,
 )
@@ -28,3 +30,25 @@ def test_normalize_cnj_number():
     numero = "0000001 98 2023 8 26 0100"
     normalized = normalize_cnj_number(numero)
     assert normalized == "0000001-98.2023.8.26.0100"
+
+
+def test_cnj_number_parse():
+    cnj = CNJNumber.parse("0001234-56.2024.8.26.0100")
+    assert cnj.components() == extract_cnj_components("0001234-56.2024.8.26.0100")
+    assert cnj.tribunal_nome.startswith("TJSP")
+    assert str(cnj) == "0001234-56.2024.8.26.0100"
+    assert CNJNumber.parse("1234-56.2024.8.26.0100") is None
+
+
+def test_validate_cnj_batch_matches_scalar():
+    numeros = ["0001234-56.2024.8.26.0100", "1234-56.2024.8.26.0100", "0000001-25.2023.8.26.0100"]
+    expected = [validate_cnj_format(n) and validate_cnj_checksum(n) for n in numeros]
+    assert list(validate_cnj_batch(numeros)) == expected
+
+
+def test_cnj_number_build_computes_digit():
+    cnj = CNJNumber.build(1234, 2024, "8", "26", "0100")
+    assert str(cnj).startswith("0001234-")
+    assert str(cnj).endswith(".2024.8.26.0100")
+    assert cnj.checksum_valid
+    assert validate_cnj_checksum(str(cnj))
@@ -0,0 +1,180 @@
+"""Testes para o particionamento em shards e o estado das tentativas."""
+
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+
+# src.config exige as settings do ambiente completo
+pytest.importorskip("src.config")
+
+from src.crawlers.runner import FAILED as JOB_FAILED  # noqa: E402
+from src.crawlers.runner import FINISHED as JOB_FINISHED  # noqa: E402
+from src.services import crawl_sharding  # noqa: E402
+from src.services.crawl_sharding import (  # noqa: E402
+    DONE,
+    FAILED,
+    PARTIAL,
+    RETRYING,
+    ShardTracker,
+    cnj_shards,
+    date_shards,
+)
+from src.tasks import crawl_tasks  # noqa: E402
+
+
+def test_cnj_shards_cover_every_sequential():
+    shards = cnj_shards("tjsp_esaj", [2023, 2024], ["0100"], 25, shard_size=10)
+
+    assert len(shards) == 6
+    assert [(s.seq_start, s.seq_end) for s in shards[:3]] == [(0, 10), (10, 20), (20, 25)]
+
+
+@pytest.mark.parametrize(
+    "anos, origens, sequencial_max", [([], ["0100"], 10), ([2024], [], 10), ([2024], ["0100"], 0)]
+)
+def test_cnj_shards_reject_empty_partition(anos, origens, sequencial_max):
+    with pytest.raises(ValueError):
+        cnj_shards("tjsp_esaj", anos, origens, sequencial_max, shard_size=10)
+
+
+def test_date_shards_windows_and_validation():
+    shards = date_shards("tjsp_esaj", date(2024, 1, 1), date(2024, 1, 10), window_days=4)
+
+    assert [(s.date_start, s.date_end) for s in shards] == [
+        ("2024-01-01", "2024-01-04"),
+        ("2024-01-05", "2024-01-08"),
+        ("2024-01-09", "2024-01-10"),
+    ]
+    with pytest.raises(ValueError):
+        date_shards("tjsp_esaj", date(2024, 2, 1), date(2024, 1, 1))
+
+
+def test_sharded_crawl_requires_dates():
+    with pytest.raises(ValueError, match="date_start"):
+        crawl_tasks.run_sharded_crawl.run(kind="dates", date_start="2024-01-01")
+
+
+@pytest.fixture
+def tracker_redis(monkeypatch, fake_redis):
+    monkeypatch.setattr(crawl_sharding, "get_redis_client", lambda: fake_redis)
+    return fake_redis
+
+
+@pytest.fixture
+def failing_runner(monkeypatch):
+    job = SimpleNamespace(
+        status=JOB_FAILED, failed_urls=[], error="portal fora", finish_reason="failed", items=0
+    )
+    runner = SimpleNamespace(run=lambda *args, **kwargs: job)
+    monkeypatch.setattr(crawl_tasks, "get_crawler_runner", lambda: runner)
+
+
+def _run_shard(shard, retries):
+    task = crawl_tasks.crawl_shard
+    task.push_request(retries=retries)
+    try:
+        return task.run("run-1", shard.to_dict())
+    finally:
+        task.pop_request()
+
+
+def test_shard_is_retrying_until_retries_are_exhausted(tracker_redis, failing_runner):
+    shard = date_shards("tjsp_esaj", date(2024, 1, 1), date(2024, 1, 1))[0]
+    tracker = ShardTracker("run-1")
+    tracker.register([shard])
+
+    with pytest.raises(RuntimeError):
+        _run_shard(shard, retries=0)
+    assert tracker.states()[shard.shard_id]["status"] == RETRYING
+    assert tracker.shards(FAILED) == []
+
+    result = _run_shard(shard, retries=crawl_tasks.crawl_shard.max_retries)
+    assert result["status"] == FAILED
+    assert tracker.shards(FAILED) == [shard]
+    assert tracker.summary()[FAILED] == 1
+    assert tracker.states()[shard.shard_id]["attempts"] == 2
+
+
+def test_tracker_keeps_state_of_known_shards(tracker_redis):
+    shard = date_shards("tjsp_esaj", date(2024, 1, 1), date(2024, 1, 1))[0]
+    tracker = ShardTracker("run-1")
+    tracker.register([shard])
+    tracker.mark_done(shard, items=7)
+
+    tracker.register([shard])
+
+    assert tracker.states()[shard.shard_id]["status"] == DONE
+    assert tracker.states()[shard.shard_id]["items"] == 7
+
+
+class _Runner:
+    def __init__(self, items, failed_urls):
+        self.items = items
+        self.failed_urls = failed_urls
+        self.calls = []
+
+    def run(self, spider_cls, job_id, **kwargs):
+        self.calls.append(kwargs)
+        return SimpleNamespace(
+            status=JOB_FINISHED,
+            failed_urls=self.failed_urls,
+            error=None,
+            finish_reason="finished",
+            items=self.items,
+        )
+
+
+def test_few_failed_urls_leave_shard_partial(monkeypatch, tracker_redis):
+    shard = date_shards("tjsp_esaj", date(2024, 1, 1), date(2024, 1, 1))[0]
+    tracker = ShardTracker("run-1")
+    tracker.register([shard])
+    runner = _Runner(items=99, failed_urls=["https://a"])
+    monkeypatch.setattr(crawl_tasks, "get_crawler_runner", lambda: runner)
+
+    result = _run_shard(shard, retries=0)
+
+    assert result["status"] == PARTIAL
+    assert tracker.failed_urls() == [(shard, ["https://a"])]
+    assert tracker.summary()[PARTIAL] == 1
+
+    # A recoleta percorre só as URLs com falha e soma os itens do shard
+    runner.failed_urls = []
+    runner.items = 1
+    task = crawl_tasks.crawl_shard
+    task.push_request(retries=0)
+    try:
+        result = task.run("run-1", shard.to_dict(), ["https://a"])
+    finally:
+        task.pop_request()
+
+    assert result["status"] == DONE
+    assert runner.calls[-1] == {"start_urls": ["https://a"]}
+    assert tracker.state(shard)["items"] == 100
+    assert tracker.failed_urls() == []
+
+
+def test_many_failed_urls_retry_whole_shard(monkeypatch, tracker_redis):
+    shard = date_shards("tjsp_esaj", date(2024, 1, 1), date(2024, 1, 1))[0]
+    ShardTracker("run-1").register([shard])
+    runner = _Runner(items=5, failed_urls=["https://a", "https://b"])
+    monkeypatch.setattr(crawl_tasks, "get_crawler_runner", lambda: runner)
+
+    with pytest.raises(RuntimeError):
+        _run_shard(shard, retries=0)
+    assert runner.calls == [{"shard": shard}]
+
+
+def test_retry_failed_shards_sends_only_failed_urls_of_partial(monkeypatch, tracker_redis):
+    failed, partial = date_shards("tjsp_esaj", date(2024, 1, 1), date(2024, 1, 14))
+    tracker = ShardTracker("run-1")
+    tracker.register([failed, partial])
+    tracker.mark_failed(failed, "portal fora")
+    tracker.mark_partial(partial, 10, ["https://a"])
+    dispatched = []
+    monkeypatch.setattr(
+        crawl_tasks, "_dispatch", lambda run_id, shards, urls: dispatched.append((shards, urls))
+    )
+
+    assert crawl_tasks.retry_failed_shards.run("run-1") == 2
+    assert dispatched == [([failed], [(partial, ["https://a"])])]
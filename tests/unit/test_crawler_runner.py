@@ -0,0 +1,110 @@
+"""Testes para a fila, o timeout e o cancelamento de jobs do runner."""
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from twisted.internet import defer
+
+# src.config exige as settings do ambiente completo
+pytest.importorskip("src.config")
+
+from src.crawlers import runner as runner_module  # noqa: E402
+from src.database.redis import cache  # noqa: E402
+
+
+class _Crawler:
+    def __init__(self):
+        self.deferred = defer.Deferred()
+        self.stats = SimpleNamespace(
+            get_stats=lambda: {"item_scraped_count": 3, "finish_reason": self.reason}
+        )
+        self.spider = SimpleNamespace(failed_urls=[])
+        self.reason = "finished"
+        self.stop_calls = 0
+
+    def stop(self):
+        self.stop_calls += 1
+        self.reason = "shutdown"
+        self.deferred.callback(None)
+
+
+class _Runner:
+    def __init__(self):
+        self.crawlers = []
+
+    def create_crawler(self, spider_cls):
+        crawler = _Crawler()
+        self.crawlers.append(crawler)
+        return crawler
+
+    def crawl(self, crawler, **kwargs):
+        return crawler.deferred
+
+
+class _Spider:
+    name = "runner_test"
+
+
+@pytest.fixture
+def service(monkeypatch, fake_redis):
+    from twisted.internet import reactor
+
+    # Sem reactor rodando: o que iria para a thread dele executa na hora
+    monkeypatch.setattr(reactor, "callFromThread", lambda f, *args: f(*args))
+    monkeypatch.setattr(reactor, "callInThread", lambda f, *args: f(*args))
+    monkeypatch.setattr(cache, "get_redis_client", lambda **kwargs: fake_redis)
+
+    service = runner_module.CrawlerRunnerService(scrapy_settings={}, max_concurrent=1)
+    service._thread = threading.current_thread()
+    service._runner = _Runner()
+    service._semaphore = defer.DeferredSemaphore(1)
+    return service
+
+
+def test_cancelled_queued_job_never_starts(service):
+    first = service.submit(_Spider)
+    queued = service.submit(_Spider)
+    assert queued.status == runner_module.QUEUED
+
+    service.cancel(queued.job_id)
+    service._runner.crawlers[0].deferred.callback(None)
+
+    assert first.status == runner_module.FINISHED
+    assert queued.status == runner_module.CANCELLED
+    assert len(service._runner.crawlers) == 1
+    assert service.wait(queued.job_id, timeout=0).status == runner_module.CANCELLED
+
+
+def test_wait_timeout_counts_from_start(service):
+    service.submit(_Spider)
+    queued = service.submit(_Spider)
+    result = {}
+    waiter = threading.Thread(
+        target=lambda: result.update(job=service.wait(queued.job_id, timeout=0.05))
+    )
+    waiter.start()
+
+    # Na fila o prazo não corre
+    time.sleep(0.2)
+    assert waiter.is_alive()
+
+    service._runner.crawlers[0].deferred.callback(None)
+    waiter.join(timeout=5)
+
+    assert not waiter.is_alive()
+    assert service._runner.crawlers[1].stop_calls == 1
+    assert result["job"].status == runner_module.FAILED
+    assert result["job"].finish_reason == "shutdown"
+
+
+def test_wait_returns_finished_job(service):
+    job = service.submit(_Spider)
+    service._runner.crawlers[0].deferred.callback(None)
+
+    finished = service.wait(job.job_id, timeout=1)
+
+    assert finished.status == runner_module.FINISHED
+    assert finished.items == 3
+    assert service.status(job.job_id)["status"] == runner_module.FINISHED
@@ -0,0 +1,30 @@
+"""Testes para o parser de datas de tribunais."""
+
+from datetime import date, datetime
+
+import pytest
+
+from src.utils.date_parser import parse_court_date
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("10/01/2024", datetime(2024, 1, 10)),
+        ("10/01/2024 14:35", datetime(2024, 1, 10, 14, 35)),
+        ("10/01/2024 14:35:20", datetime(2024, 1, 10, 14, 35, 20)),
+        ("2024-01-10T10:00:00", datetime(2024, 1, 10, 10, 0)),
+        ("2024-01-10", datetime(2024, 1, 10)),
+        (" 10 Jan 2024 ", datetime(2024, 1, 10)),
+        (date(2024, 1, 10), datetime(2024, 1, 10)),
+    ],
+)
+def test_parse_court_date(value, expected):
+    assert parse_court_date(value) == expected
+
+
+def test_parse_court_date_empty_and_invalid():
+    assert parse_court_date(None) is None
+    assert parse_court_date("  ") is None
+    with pytest.raises(ValueError):
+        parse_court_date("32/13/2024")
@@ -0,0 +1,116 @@
+"""Testes para as consultas do crawl incremental no repositório de decisões."""
+
+from contextlib import contextmanager
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+# src.config exige as settings do ambiente completo
+pytest.importorskip("src.config")
+
+from src.database.postgres import repositories  # noqa: E402
+
+
+class _Session:
+    def __init__(self, result):
+        self.result = result
+        self.statements = []
+
+    def execute(self, statement):
+        self.statements.append(statement)
+        return self.result
+
+
+@pytest.fixture
+def session(monkeypatch):
+    session = _Session(result=[])
+
+    @contextmanager
+    def get_session():
+        yield session
+
+    monkeypatch.setattr(repositories, "get_session", get_session)
+    return session
+
+
+def _sql(statement):
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def test_iter_stale_urls_filters_portal_and_age(session):
+    session.result = [("https://a",), ("https://b",)]
+    repo = repositories.JudicialDecisionRepository()
+
+    urls = list(repo.iter_stale_urls("tjsp", timedelta(hours=24), batch_size=50))
+
+    assert urls == ["https://a", "https://b"]
+    statement = session.statements[0]
+    sql = _sql(statement)
+    assert "judicial_decisions.portal = %(portal_1)s" in sql
+    assert "judicial_decisions.origem_url IS NOT NULL" in sql
+    assert "greatest(judicial_decisions.timestamp_coleta, judicial_decisions.updated_at) <" in sql
+    assert sql.rstrip().endswith(
+        "ORDER BY greatest(judicial_decisions.timestamp_coleta, judicial_decisions.updated_at)"
+    )
+    assert statement.get_execution_options()["yield_per"] == 50
+
+
+def test_touch_collected_updates_timestamp_only(session):
+    session.result = SimpleNamespace(rowcount=2)
+    repo = repositories.JudicialDecisionRepository()
+
+    assert repo.touch_collected(["https://a", "https://b"]) == 2
+
+    sql = _sql(session.statements[0])
+    assert sql.startswith("UPDATE judicial_decisions SET")
+    assert "timestamp_coleta=now()" in sql
+    assert "updated_at=judicial_decisions.updated_at" in sql
+    assert "judicial_decisions.origem_url IN" in sql
+
+
+def test_touch_collected_without_urls_skips_database(session):
+    repo = repositories.JudicialDecisionRepository()
+
+    assert repo.touch_collected([]) == 0
+    assert session.statements == []
+
+
+def test_bulk_upsert_returns_only_inserted_cnjs(session):
+    session.result = [
+        SimpleNamespace(numero_cnj="1", inserted=True),
+        SimpleNamespace(numero_cnj="2", inserted=False),
+    ]
+    repo = repositories.JudicialDecisionRepository()
+
+    inserted = repo.bulk_upsert([{"numero_cnj": "1"}, {"numero_cnj": "2"}])
+
+    assert inserted == {"1"}
+    sql = _sql(session.statements[0])
+    assert "ON CONFLICT (numero_cnj) DO UPDATE" in sql
+    assert sql.rstrip().endswith("RETURNING judicial_decisions.numero_cnj, xmax = 0 AS inserted")
+
+
+def test_bulk_upsert_partial_item_keeps_missing_columns(session):
+    repo = repositories.JudicialDecisionRepository()
+
+    repo.bulk_upsert(
+        [
+            {"numero_cnj": "1", "ementa": "nova", "metadata": {"fonte": "recoleta"}},
+            {"numero_cnj": "2", "ementa": "outra", "decisao": "provido"},
+        ]
+    )
+
+    # Conjuntos de chaves diferentes: um statement por grupo
+    assert len(session.statements) == 2
+    partial = session.statements[0]
+    sql = _sql(partial)
+    update_clause = sql.split("DO UPDATE SET", 1)[1]
+    assert "ementa = excluded.ementa" in update_clause
+    assert "metadata = excluded.metadata" in update_clause
+    assert "decisao" not in update_clause
+    assert "relator" not in update_clause
+    params = partial.compile(dialect=postgresql.dialect()).params
+    assert {"fonte": "recoleta"} in params.values()
+    assert "decisao = excluded.decisao" in _sql(session.statements[1])
@@ -0,0 +1,67 @@
+"""Testes para o registro de hashes do pipeline de deduplicação."""
+
+import pytest
+from scrapy.exceptions import DropItem
+
+# src.config exige as settings do ambiente completo
+pytest.importorskip("src.config")
+
+from src.pipelines import deduplication_pipeline  # noqa: E402
+from src.services.minhash_index import MemoryMinHashIndex  # noqa: E402
+
+DeduplicationPipeline = deduplication_pipeline.DeduplicationPipeline
+DuplicateItem = deduplication_pipeline.DuplicateItem
+
+
+@pytest.fixture
+def index(monkeypatch):
+    index = MemoryMinHashIndex()
+    monkeypatch.setattr(deduplication_pipeline, "build_minhash_index", lambda: index)
+    return index
+
+
+def test_hash_enters_index_only_after_persistence(index, sample_decision):
+    pipeline = DeduplicationPipeline()
+
+    item = pipeline.process_item(dict(sample_decision), spider=None)
+    assert item["hash_content"]
+    assert index.size() == 0
+
+    # Ainda não gravado, mas já aprovado: a cópia no mesmo lote é barrada
+    with pytest.raises(DuplicateItem):
+        pipeline.process_item(dict(sample_decision), spider=None)
+
+    pipeline.decisions_persisted([item])
+    assert index.size() == 1
+    with pytest.raises(DuplicateItem):
+        pipeline.process_item(dict(sample_decision), spider=None)
+
+
+def test_lost_item_is_not_remembered(index, sample_decision):
+    pipeline = DeduplicationPipeline()
+
+    item = pipeline.process_item(dict(sample_decision), spider=None)
+    pipeline.item_discarded(item, response=None, exception=DropItem("falhou"), spider=None)
+
+    assert pipeline.process_item(dict(sample_decision), spider=None)["hash_content"]
+    assert index.size() == 0
+
+
+def test_near_duplicate_of_pending_item_is_dropped(index, sample_decision):
+    pipeline = DeduplicationPipeline()
+    pipeline.process_item(dict(sample_decision), spider=None)
+
+    near = dict(sample_decision, numero_cnj="0009999-56.2024.8.26.0100")
+    with pytest.raises(DuplicateItem, match="fuzzy"):
+        pipeline.process_item(near, spider=None)
+
+
+def test_recrawl_of_stored_decision_with_revised_text_is_not_dropped(index, sample_decision):
+    pipeline = DeduplicationPipeline()
+    stored = pipeline.process_item(dict(sample_decision), spider=None)
+    pipeline.decisions_persisted([stored])
+
+    revised = dict(sample_decision, ementa=sample_decision["ementa"] + " Embargos rejeitados.")
+    item = pipeline.process_item(revised, spider=None)
+
+    assert item["hash_content"] != stored["hash_content"]
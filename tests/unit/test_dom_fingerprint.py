@@ -0,0 +1,48 @@
+"""Testes para a impressão digital estrutural do DOM."""
+
+from src.utils.dom_fingerprint import hamming_similarity, html_fingerprint
+
+_PAGE = """
+<html><head><title>{title}</title><script>var t = {title!r};</script></head>
+<body>
+  <div class="header"><a class="logo" href="/">TJSP</a><ul class="menu"><li>Início</li></ul></div>
+  <div class="content">
+    <h2 class="subtitle">Dados do processo</h2>
+    <table class="secaoFormBody" id="tabelaTodasMovimentacoes">{rows}</table>
+    <div class="ementa"><span class="label">Ementa</span><p>{title}</p></div>
+  </div>
+  <div class="footer"><span>{title}</span></div>
+</body></html>
+"""
+
+_NEW_LAYOUT = """
+<html><body>
+  <nav class="navbar"><div class="container"><button class="btn">Menu</button></div></nav>
+  <main class="app"><section class="card"><header class="card-header">Processo</header>
+  <dl class="details"><dt>Classe</dt><dd>Apelação</dd></dl></section></main>
+</body></html>
+"""
+
+
+def _page(title, rows):
+    row = '<tr class="fundocinza1"><td class="dataMovimentacao">{0}</td><td>{0}</td></tr>'
+    return _PAGE.format(title=title, rows="".join(row.format(i) for i in range(rows)))
+
+
+def test_same_skeleton_ignores_text_and_row_count():
+    first = html_fingerprint(_page("Apelação 1", 3))
+    second = html_fingerprint(_page("Agravo de instrumento 2", 40))
+
+    assert first == second
+
+
+def test_layout_change_lowers_similarity():
+    baseline = html_fingerprint(_page("Apelação", 5))
+    changed = html_fingerprint(_NEW_LAYOUT)
+
+    assert hamming_similarity(baseline, changed) < 0.85
+    assert hamming_similarity(baseline, baseline) == 1.0
+
+
+def test_empty_markup_has_no_fingerprint():
+    assert html_fingerprint("   ") is None
@@ -0,0 +1,112 @@
+"""Testes para a exportação incremental pela marca d'água de ``updated_at``."""
+
+import gzip
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+# src.config exige as settings do ambiente completo
+pytest.importorskip("src.config")
+pytest.importorskip("pyarrow.parquet")
+
+from src.database.redis import cache  # noqa: E402
+from src.services import export_service  # noqa: E402
+
+T0 = datetime(2026, 1, 1, 3, 0, tzinfo=timezone.utc)
+
+
+class _Repository:
+    """Tabela em memória; ``rows`` só tem o que já foi confirmado."""
+
+    def __init__(self):
+        self.now = T0
+        self.rows = []
+        self.queries = []
+
+    def db_now(self):
+        return self.now
+
+    def iter_export_batches(self, columns, since=None, until=None, batch_size=5000):
+        self.queries.append((since, until))
+        rows = [
+            {name: row.get(name) for name in columns}
+            for row in self.rows
+            if (since is None or row["updated_at"] > since)
+            and (until is None or row["updated_at"] <= until)
+        ]
+        while rows:
+            batch, rows = rows[:batch_size], rows[batch_size:]
+            yield batch
+
+
+@pytest.fixture
+def exporter(monkeypatch, tmp_path, fake_redis):
+    monkeypatch.setattr(cache, "get_redis_client", lambda **kwargs: fake_redis)
+    monkeypatch.setattr(export_service, "JudicialDecisionRepository", _Repository)
+    return export_service.DecisionExporter(
+        output_dir=str(tmp_path),
+        fmt="jsonl",
+        columns=["numero_cnj", "updated_at"],
+        batch_size=2,
+        watermark_lag=600,
+    )
+
+
+def _row(numero, updated_at):
+    return {"numero_cnj": numero, "updated_at": updated_at}
+
+
+def _exported(result):
+    with gzip.open(result.path, "rt", encoding="utf-8") as lines:
+        return [json.loads(line)["numero_cnj"] for line in lines]
+
+
+def test_watermark_lags_behind_database_clock(exporter):
+    repo = exporter.repository
+    repo.rows = [_row("1", T0 - timedelta(hours=1)), _row("2", T0 - timedelta(minutes=5))]
+
+    result = exporter.export()
+
+    assert result.watermark == T0 - timedelta(minutes=10)
+    assert _exported(result) == ["1"]
+    assert exporter.get_watermark() == result.watermark
+
+
+def test_late_commit_is_exported_by_next_run(exporter):
+    repo = exporter.repository
+    repo.rows = [_row("1", T0 - timedelta(hours=1))]
+    first = exporter.export()
+
+    # Transação iniciada antes da primeira exportação, confirmada depois dela
+    repo.rows.append(_row("2", T0 - timedelta(minutes=2)))
+    repo.now = T0 + timedelta(hours=1)
+    second = exporter.export()
+
+    assert second.since == first.watermark
+    assert _exported(second) == ["2"]
+
+
+def test_run_within_lag_keeps_watermark(exporter):
+    repo = exporter.repository
+    exporter.set_watermark(T0 - timedelta(minutes=5))
+
+    result = exporter.export()
+
+    assert result.rows == 0
+    assert result.path is None
+    assert result.watermark == T0 - timedelta(minutes=5)
+    assert list(exporter.output_dir.iterdir()) == []
+    assert repo.queries == [(T0 - timedelta(minutes=5), T0 - timedelta(minutes=5))]
+
+
+def test_full_export_ignores_stored_watermark(exporter):
+    repo = exporter.repository
+    repo.rows = [_row(str(number), T0 - timedelta(days=number)) for number in range(1, 4)]
+    exporter.set_watermark(T0)
+
+    result = exporter.export(incremental=False)
+
+    assert result.since is None
+    assert sorted(_exported(result)) == ["1", "2", "3"]
+    assert result.path.name.startswith("judicial_decisions-full-")
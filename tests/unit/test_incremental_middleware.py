@@ -0,0 +1,157 @@
+"""Testes para o crawl incremental com requests condicionais."""
+
+import pytest
+from scrapy import Request, Spider
+from scrapy.exceptions import DropItem
+from scrapy.http import HtmlResponse
+from scrapy.utils.test import get_crawler
+from twisted.internet import defer
+
+# src.config exige as settings do ambiente completo
+pytest.importorskip("src.config")
+
+from src.crawlers.middlewares import incremental_middleware  # noqa: E402
+from src.crawlers.middlewares.incremental_middleware import PageUnchanged  # noqa: E402
+from src.pipelines.deduplication_pipeline import DuplicateItem  # noqa: E402
+from src.services.page_state import PageStateStore  # noqa: E402
+
+URL = "https://esaj.tjsp.jus.br/cjsg/getArquivo.do?cdAcordao=1"
+
+
+class _Repository:
+    def __init__(self):
+        self.touched = []
+
+    def touch_collected(self, urls):
+        self.touched.extend(urls)
+        return len(urls)
+
+
+class _Spider(Spider):
+    name = "incremental_test"
+    incremental = True
+    versao_parser = "1.0.0"
+
+
+@pytest.fixture
+def store(fake_redis):
+    return PageStateStore(ttl=60, client=fake_redis)
+
+
+@pytest.fixture
+def middleware(monkeypatch, store):
+    monkeypatch.setattr(incremental_middleware, "PageStateStore", lambda: store)
+    monkeypatch.setattr(incremental_middleware, "JudicialDecisionRepository", _Repository)
+    crawler = get_crawler(_Spider, {"INCREMENTAL_TOUCH_BATCH": 2})
+    middleware = incremental_middleware.IncrementalCrawlMiddleware.from_crawler(crawler)
+    middleware._in_thread = lambda func, *args: defer.maybeDeferred(func, *args)
+    return middleware
+
+
+@pytest.fixture
+def spider():
+    return _Spider()
+
+
+def _request(middleware, spider):
+    request = Request(URL)
+    middleware.process_request(request, spider)
+    return request
+
+
+def _response(request, body=b"<html>v1</html>", status=200, etag='"v1"'):
+    return HtmlResponse(
+        request.url, status=status, body=body, headers={"ETag": etag}, request=request
+    )
+
+
+def _persist(middleware, url=URL):
+    middleware.decisions_persisted([{"numero_cnj": "1", "origem_url": url}])
+
+
+def test_state_saved_only_after_persistence(middleware, spider, store):
+    request = _request(middleware, spider)
+    assert request.meta["page_state"] == {}
+    assert b"If-None-Match" not in request.headers
+
+    middleware.process_response(request, _response(request), spider)
+    assert store.get(URL) == {}
+
+    _persist(middleware)
+    state = store.get(URL)
+    assert state["etag"] == '"v1"'
+    assert state["versao_parser"] == "1.0.0"
+
+
+def test_lost_item_keeps_page_changed(middleware, spider, store):
+    request = _request(middleware, spider)
+    middleware.process_response(request, _response(request), spider)
+
+    # Item não chegou ao banco: a próxima coleta baixa e processa a página de novo
+    retry = _request(middleware, spider)
+    assert middleware.process_response(retry, _response(retry), spider).status == 200
+
+
+def test_unchanged_page_is_dropped(middleware, spider):
+    request = _request(middleware, spider)
+    middleware.process_response(request, _response(request), spider)
+    _persist(middleware)
+
+    again = _request(middleware, spider)
+    assert again.headers["If-None-Match"] == b'"v1"'
+    with pytest.raises(PageUnchanged):
+        middleware.process_response(again, _response(again, status=304, body=b""), spider)
+
+    same_body = _request(middleware, spider)
+    with pytest.raises(PageUnchanged):
+        middleware.process_response(same_body, _response(same_body, etag='"v2"'), spider)
+
+    assert middleware.repository.touched == [URL, URL]
+
+
+def test_new_parser_version_forces_recrawl(middleware, spider, store):
+    request = _request(middleware, spider)
+    middleware.process_response(request, _response(request), spider)
+    _persist(middleware)
+
+    spider.versao_parser = "1.1.0"
+    again = _request(middleware, spider)
+    assert b"If-None-Match" not in again.headers
+    assert middleware.process_response(again, _response(again), spider).status == 200
+
+    _persist(middleware)
+    assert store.get(URL)["versao_parser"] == "1.1.0"
+
+
+def test_non_incremental_spider_is_ignored(middleware):
+    spider = Spider("full")
+    request = Request(URL)
+
+    assert middleware.process_request(request, spider) is None
+    assert "page_state" not in request.meta
+
+
+def test_duplicate_item_saves_state_and_touches_page(middleware, spider, store):
+    request = _request(middleware, spider)
+    middleware.process_response(request, _response(request), spider)
+
+    item = {"numero_cnj": "1", "origem_url": URL}
+    middleware.item_dropped(item, None, DuplicateItem("Duplicata exata"), spider)
+    middleware.spider_closed(spider)
+
+    assert store.get(URL)["etag"] == '"v1"'
+    assert middleware.repository.touched == [URL]
+
+    again = _request(middleware, spider)
+    assert again.headers["If-None-Match"] == b'"v1"'
+
+
+def test_other_drops_keep_page_changed(middleware, spider, store):
+    request = _request(middleware, spider)
+    middleware.process_response(request, _response(request), spider)
+
+    item = {"numero_cnj": "1", "origem_url": URL}
+    middleware.item_dropped(item, None, DropItem("inválido"), spider)
+
+    assert store.get(URL) == {}
+    assert middleware.repository.touched == []
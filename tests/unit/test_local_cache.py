@@ -0,0 +1,41 @@
+"""Testes para o cache LRU local com TTL."""
+
+from src.utils.local_cache import MISSING, LocalTTLCache
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_expires_after_ttl():
+    clock = _Clock()
+    cache = LocalTTLCache(maxsize=4, ttl=10, clock=clock)
+    cache.set("a", 1)
+    clock.now = 9.9
+    assert cache.get("a") == 1
+    clock.now = 10.0
+    assert cache.get("a") is MISSING
+    assert len(cache) == 0
+
+
+def test_evicts_least_recently_used():
+    cache = LocalTTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is MISSING
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_stores_none_as_value():
+    cache = LocalTTLCache(maxsize=2, ttl=60)
+    cache.set("a", None)
+    assert cache.get("a") is None
+    cache.pop("a")
+    assert cache.get("a") is MISSING
@@ -0,0 +1,25 @@
+"""Testes para utilidades MinHash."""
+
+import numpy as np
+
+from src.utils.minhash import MinHashSignatureEngine, generate_minhash, shingles
+
+
+def test_engine_matches_word_by_word_minhash(sample_decision):
+    engine = MinHashSignatureEngine()
+    texts = [
+        f"{sample_decision['ementa']} {sample_decision['decisao']}",
+        "",
+        "Pelo exposto NEGO provimento " * 2000,
+    ]
+
+    signatures = engine.signatures(texts)
+
+    for text, signature in zip(texts, signatures):
+        assert np.array_equal(signature, generate_minhash(text).hashvalues)
+
+
+def test_shingles_word_ngrams():
+    assert shingles("A b a", size=1) == ["a", "b"]
+    assert shingles("a b c", size=2) == ["a b", "b c"]
+    assert shingles("a", size=3) == ["a"]
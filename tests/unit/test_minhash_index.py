@@ -0,0 +1,112 @@
+"""Testes para os índices MinHash LSH de deduplicação."""
+
+import pytest
+
+# src.config exige as settings do ambiente completo
+pytest.importorskip("src.config")
+
+from src.services.minhash_index import (  # noqa: E402
+    DUPLICATE_EXACT,
+    DUPLICATE_FUZZY,
+    MemoryMinHashIndex,
+    RedisMinHashIndex,
+    warm_start_index,
+)
+from src.utils.minhash import MinHashSignatureEngine  # noqa: E402
+
+TEXT = (
+    "APELAÇÃO CÍVEL. Contrato de prestação de serviços educacionais. Cobrança de "
+    "mensalidades. Sentença de procedência mantida. Recurso não provido por unanimidade."
+)
+NEAR = TEXT.replace("unanimidade", "maioria")
+OTHER = "AGRAVO DE INSTRUMENTO. Tutela de urgência indeferida. Ausência de probabilidade."
+
+
+@pytest.fixture
+def engine():
+    return MinHashSignatureEngine()
+
+
+@pytest.fixture(params=["memory", "redis"])
+def index(request, fake_redis):
+    if request.param == "memory":
+        return MemoryMinHashIndex()
+    return RedisMinHashIndex(namespace="lsh_test", client=fake_redis)
+
+
+def test_find_duplicate_does_not_insert(index, engine):
+    minhash = engine.minhash(TEXT)
+
+    assert index.find_duplicate("h1", "cnj1", minhash) is None
+    assert index.find_duplicate("h1", "cnj1", minhash) is None
+    assert index.size() == 0
+
+
+def test_exact_and_fuzzy_after_insert(index, engine):
+    assert index.insert_many([("h1", "cnj1", engine.minhash(TEXT))]) == 1
+
+    assert index.find_duplicate("h1", "cnj1", engine.minhash(TEXT)) == DUPLICATE_EXACT
+    assert index.find_duplicate("h2", "cnj2", engine.minhash(NEAR)) == DUPLICATE_FUZZY
+    assert index.find_duplicate("h3", "cnj3", engine.minhash(OTHER)) is None
+
+
+def test_revised_version_of_same_cnj_is_not_duplicate(index, engine):
+    index.insert_many([("h1", "cnj1", engine.minhash(TEXT))])
+
+    # Recoleta da mesma decisão com texto revisado segue para o upsert
+    assert index.find_duplicate("h2", "cnj1", engine.minhash(NEAR)) is None
+
+
+def test_insert_many_counts_only_new_hashes(index, engine):
+    entries = [("h1", "cnj1", engine.minhash(TEXT)), ("h2", "cnj2", engine.minhash(OTHER))]
+
+    assert index.insert_many(entries) == 2
+    assert index.insert_many(entries[:1]) == 0
+    assert index.insert_many([]) == 0
+    assert index.size() == 2
+
+
+def test_redis_query_touches_no_keys(fake_redis, engine):
+    index = RedisMinHashIndex(namespace="lsh_test", client=fake_redis)
+
+    index.find_duplicate("h1", "cnj1", engine.minhash(TEXT))
+    assert fake_redis.data == {}
+
+    index.insert_many([("h1", "cnj1", engine.minhash(TEXT))])
+    band_keys = [key for key in fake_redis.data if key.startswith("lsh_test:band:")]
+    assert len(band_keys) == len(index.hashranges)
+    assert fake_redis.smembers(index.hashes_key) == {"h1"}
+    assert fake_redis.smembers(band_keys[0]) == {"cnj1"}
+
+
+def test_memory_remove(engine):
+    index = MemoryMinHashIndex()
+    index.insert_many([("h1", "cnj1", engine.minhash(TEXT))])
+
+    index.remove("h1")
+    index.remove("h1")
+
+    assert index.find_duplicate("h2", "cnj2", engine.minhash(NEAR)) is None
+    assert index.size() == 0
+
+
+class _Repository:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def iter_dedup_corpus(self, batch_size=1000):
+        yield from self.rows
+
+
+def test_warm_start_index_inserts_in_batches(index, engine):
+    rows = [
+        ("h1", "cnj1", "ementa um", TEXT),
+        ("h2", "cnj2", "ementa dois", OTHER),
+        ("h3", "cnj3", None, "outro texto"),
+    ]
+
+    total = warm_start_index(index, batch_size=2, engine=engine, repository=_Repository(rows))
+
+    assert total == 3
+    assert index.size() == 3
+    assert index.find_duplicate("h2", "cnj2", engine.minhash("qualquer")) == DUPLICATE_EXACT
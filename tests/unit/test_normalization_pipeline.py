@@ -1,6 +1,6 @@
 """Testes para pipeline de normalização."""
 
-import pandas as pd
+from datetime import datetime
 
 from src.pipelines.normalization_pipeline import NormalizationPipeline
 
@@ -10,4 +10,5 @@ def test_normalization_pipeline(sample_decision):
     item = pipeline.process_item(sample_decision, spider=None)
 
     assert item["numero_cnj"] == "0001234-56.2024.8.26.0100"
-    assert isinstance(item["data_distribuicao"], pd.Timestamp)
+    assert item["data_distribuicao"] == datetime(2024, 1, 10, 10, 0)
+    assert type(item["data_distribuicao"]) is datetime
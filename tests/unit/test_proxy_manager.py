@@ -0,0 +1,173 @@
+"""Testes para a saúde, quarentena e sincronização do pool de proxies."""
+
+import pytest
+from scrapy import Request, Spider
+from scrapy.http import Response
+from twisted.internet import defer
+
+# src.config exige as settings do ambiente completo
+pytest.importorskip("src.config")
+
+from src.config.scrapy_settings import SCRAPY_SETTINGS  # noqa: E402
+from src.crawlers.middlewares import proxy_middleware  # noqa: E402
+from src.utils import proxy_manager  # noqa: E402
+
+PROXY_1 = "http://proxy1.example.com:8080"
+PROXY_2 = "http://proxy2.example.com:8080"
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(proxy_manager.time, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def manager(monkeypatch, fake_redis, clock):
+    for name, value in {
+        "proxy_enabled": True,
+        "proxy_shared_state": False,
+        "proxy_failure_threshold": 3,
+        "proxy_quarantine_seconds": 10.0,
+        "proxy_quarantine_max_seconds": 60.0,
+        "proxy_latency_alpha": 0.5,
+    }.items():
+        monkeypatch.setattr(proxy_manager.settings, name, value)
+    monkeypatch.setattr(proxy_manager, "get_redis_client", lambda: fake_redis)
+    return proxy_manager.ProxyManager()
+
+
+def test_score_prefers_fast_successful_proxy(manager):
+    manager.mark_proxy_success(PROXY_1, latency=0.2)
+    manager.mark_proxy_success(PROXY_1, latency=0.4)
+    manager.mark_proxy_failed(PROXY_2)
+
+    fast, failing = manager.health[PROXY_1], manager.health[PROXY_2]
+    assert fast.latency_ewma == pytest.approx(0.3)
+    assert fast.success_rate == pytest.approx(3 / 4)
+    assert failing.success_rate == pytest.approx(1 / 3)
+    assert fast.score() > failing.score()
+
+
+def test_quarantine_grows_exponentially_and_expires(manager, clock):
+    for _ in range(2):
+        manager.mark_proxy_failed(PROXY_1)
+    assert manager.health[PROXY_1].available(clock.now)
+
+    manager.mark_proxy_failed(PROXY_1)
+    assert manager.health[PROXY_1].cooldown_until == clock.now + 10.0
+    manager.mark_proxy_failed(PROXY_1)
+    assert manager.health[PROXY_1].cooldown_until == clock.now + 20.0
+    for _ in range(5):
+        manager.mark_proxy_failed(PROXY_1)
+    assert manager.health[PROXY_1].cooldown_until == clock.now + 60.0
+
+    assert PROXY_1 not in {manager.get_proxy() for _ in range(50)}
+    clock.now += 61.0
+    assert manager.health[PROXY_1].available(clock.now)
+
+
+def test_success_resets_consecutive_failures(manager, clock):
+    manager.mark_proxy_failed(PROXY_1)
+    manager.mark_proxy_failed(PROXY_1)
+    manager.mark_proxy_success(PROXY_1)
+    manager.mark_proxy_failed(PROXY_1)
+
+    assert manager.health[PROXY_1].consecutive_failures == 1
+    assert manager.health[PROXY_1].available(clock.now)
+
+
+def test_all_quarantined_returns_first_to_leave(manager, clock):
+    for proxy in manager.proxies:
+        for _ in range(3):
+            manager.mark_proxy_failed(proxy)
+        clock.now += 1.0
+
+    assert manager.get_proxy() == manager.proxies[0]
+
+
+def test_sync_shares_state_between_workers(monkeypatch, fake_redis, clock):
+    monkeypatch.setattr(proxy_manager.settings, "proxy_enabled", True)
+    monkeypatch.setattr(proxy_manager.settings, "proxy_failure_threshold", 3)
+    monkeypatch.setattr(proxy_manager.settings, "proxy_quarantine_seconds", 10.0)
+    monkeypatch.setattr(proxy_manager.settings, "proxy_quarantine_max_seconds", 60.0)
+    monkeypatch.setattr(proxy_manager, "get_redis_client", lambda: fake_redis)
+    first, second = proxy_manager.ProxyManager(), proxy_manager.ProxyManager()
+
+    for _ in range(3):
+        first.mark_proxy_failed(PROXY_1)
+    second.mark_proxy_success(PROXY_2, latency=0.5)
+    first.sync_shared_state()
+    second.sync_shared_state()
+
+    remote = second.health[PROXY_1]
+    assert (remote.failures, remote.consecutive_failures) == (3, 3)
+    assert remote.cooldown_until == clock.now + 10.0
+    assert second.health[PROXY_2].successes == 1
+
+    # Deltas já enviados não são somados de novo
+    first.sync_shared_state()
+    assert fake_redis.hgetall(f"proxy_pool:{PROXY_1}")["failures"] == "3"
+    assert first.health[PROXY_2].latency_ewma == pytest.approx(0.5)
+
+
+def test_proxy_middleware_runs_before_retry():
+    middlewares = SCRAPY_SETTINGS["DOWNLOADER_MIDDLEWARES"]
+    proxy = middlewares["src.crawlers.middlewares.proxy_middleware.ProxyRotationMiddleware"]
+    retry = middlewares["src.crawlers.middlewares.retry_middleware.ResilientRetryMiddleware"]
+
+    # process_response/process_exception seguem a ordem decrescente
+    assert proxy > retry
+
+
+def test_proxy_middleware_reports_blocked_response(monkeypatch, manager):
+    monkeypatch.setattr(proxy_middleware, "get_proxy_manager", lambda: manager)
+    middleware = proxy_middleware.ProxyRotationMiddleware()
+    request = Request("https://esaj.tjsp.jus.br", meta={"proxy": PROXY_1})
+
+    middleware.process_response(request, Response(request.url, status=429), Spider("t"))
+    middleware.process_exception(request, TimeoutError(), Spider("t"))
+
+    assert manager.health[PROXY_1].consecutive_failures == 2
+
+
+def test_get_proxy_never_touches_redis(monkeypatch, manager):
+    def _unavailable():
+        raise AssertionError("get_proxy não pode ir ao Redis")
+
+    manager.shared_state = True
+    monkeypatch.setattr(proxy_manager, "get_redis_client", _unavailable)
+
+    assert manager.get_proxy() in manager.proxies
+
+
+def test_proxy_middleware_syncs_in_io_pool(monkeypatch, fake_redis, manager):
+    calls = []
+
+    def _in_pool(reactor, pool, func, *args):
+        calls.append(func)
+        return defer.maybeDeferred(func, *args)
+
+    manager.shared_state = True
+    manager.mark_proxy_failed(PROXY_1)
+    monkeypatch.setattr(proxy_middleware, "get_proxy_manager", lambda: manager)
+    monkeypatch.setattr(proxy_middleware.threads, "deferToThreadPool", _in_pool)
+    monkeypatch.setattr(proxy_middleware, "get_io_threadpool", lambda: None)
+    middleware = proxy_middleware.ProxyRotationMiddleware()
+
+    middleware._sync()
+    # Dentro do intervalo: a segunda rodada não vai ao Redis
+    middleware._sync()
+
+    assert calls == [manager.sync_if_due, manager.sync_if_due]
+    assert fake_redis.hgetall(f"proxy_pool:{PROXY_1}")["failures"] == "1"
+    assert manager.health[PROXY_1].pending_failures == 0
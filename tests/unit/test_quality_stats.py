@@ -0,0 +1,134 @@
+"""Testes para os contadores diários de qualidade e as taxas derivadas."""
+
+import pytest
+from scrapy import Spider
+from scrapy.utils.test import get_crawler
+
+# src.config exige as settings do ambiente completo
+pytest.importorskip("src.config")
+
+from src.crawlers.extensions.quality_extension import QualityStatsExtension  # noqa: E402
+from src.database.postgres.models import QUALITY_FIELDS  # noqa: E402
+from src.pipelines.deduplication_pipeline import DuplicateItem  # noqa: E402
+from src.pipelines.normalize_validate_pipeline import InvalidItem  # noqa: E402
+from src.pipelines.signals import decisions_persisted  # noqa: E402
+from src.services.quality_checker import quality_rates  # noqa: E402
+from src.services.quality_stats import DUPLICATE, INVALID, QualityStatsRecorder  # noqa: E402
+
+
+class _Repository:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.rows = []
+
+    def increment(self, rows):
+        if self.fail:
+            raise ConnectionError("postgres fora")
+        self.rows.extend(rows)
+        return len(rows)
+
+
+def _counters(rows):
+    return {(row["portal"], name): value for row in rows for name, value in row.items()}
+
+
+def test_recorder_separates_new_and_updated_decisions():
+    recorder = QualityStatsRecorder(repository=_Repository())
+
+    recorder.record_stored({"numero_cnj": "1", "ementa": "texto", "relator": ""}, portal="esaj")
+    recorder.record_updated({"numero_cnj": "2", "ementa": "texto"}, portal="esaj")
+    recorder.record_dropped(DUPLICATE, portal="esaj")
+    recorder.record_stored({"numero_cnj": "3", "portal": "pje"}, portal="esaj")
+
+    assert recorder.flush() == 2
+    counters = _counters(recorder.repository.rows)
+    assert counters[("esaj", "stored")] == 1
+    assert counters[("esaj", "updated")] == 1
+    assert counters[("esaj", "duplicates")] == 1
+    assert counters[("esaj", "filled_ementa")] == 1
+    assert ("esaj", "filled_relator") not in counters
+    assert counters[("pje", "stored")] == 1
+    assert recorder.pending == 0
+
+
+def test_recorder_keeps_counters_when_flush_fails():
+    recorder = QualityStatsRecorder(repository=_Repository(fail=True))
+    recorder.record_stored({"numero_cnj": "1"}, portal="esaj")
+
+    with pytest.raises(ConnectionError):
+        recorder.flush()
+    recorder.record_stored({"numero_cnj": "2"}, portal="esaj")
+    recorder.repository.fail = False
+
+    recorder.flush()
+    assert _counters(recorder.repository.rows)[("esaj", "stored")] == 2
+
+
+def test_recorder_rejects_unknown_drop_reason():
+    with pytest.raises(ValueError):
+        QualityStatsRecorder(repository=_Repository()).record_dropped("outro")
+
+
+@pytest.fixture
+def extension():
+    crawler = get_crawler(Spider)
+    crawler.spider = Spider("esaj")
+    extension = QualityStatsExtension(crawler, flush_interval=30.0)
+    extension.recorder.repository = _Repository()
+    return extension
+
+
+def test_extension_counts_only_persisted_decisions(extension):
+    signals = extension.crawler.signals
+
+    signals.send_catch_log(
+        decisions_persisted,
+        items=[{"numero_cnj": "1", "ementa": "texto"}, {"numero_cnj": "2"}],
+        inserted={"1"},
+    )
+    extension.recorder.flush()
+
+    counters = _counters(extension.recorder.repository.rows)
+    assert counters[("esaj", "stored")] == 1
+    assert counters[("esaj", "updated")] == 1
+    assert counters[("esaj", "filled_ementa")] == 1
+
+
+def test_extension_counts_drop_reasons(extension):
+    spider = extension.crawler.spider
+
+    extension.item_dropped({"portal": "pje"}, None, DuplicateItem("dup"), spider)
+    extension.item_dropped({}, None, InvalidItem("inválido"), spider)
+    extension.item_dropped({}, None, ValueError("outro motivo"), spider)
+    extension.recorder.flush()
+
+    counters = _counters(extension.recorder.repository.rows)
+    assert counters[("pje", DUPLICATE)] == 1
+    assert counters[("esaj", INVALID)] == 1
+    assert ("esaj", DUPLICATE) not in counters
+
+
+def _totals(**values):
+    totals = {"stored": 0, "updated": 0, "duplicates": 0, "invalid": 0}
+    totals.update({f"filled_{name}": 0 for name in QUALITY_FIELDS})
+    totals.update(values)
+    return totals
+
+
+def test_quality_rates():
+    rates = quality_rates(
+        _totals(stored=40, updated=40, duplicates=20, invalid=25, filled_ementa=30)
+    )
+
+    assert rates["completeness"]["ementa"] == 75.0
+    assert rates["completeness"]["relator"] == 0.0
+    assert rates["duplicates_rate"] == 20.0
+    assert rates["validation_error_rate"] == 20.0
+
+
+def test_quality_rates_without_items():
+    rates = quality_rates(_totals())
+
+    assert rates["duplicates_rate"] == 0.0
+    assert rates["validation_error_rate"] == 0.0
+    assert set(rates["completeness"].values()) == {0.0}
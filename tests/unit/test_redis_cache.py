@@ -0,0 +1,33 @@
+"""Testes para o LRU local do cache Redis."""
+
+import pytest
+
+# src.config exige as settings do ambiente completo
+pytest.importorskip("src.config")
+
+from src.database.redis import cache  # noqa: E402
+
+
+@pytest.fixture
+def local_cache(monkeypatch, fake_redis):
+    monkeypatch.setattr(cache, "get_redis_client", lambda **kwargs: fake_redis)
+    return cache.RedisCache(namespace="t", encoding="raw", local_ttl=60)
+
+
+def test_miss_is_not_cached_locally(local_cache, fake_redis):
+    assert local_cache.get("a") is None
+    assert local_cache.get_many(["b"]) == {"b": None}
+
+    # Outro processo grava: a próxima leitura já enxerga
+    fake_redis.set("t:a", "1")
+    fake_redis.set("t:b", "2")
+
+    assert local_cache.get("a") == "1"
+    assert local_cache.get_many(["b"]) == {"b": "2"}
+
+
+def test_increment_drops_local_value(local_cache):
+    local_cache.set("n", 1)
+
+    assert local_cache.increment("n", 2) == 3
+    assert int(local_cache.get("n")) == 3
@@ -0,0 +1,172 @@
+"""Testes para a checagem estrutural amostrada da spider resiliente."""
+
+import pytest
+import redis
+from scrapy.http import HtmlResponse
+
+# src.config exige as settings do ambiente completo
+pytest.importorskip("src.config")
+
+from src.crawlers.base import selector_ranking  # noqa: E402
+from src.crawlers.base.extraction_plan import ExtractionPlan, field  # noqa: E402
+from src.crawlers.base.resilient_spider import ResilientSpider  # noqa: E402
+from src.crawlers.base.selector_ranking import SelectorRanker  # noqa: E402
+from src.services.portal_monitor import StructureCheckSampler  # noqa: E402
+
+PAGE = '<html><body><span class="numero">0001234-56.2024.8.26.0100</span></body></html>'
+CHANGED_PAGE = '<html><body><div class="novo-layout">0001234-56.2024.8.26.0100</div></body></html>'
+
+
+class _Spider(ResilientSpider):
+    name = "resilient_test"
+    extraction_plan = ExtractionPlan(
+        {
+            "numero_cnj": field(".numero::text", default="", process=str.strip),
+            "ementa": field(".ementa::text", default=""),
+        }
+    )
+
+
+class _Monitor:
+    def __init__(self, changed=False):
+        self.changed = changed
+
+    def check_response(self, response):
+        return self.changed
+
+
+class _Alerts:
+    def __init__(self):
+        self.sent = []
+
+    def send_alert(self, level, message, metadata=None):
+        self.sent.append((level, message))
+
+
+@pytest.fixture
+def spider():
+    spider = _Spider()
+    spider.structure_sampler = StructureCheckSampler(every=10, failure_window=3)
+    spider.selector_ranker = SelectorRanker(sync_interval=float("inf"))
+    spider.portal_monitor = _Monitor()
+    spider.alert_service = _Alerts()
+    return spider
+
+
+def _response(body=PAGE):
+    return HtmlResponse("https://esaj.tjsp.jus.br/x", body=body, encoding="utf-8")
+
+
+def test_sampler_checks_first_then_every_n():
+    sampler = StructureCheckSampler(every=3)
+
+    assert [sampler.should_check("esaj") for _ in range(7)] == [
+        True,
+        False,
+        False,
+        True,
+        False,
+        False,
+        True,
+    ]
+    # Contagem independente por portal
+    assert sampler.should_check("pje") is True
+
+
+def test_sampler_failure_forces_window():
+    sampler = StructureCheckSampler(every=100, failure_window=2)
+    sampler.should_check("esaj")
+
+    sampler.report_failure("esaj")
+
+    assert [sampler.should_check("esaj") for _ in range(3)] == [True, True, False]
+
+
+def test_sampler_rate_bounds():
+    assert StructureCheckSampler(rate=5.0).rate == 1.0
+    assert StructureCheckSampler(rate=-1.0).rate == 0.0
+    always = StructureCheckSampler(every=100, rate=1.0)
+    always.should_check("esaj")
+    assert all(always.should_check("esaj") for _ in range(5))
+
+
+def test_valid_extraction_keeps_sampling(spider):
+    spider.structure_sampler.should_check(spider.portal_name)
+
+    items = list(spider.parse(_response()))
+
+    assert items[0]["numero_cnj"] == "0001234-56.2024.8.26.0100"
+    assert spider.structure_sampler.should_check(spider.portal_name) is False
+
+
+def test_selector_miss_reports_failure(spider):
+    spider.structure_sampler.should_check(spider.portal_name)
+
+    items = list(spider.parse(_response(CHANGED_PAGE)))
+
+    # O dict com defaults ainda segue para a validação, mas força a checagem
+    assert items[0]["numero_cnj"] == ""
+    assert spider.structure_sampler.should_check(spider.portal_name) is True
+
+
+def test_structure_change_without_alternatives_alerts(spider):
+    spider.portal_monitor = _Monitor(changed=True)
+
+    list(spider.parse(_response(CHANGED_PAGE)))
+
+    assert spider.alert_service.sent == [
+        ("critical", "Selectors alternativos falharam para https://esaj.tjsp.jus.br/x")
+    ]
+
+
+def test_structure_change_with_usable_extraction_does_not_alert(spider):
+    spider.portal_monitor = _Monitor(changed=True)
+
+    items = list(spider.parse(_response()))
+
+    assert items[0]["numero_cnj"] == "0001234-56.2024.8.26.0100"
+    assert spider.alert_service.sent == []
+
+
+def test_alternative_plan_rescues_changed_page(spider):
+    spider.portal_monitor = _Monitor(changed=True)
+    spider.alternative_plans = (
+        ExtractionPlan({"numero_cnj": field(".novo-layout::text", default="")}),
+    )
+
+    items = list(spider.parse(_response(CHANGED_PAGE)))
+
+    assert items == [{"numero_cnj": "0001234-56.2024.8.26.0100"}]
+    assert spider.alert_service.sent == []
+
+
+def test_ranker_order_stays_in_memory(monkeypatch):
+    def _unavailable():
+        raise AssertionError("order não pode ir ao Redis")
+
+    monkeypatch.setattr(selector_ranking, "get_redis_client", _unavailable)
+    ranker = SelectorRanker(sync_interval=0)
+
+    ranker.record_success("esaj", "ementa", "b", declared_first=False)
+
+    assert ranker.order("esaj", "ementa", ["A", "B"], ["a", "b"]) == ["B", "A"]
+
+
+def test_ranker_sync_shares_and_keeps_deltas_on_failure(monkeypatch, fake_redis):
+    first, second = SelectorRanker(), SelectorRanker()
+    first.record_success("esaj", "ementa", "b", declared_first=False)
+
+    def _down():
+        raise redis.ConnectionError("redis fora")
+
+    monkeypatch.setattr(selector_ranking, "get_redis_client", _down)
+    with pytest.raises(redis.ConnectionError):
+        first.sync()
+
+    monkeypatch.setattr(selector_ranking, "get_redis_client", lambda: fake_redis)
+    first.sync()
+    second.order("esaj", "ementa", ["A", "B"], ["a", "b"])
+    second.sync()
+
+    assert fake_redis.hgetall("selector_stats:esaj:ementa") == {"b": "1", "__last__": "b"}
+    assert second.order("esaj", "ementa", ["A", "B"], ["a", "b"]) == ["B", "A"]
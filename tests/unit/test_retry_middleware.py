@@ -0,0 +1,51 @@
+"""Testes para o backoff não bloqueante do retry."""
+
+from scrapy import Request, Spider
+from scrapy.http import Response
+from scrapy.settings import Settings
+from scrapy.utils.test import get_crawler
+from twisted.internet.defer import Deferred
+
+from src.crawlers.middlewares.retry_middleware import ResilientRetryMiddleware
+
+
+def _middleware():
+    return ResilientRetryMiddleware(Settings({"RETRY_TIMES": 3, "RETRY_BACKOFF_MAX": 10.0}))
+
+
+def _spider():
+    return get_crawler(Spider)._create_spider("retry_test")
+
+
+def _cancel(result):
+    result.addErrback(lambda _: None)
+    result.cancel()
+
+
+def test_retry_returns_deferred_instead_of_sleeping():
+    middleware = _middleware()
+    request = Request("https://esaj.tjsp.jus.br/cpopg/show.do")
+
+    result = middleware.process_response(request, Response(request.url, status=503), _spider())
+
+    assert isinstance(result, Deferred)
+    _cancel(result)
+
+
+def test_backoff_streak_per_domain_resets_on_success():
+    middleware = _middleware()
+    spider = _spider()
+    request = Request("https://esaj.tjsp.jus.br/a", meta={"proxy": "http://p1:8080"})
+
+    for _ in range(2):
+        _cancel(middleware.process_response(request, Response(request.url, status=503), spider))
+    assert middleware._failure_streaks[("domain", "esaj.tjsp.jus.br")] == 2
+    assert middleware._failure_streaks[("proxy", "http://p1:8080")] == 2
+
+    middleware.process_response(request, Response(request.url, status=200), spider)
+    assert ("domain", "esaj.tjsp.jus.br") not in middleware._failure_streaks
+    assert ("proxy", "http://p1:8080") not in middleware._failure_streaks
+
+
+def test_delay_is_capped():
+    assert _middleware()._calculate_delay(50) == 10.0
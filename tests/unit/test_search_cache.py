@@ -0,0 +1,222 @@
+"""Testes para a busca paginada e o cache de resultados invalidado por geração."""
+
+import json
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+import redis
+
+# src.config exige as settings do ambiente completo
+pytest.importorskip("src.config")
+
+from src.database.opensearch import indexing, search  # noqa: E402
+from src.database.redis import cache  # noqa: E402
+
+PARAMS = {"query": "dano moral", "size": 2, "search_after": None}
+
+
+@pytest.fixture
+def redis_client(monkeypatch, fake_redis):
+    monkeypatch.setattr(cache, "get_redis_client", lambda **kwargs: fake_redis)
+    return fake_redis
+
+
+class _Client:
+    def __init__(self, response=None):
+        self.response = response or {}
+        self.calls = []
+        self.transport = SimpleNamespace(serializer=SimpleNamespace(dumps=json.dumps))
+
+    def search(self, index, body):
+        self.calls.append(("search", body))
+        return self.response
+
+    def index(self, **kwargs):
+        self.calls.append(("index", kwargs))
+
+
+@pytest.fixture
+def client(monkeypatch, redis_client):
+    client = _Client()
+    monkeypatch.setattr(search.settings, "search_cache_enabled", True)
+    monkeypatch.setattr(search, "get_opensearch_client", lambda: client)
+    monkeypatch.setattr(indexing, "get_opensearch_client", lambda: client)
+    return client
+
+
+def test_cache_invalidate_hides_previous_results(redis_client):
+    result_cache = search.SearchResultCache("decisions", ttl=60)
+    result_cache.set(PARAMS, {"total": 1})
+
+    assert result_cache.get(PARAMS) == {"total": 1}
+    assert result_cache.get({**PARAMS, "size": 3}) is None
+
+    result_cache.invalidate()
+    assert result_cache.get(PARAMS) is None
+
+
+def test_cache_key_ignores_param_order():
+    reordered = dict(reversed(list(PARAMS.items())))
+
+    assert search.SearchResultCache.key(PARAMS) == search.SearchResultCache.key(reordered)
+
+
+def test_cache_falls_back_when_redis_is_down(monkeypatch, redis_client):
+    def _down(*args, **kwargs):
+        raise redis.ConnectionError("redis fora")
+
+    result_cache = search.SearchResultCache("decisions")
+    monkeypatch.setattr(redis_client, "incr", _down)
+
+    assert result_cache.get(PARAMS) is None
+    result_cache.set(PARAMS, {"total": 1})
+    result_cache.invalidate()
+
+
+def test_search_body_filters_and_first_page_aggregations(client):
+    searcher = search.OpenSearchSearcher()
+
+    searcher.search_decisions(
+        "  Dano   MORAL ",
+        size=5,
+        tribunal="TJSP",
+        julgado_de=date(2024, 1, 1),
+        julgado_ate=date(2024, 1, 31),
+    )
+
+    body = client.calls[0][1]
+    query = body["query"]["bool"]
+    assert query["must"]["multi_match"]["query"] == "dano moral"
+    assert query["filter"] == [
+        {"term": {"tribunal": "TJSP"}},
+        {"range": {"data_julgamento": {"gte": "2024-01-01", "lte": "2024-01-31||/d"}}},
+    ]
+    assert body["sort"] == [{"_score": "desc"}, {"numero_cnj": "asc"}]
+    assert body["_source"]["includes"] == sorted(search.SOURCE_FIELDS)
+    assert set(body["aggs"]) == {"tribunal", "classe", "data_julgamento"}
+    assert "search_after" not in body
+
+
+def test_search_body_next_page_skips_aggregations(client):
+    searcher = search.OpenSearchSearcher()
+
+    searcher.search_decisions("dano", search_after=[1.5, "0001"], fields=["ementa"])
+
+    body = client.calls[0][1]
+    assert body["search_after"] == [1.5, "0001"]
+    assert body["_source"]["includes"] == ["ementa"]
+    assert "aggs" not in body
+
+
+def test_parse_response_cursor_only_on_full_page():
+    response = {
+        "hits": {
+            "total": {"value": 7},
+            "hits": [
+                {
+                    "_id": "0001",
+                    "_score": 2.0,
+                    "_source": {"tribunal": "TJSP"},
+                    "sort": [2.0, "0001"],
+                },
+                {
+                    "_id": "0002",
+                    "_score": 1.0,
+                    "highlight": {"ementa": ["<em>dano</em>"]},
+                    "sort": [1.0, "0002"],
+                },
+            ],
+        },
+        "aggregations": {
+            "data_julgamento": {
+                "buckets": [{"key": 1704067200000, "key_as_string": "2024-01", "doc_count": 4}]
+            },
+            "tribunal": {"buckets": [{"key": "TJSP", "doc_count": 7}]},
+        },
+    }
+
+    full = search.OpenSearchSearcher._parse_response(response, size=2)
+    partial = search.OpenSearchSearcher._parse_response(response, size=3)
+
+    assert full["total"] == 7
+    assert full["search_after"] == [1.0, "0002"]
+    assert partial["search_after"] is None
+    assert full["items"][1] == {
+        "numero_cnj": "0002",
+        "score": 1.0,
+        "source": {},
+        "highlight": {"ementa": ["<em>dano</em>"]},
+    }
+    assert full["aggregations"] == {
+        "data_julgamento": [{"key": "2024-01", "count": 4}],
+        "tribunal": [{"key": "TJSP", "count": 7}],
+    }
+
+
+def test_search_decisions_serves_repeated_query_from_cache(client):
+    client.response = {"hits": {"total": {"value": 0}, "hits": []}}
+    searcher = search.OpenSearchSearcher()
+
+    first = searcher.search_decisions("dano moral")
+    second = searcher.search_decisions("DANO  moral")
+
+    assert first == second
+    assert len(client.calls) == 1
+
+
+def test_indexer_waits_for_refresh_before_invalidating(client):
+    indexer = indexing.OpenSearchIndexer()
+    searcher = search.OpenSearchSearcher()
+    client.response = {"hits": {"total": {"value": 0}, "hits": []}}
+    searcher.search_decisions("dano")
+
+    indexer.index_document("0001", {"numero_cnj": "0001"})
+    searcher.search_decisions("dano")
+
+    assert client.calls[1][1]["refresh"] == "wait_for"
+    assert [name for name, _ in client.calls] == ["search", "index", "search"]
+
+
+@pytest.fixture
+def bulk_calls(monkeypatch):
+    calls = []
+
+    def _streaming_bulk(client, actions, **kwargs):
+        calls.append((list(actions), kwargs))
+        return iter(())
+
+    monkeypatch.setattr(indexing.helpers, "streaming_bulk", _streaming_bulk)
+    return calls
+
+
+class _Indexer:
+    def __init__(self, client):
+        self.client = client
+        self.index_name = "decisions"
+        self.write_refresh = "wait_for"
+        self.invalidations = 0
+
+    def invalidate_search_cache(self):
+        self.invalidations += 1
+
+
+def test_buffered_indexer_coalesces_invalidations(client, bulk_calls):
+    indexer = _Indexer(client)
+    buffered = indexing.BufferedOpenSearchIndexer(
+        indexer=indexer, max_docs=10, invalidate_interval=3600
+    )
+
+    for number in range(3):
+        buffered.add(str(number), {"numero_cnj": str(number)})
+        buffered.flush()
+
+    assert len(bulk_calls) == 3
+    assert all(kwargs["refresh"] == "wait_for" for _, kwargs in bulk_calls)
+    assert indexer.invalidations == 1
+
+    buffered.close()
+    assert indexer.invalidations == 2
+    # Nada novo desde a última invalidação
+    buffered.close()
+    assert indexer.invalidations == 2
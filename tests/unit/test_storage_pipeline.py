@@ -0,0 +1,192 @@
+"""Testes para o modo em lote do pipeline de persistência."""
+
+import pytest
+from scrapy import Spider
+from scrapy.utils.test import get_crawler
+from sqlalchemy.exc import IntegrityError
+from twisted.internet import defer, task
+from twisted.python.failure import Failure
+
+# src.config exige as settings do ambiente completo
+pytest.importorskip("src.config")
+
+from src.pipelines import storage_pipeline  # noqa: E402
+from src.pipelines.signals import decisions_persisted  # noqa: E402
+
+
+class _Repository:
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.batches = []
+
+    def bulk_upsert(self, items):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("postgres fora")
+        items = list(items)
+        if any(data.get("conflito") for data in items):
+            raise IntegrityError("INSERT", {}, Exception("hash_content"))
+        self.batches.append([data["numero_cnj"] for data in items])
+        return {data["numero_cnj"] for data in items if not data.get("existente")}
+
+    def save(self, data):
+        self.batches.append([data["numero_cnj"]])
+        return not data.get("existente")
+
+
+class _InlineIO:
+    """Executor síncrono: as chamadas terminam antes de ``run`` retornar."""
+
+    def run(self, func, *args, **kwargs):
+        return defer.maybeDeferred(func, *args, **kwargs)
+
+    def drain(self):
+        return defer.succeed(None)
+
+
+@pytest.fixture
+def persisted():
+    return []
+
+
+@pytest.fixture
+def persisted_inserted():
+    return []
+
+
+@pytest.fixture
+def pipeline(monkeypatch, persisted, persisted_inserted):
+    monkeypatch.setattr(storage_pipeline.settings, "enable_mongodb", False)
+    monkeypatch.setattr(storage_pipeline.settings, "enable_opensearch", False)
+    monkeypatch.setattr(storage_pipeline, "JudicialDecisionRepository", _Repository)
+
+    def received(items, inserted):
+        persisted.append(items)
+        persisted_inserted.append(inserted)
+
+    crawler = get_crawler(Spider)
+    crawler.signals.connect(received, signal=decisions_persisted, weak=False)
+    pipeline = storage_pipeline.StoragePipeline.from_crawler(crawler)
+    pipeline.bulk_enabled = True
+    pipeline.batch_size = 2
+    pipeline.flush_retries = 3
+    pipeline.flush_retry_backoff = 1.0
+    pipeline.io = _InlineIO()
+    pipeline.clock = task.Clock()
+    return pipeline
+
+
+def _item(numero, **extra):
+    return {"numero_cnj": numero, "hash_content": f"h{numero}", **extra}
+
+
+def _result(deferred):
+    results = []
+    deferred.addBoth(results.append)
+    assert results, "Deferred ainda não disparou"
+    if isinstance(results[0], Failure):
+        results[0].raiseException()
+    return results[0]
+
+
+def test_item_completing_batch_flushes_it(pipeline, persisted):
+    first = _item("1")
+    assert _result(pipeline.process_item(first, spider=None)) is first
+    assert pipeline.pg_repo.batches == []
+
+    _result(pipeline.process_item(_item("2"), spider=None))
+
+    assert pipeline.pg_repo.batches == [["1", "2"]]
+    assert [[data["numero_cnj"] for data in items] for items in persisted] == [["1", "2"]]
+    assert pipeline._pg_buffer == []
+
+
+def test_failed_batch_is_retried_with_backoff(pipeline, persisted):
+    pipeline.pg_repo.failures = 2
+    pipeline.process_item(_item("1"), spider=None)
+    d = pipeline.process_item(_item("2"), spider=None)
+
+    pipeline.clock.advance(1.0)
+    assert pipeline.pg_repo.batches == []
+    pipeline.clock.advance(2.0)
+
+    assert pipeline.pg_repo.batches == [["1", "2"]]
+    assert _result(d)["numero_cnj"] == "2"
+    assert len(persisted) == 1
+
+
+def test_exhausted_batch_goes_back_to_buffer(pipeline, persisted):
+    pipeline.pg_repo.failures = 3
+    pipeline.process_item(_item("1"), spider=None)
+    d = pipeline.process_item(_item("2"), spider=None)
+    pipeline.clock.advance(1.0)
+    pipeline.clock.advance(2.0)
+
+    # Nenhum item recebe o erro nem é perdido: o lote inteiro volta ao buffer
+    assert _result(d)["numero_cnj"] == "2"
+    assert [data["numero_cnj"] for data in pipeline._pg_buffer] == ["1", "2"]
+    assert persisted == []
+
+    assert _result(pipeline.flush()) == 2
+    assert pipeline.pg_repo.batches == [["1", "2"]]
+
+
+def test_close_spider_fails_when_last_batch_cannot_be_written(pipeline):
+    pipeline.process_item(_item("1"), spider=None)
+    pipeline.pg_repo.failures = 3
+
+    d = pipeline.close_spider(spider=None)
+    pipeline.clock.advance(1.0)
+    pipeline.clock.advance(2.0)
+
+    with pytest.raises(ConnectionError):
+        _result(d)
+
+
+def test_close_spider_writes_pending_items(pipeline, persisted):
+    pipeline.process_item(_item("1"), spider=None)
+
+    _result(pipeline.close_spider(spider=None))
+
+    assert pipeline.pg_repo.batches == [["1"]]
+    assert len(persisted) == 1
+
+
+def test_conflicting_batch_is_split_and_only_saved_items_are_signalled(pipeline, persisted):
+    pipeline.process_item(_item("1", conflito=True), spider=None)
+    pipeline.process_item(_item("2"), spider=None)
+
+    assert pipeline.pg_repo.batches == [["2"]]
+    assert [[data["numero_cnj"] for data in items] for items in persisted] == [["2"]]
+
+
+def test_repeated_cnj_in_batch_signals_last_version(pipeline, persisted):
+    pipeline.process_item(_item("1", ementa="antiga"), spider=None)
+    pipeline.process_item(_item("1", ementa="nova"), spider=None)
+
+    assert [data["ementa"] for data in persisted[0]] == ["nova"]
+
+
+def test_signal_separates_new_decisions_from_updates(pipeline, persisted_inserted):
+    pipeline.process_item(_item("1"), spider=None)
+    pipeline.process_item(_item("2", existente=True), spider=None)
+
+    assert persisted_inserted == [{"1"}]
+
+
+def test_conflicting_batch_reports_inserted_per_item(pipeline, persisted_inserted):
+    pipeline.process_item(_item("1", conflito=True), spider=None)
+    pipeline.process_item(_item("2"), spider=None)
+
+    assert persisted_inserted == [{"2"}]
+
+
+def test_item_mode_signals_each_saved_decision(pipeline, persisted, persisted_inserted):
+    pipeline.bulk_enabled = False
+
+    pipeline.process_item(_item("1"), spider=None)
+    pipeline.process_item(_item("2", existente=True), spider=None)
+
+    assert pipeline.pg_repo.batches == [["1"], ["2"]]
+    assert [[data["numero_cnj"] for data in items] for items in persisted] == [["1"], ["2"]]
+    assert persisted_inserted == [{"1"}, set()]